@@ -1,7 +1,7 @@
 """Configuration management using pydantic."""
 
 from pathlib import Path
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 import os
 
@@ -44,10 +44,17 @@ class LLMConfig(BaseModel):
     """Local LLM configuration."""
     enabled: bool = Field(default=True, description="Enable LLM features (Phi-3 is lightweight!)")
     model_name: str = Field(default='phi:latest', description="LLM model name (phi is lightweight)")
+    model_name_fast: Optional[str] = Field(default=None, description="Smaller model for per-action analysis (defaults to model_name)")
+    model_name_full: Optional[str] = Field(default=None, description="Model for pattern detection and suggestions (defaults to model_name)")
     context_window: int = Field(default=1024, description="Context window size (reduced for speed)")
     temperature: float = Field(default=0.1, ge=0.0, le=1.0, description="LLM temperature")
     max_tokens: int = Field(default=256, description="Maximum tokens for response (reduced for speed)")
     use_ollama: bool = Field(default=True, description="Use Ollama for LLM")
+    semantic_cache: bool = Field(default=False, description="Reuse responses to near-identical pattern and suggestion prompts")
+    embedding_model: str = Field(default='nomic-embed-text', description="Ollama embedding model for the semantic cache")
+    keep_alive: str = Field(default='30m', description="How long Ollama keeps models loaded between queries")
+    max_concurrency: int = Field(default=4, ge=1, description="Maximum concurrent LLM queries")
+    requests_per_second: float = Field(default=0.0, ge=0.0, description="Maximum LLM queries per second (0 for unlimited)")
 
 
 class PrivacyConfig(BaseModel):
@@ -20,6 +20,25 @@ from src.models.workflow import WorkflowSuggestion
 from src.models.storage import StorageStats
 
 
+_SAVE_PATTERN_SQL = """
+    INSERT OR REPLACE INTO patterns
+    (id, name, actions, occurrences, frequency, average_duration,
+     automation_feasibility, created_at, last_detected, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _pattern_row(pattern: Pattern) -> tuple:
+    """Get the patterns table row for a pattern."""
+    data = pattern.to_dict()
+    return (
+        data['id'], data['name'], data['actions'], data['occurrences'],
+        data['frequency'], data['average_duration'],
+        data['automation_feasibility'], data['created_at'],
+        data['last_detected'], data['metadata']
+    )
+
+
 class StorageManager:
     """
     Manages local data storage, retention, and cleanup.
@@ -197,22 +216,23 @@ class StorageManager:
         """Save or update pattern."""
         await self._ensure_initialized()
         
-        data = pattern.to_dict()
-        await self._db.execute("""
-            INSERT OR REPLACE INTO patterns
-            (id, name, actions, occurrences, frequency, average_duration,
-             automation_feasibility, created_at, last_detected, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['id'], data['name'], data['actions'], data['occurrences'],
-            data['frequency'], data['average_duration'],
-            data['automation_feasibility'], data['created_at'],
-            data['last_detected'], data['metadata']
-        ))
+        await self._db.execute(_SAVE_PATTERN_SQL, _pattern_row(pattern))
         await self._db.commit()
         
         self.logger.info(f"Pattern saved: {pattern.name}")
     
+    async def save_patterns(self, patterns: List[Pattern]) -> None:
+        """Save or update several patterns in one transaction."""
+        if not patterns:
+            return
+        
+        await self._ensure_initialized()
+        
+        await self._db.executemany(_SAVE_PATTERN_SQL, [_pattern_row(pattern) for pattern in patterns])
+        await self._db.commit()
+        
+        self.logger.info(f"Patterns saved: {len(patterns)}")
+    
     async def get_all_patterns(self) -> List[Pattern]:
         """Get all detected patterns."""
         await self._ensure_initialized()
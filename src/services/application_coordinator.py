@@ -632,9 +632,12 @@ class ApplicationCoordinator:
                     except Exception as e:
                         self.logger.debug(f"Could not update GUI with action: {e}")
                         
-            elif event.type == EventType.PATTERN_DETECTED:
-                pattern_type = event.data.get('pattern_type', 'unknown')
-                self.logger.info(f"Pattern detected: {pattern_type}")
+            elif event.type in (EventType.PATTERN_DETECTED, EventType.PATTERNS_DETECTED):
+                if event.type == EventType.PATTERNS_DETECTED:
+                    self.logger.info(f"Patterns detected: {event.data.get('patterns_count', 0)}")
+                else:
+                    pattern_type = event.data.get('pattern_type', 'unknown')
+                    self.logger.info(f"Pattern detected: {pattern_type}")
                 
                 # Update GUI if available
                 if self.gui_port:
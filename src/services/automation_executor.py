@@ -92,7 +92,9 @@ class AutomationExecutor:
         self.execution_verifier = ExecutionVerifier()
         
         # Feedback loop manager
-        self.feedback_loop_manager = FeedbackLoopManager()
+        self.feedback_loop_manager = FeedbackLoopManager(
+            state_path=self.config.data_dir / 'feedback_state.json'
+        )
         
         # Automation platforms
         self.desktop_platform = DesktopAutomationPlatform()
@@ -120,8 +122,10 @@ class AutomationExecutor:
         # Initialize execution verifier
         await self.execution_verifier.initialize()
         
-        # Initialize feedback loop manager
+        # Initialize feedback loop manager, dropping workflows restored from
+        # the saved state that have not run for a long time
         await self.feedback_loop_manager.initialize()
+        self.feedback_loop_manager.evict_inactive()
         
         self.logger.info("Automation executor initialized successfully")
     
@@ -169,6 +173,9 @@ class AutomationExecutor:
             except asyncio.CancelledError:
                 pass
         
+        # Persist learned feedback so the next start is warm
+        self.feedback_loop_manager.save_state()
+        
         self.logger.info("Automation executor stopped")
     
     async def _ensure_browser(self) -> None:
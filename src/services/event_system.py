@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable, Union
 from dataclasses import dataclass, asdict
@@ -28,8 +29,14 @@ class EventType(Enum):
     # Analysis events (for future implementation)
     ACTION_DETECTED = "action_detected"
     PATTERN_DETECTED = "pattern_detected"
+    PATTERNS_DETECTED = "patterns_detected"
     WORKFLOW_SUGGESTION_GENERATED = "workflow_suggestion_generated"
     
+    # LLM analysis events
+    LLM_ACTION_ANALYZED = "llm_action_analyzed"
+    LLM_PATTERNS_DETECTED = "llm_patterns_detected"
+    LLM_SUGGESTIONS_GENERATED = "llm_suggestions_generated"
+    
     # Storage events
     SESSION_CREATED = "session_created"
     SESSION_COMPLETED = "session_completed"
@@ -43,7 +50,7 @@ class EventType(Enum):
     APPLICATION_SHUTDOWN = "application_shutdown"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Base event class."""
     
@@ -55,7 +62,6 @@ class Event:
     
     def __post_init__(self):
         if self.event_id is None:
-            import uuid
             self.event_id = str(uuid.uuid4())
     
     def to_dict(self) -> Dict[str, Any]:
@@ -303,7 +309,11 @@ class EventBus:
             
             EventType.ACTION_DETECTED: 'analysis_events',
             EventType.PATTERN_DETECTED: 'analysis_events',
+            EventType.PATTERNS_DETECTED: 'analysis_events',
             EventType.WORKFLOW_SUGGESTION_GENERATED: 'analysis_events',
+            EventType.LLM_ACTION_ANALYZED: 'analysis_events',
+            EventType.LLM_PATTERNS_DETECTED: 'analysis_events',
+            EventType.LLM_SUGGESTIONS_GENERATED: 'analysis_events',
             
             EventType.SESSION_CREATED: 'storage_events',
             EventType.SESSION_COMPLETED: 'storage_events',
@@ -8,19 +8,205 @@ This module provides verification capabilities for automation execution:
 """
 
 import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Iterator
 from dataclasses import dataclass, field
 import uuid
+import weakref
 
 from PIL import Image, ImageChops
 import numpy as np
 
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from src.config import get_config
 from src.logger import get_app_logger
 
 
+# Structured (columnar) layout for difference regions; right/bottom are inclusive
+REGION_DTYPE = np.dtype([
+    ('left', np.int32),
+    ('top', np.int32),
+    ('right', np.int32),
+    ('bottom', np.int32),
+    ('area', np.int32),
+    ('width', np.int32),
+    ('height', np.int32),
+])
+
+# Shared pool for CPU-bound image comparisons; NumPy and OpenCV release
+# the GIL, so concurrent comparisons run on separate cores
+_compare_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_compare_executor() -> ThreadPoolExecutor:
+    """Get the process-wide image comparison thread pool."""
+    global _compare_executor
+    if _compare_executor is None:
+        _compare_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4,
+            thread_name_prefix="image_compare"
+        )
+    return _compare_executor
+
+if NUMBA_AVAILABLE:
+    @njit(nogil=True, cache=True)
+    def _fused_diff_blocks(arr1, arr2, threshold, block):
+        """
+        Fused tiled difference kernel.
+        
+        Computes the per-pixel difference magnitude, the changed-pixel mask
+        and per-block count/sum/max in one pass over both images, one block
+        at a time so each tile stays cache resident. Releases the GIL so
+        comparisons on the shared thread pool run concurrently.
+        """
+        height, width, channels = arr1.shape
+        block_rows = (height + block - 1) // block
+        block_cols = (width + block - 1) // block
+        
+        mask = np.zeros((height, width), dtype=np.bool_)
+        counts = np.zeros((block_rows, block_cols), dtype=np.int64)
+        sums = np.zeros((block_rows, block_cols), dtype=np.int64)
+        maxima = np.zeros((block_rows, block_cols), dtype=np.int64)
+        
+        for by in range(block_rows):
+            y_end = min(height, (by + 1) * block)
+            for bx in range(block_cols):
+                x_end = min(width, (bx + 1) * block)
+                count = 0
+                total = 0
+                peak = 0
+                for y in range(by * block, y_end):
+                    for x in range(bx * block, x_end):
+                        magnitude = 0
+                        for c in range(channels):
+                            d = abs(np.int64(arr1[y, x, c]) - np.int64(arr2[y, x, c]))
+                            if d > magnitude:
+                                magnitude = d
+                        if magnitude > peak:
+                            peak = magnitude
+                        if magnitude > threshold:
+                            mask[y, x] = True
+                            count += 1
+                            total += magnitude
+                counts[by, bx] = count
+                sums[by, bx] = total
+                maxima[by, bx] = peak
+        
+        return mask, counts, sums, maxima
+
+
+    @njit(
+        types.UniTuple(types.int32[:, ::1], 2)(types.boolean[:, ::1]),
+        cache=True,
+        nogil=True,
+        boundscheck=False,
+        fastmath=True
+    )
+    def _label_ccl(mask):
+        """
+        Two-pass union-find connected component labeling (4-connectivity).
+        
+        Compiled eagerly from the explicit signature, so the first call
+        pays no JIT latency. Returns (labels, stats) where stats rows use
+        the cv2.connectedComponentsWithStats column layout (left, top,
+        width, height, area) and row 0 is the background.
+        """
+        height, width = mask.shape
+        labels = np.zeros((height, width), dtype=np.int32)
+        
+        # 4-connectivity allows at most ceil(H*W / 2) provisional labels
+        parent = np.zeros(height * width // 2 + 2, dtype=np.int32)
+        next_label = 1
+        
+        # First pass: provisional labels, merging equivalent ones
+        for y in range(height):
+            for x in range(width):
+                if not mask[y, x]:
+                    continue
+                up = labels[y - 1, x] if y > 0 else 0
+                left = labels[y, x - 1] if x > 0 else 0
+                
+                if up == 0 and left == 0:
+                    parent[next_label] = next_label
+                    labels[y, x] = next_label
+                    next_label += 1
+                elif up == 0:
+                    labels[y, x] = left
+                elif left == 0 or left == up:
+                    labels[y, x] = up
+                else:
+                    root_up = up
+                    while parent[root_up] != root_up:
+                        root_up = parent[root_up]
+                    root_left = left
+                    while parent[root_left] != root_left:
+                        root_left = parent[root_left]
+                    # Smallest label stays root so final ids follow raster order
+                    if root_up < root_left:
+                        parent[root_left] = root_up
+                    elif root_left < root_up:
+                        parent[root_up] = root_left
+                    labels[y, x] = min(root_up, root_left)
+        
+        # Resolve provisional labels to consecutive final labels
+        final = np.zeros(next_label, dtype=np.int32)
+        count = 0
+        for label in range(1, next_label):
+            if parent[label] == label:
+                count += 1
+                final[label] = count
+        for label in range(1, next_label):
+            root = label
+            while parent[root] != root:
+                root = parent[root]
+            final[label] = final[root]
+        
+        # Second pass: relabel and accumulate bounding boxes and areas
+        stats = np.zeros((count + 1, 5), dtype=np.int32)
+        max_x = np.zeros(count + 1, dtype=np.int32)
+        max_y = np.zeros(count + 1, dtype=np.int32)
+        for label in range(1, count + 1):
+            stats[label, 0] = width
+            stats[label, 1] = height
+        
+        for y in range(height):
+            for x in range(width):
+                label = labels[y, x]
+                if label == 0:
+                    continue
+                label = final[label]
+                labels[y, x] = label
+                if x < stats[label, 0]:
+                    stats[label, 0] = x
+                if y < stats[label, 1]:
+                    stats[label, 1] = y
+                if x > max_x[label]:
+                    max_x[label] = x
+                if y > max_y[label]:
+                    max_y[label] = y
+                stats[label, 4] += 1
+        
+        for label in range(1, count + 1):
+            stats[label, 2] = max_x[label] - stats[label, 0] + 1
+            stats[label, 3] = max_y[label] - stats[label, 1] + 1
+        
+        return labels, stats
+
+
 @dataclass
 class VerificationResult:
     """
@@ -75,6 +261,39 @@ class VerificationResult:
         )
 
 
+@dataclass
+class VerificationBatch:
+    """
+    Verification results laid out as parallel arrays.
+    
+    Each field holds one attribute for every result in the batch, so
+    reductions over success or confidence stream contiguous buffers
+    instead of walking VerificationResult objects.
+    """
+    success: np.ndarray  # bool
+    confidence: np.ndarray  # float64
+    action_type: List[str] = field(default_factory=list)
+    error_message: List[Optional[str]] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.success)
+    
+    @classmethod
+    def from_list(cls, results: List[VerificationResult]) -> 'VerificationBatch':
+        """Create VerificationBatch from a list of VerificationResult objects."""
+        count = len(results)
+        return cls(
+            success=np.fromiter((r.success for r in results), dtype=np.bool_, count=count),
+            confidence=np.fromiter(
+                (r.confidence for r in results), dtype=np.float64, count=count
+            ),
+            action_type=[r.action_type for r in results],
+            error_message=[r.error_message for r in results],
+            metadata=[r.metadata for r in results],
+        )
+
+
 class ExecutionVerifier:
     """
     Service for verifying automation execution results.
@@ -95,9 +314,21 @@ class ExecutionVerifier:
         self.verification_screenshots: Dict[str, Path] = {}
         self.verification_results: List[VerificationResult] = []
         
+        # Columnar copies of result success/confidence for vectorized stats;
+        # _result_last is the result mirrored into the last filled slot
+        self._result_success = np.empty(64, dtype=bool)
+        self._result_confidence = np.empty(64, dtype=np.float64)
+        self._result_count = 0
+        self._result_last: Optional[VerificationResult] = None
+        
         # Verification settings
         self._change_threshold = 0.05  # 5% change to consider significant
         self._confidence_threshold = 0.7  # Minimum confidence for success
+        self._diff_block_size = 32  # Block edge (px) for the coarse change pass
+        
+        # uint8 arrays of images being compared, keyed by id(image) and
+        # evicted when the image is garbage collected
+        self._ndarray_cache: Dict[int, np.ndarray] = {}
         
         # Screenshot capture
         self._screenshot_dir: Optional[Path] = None
@@ -258,7 +489,7 @@ class ExecutionVerifier:
             result.after_screenshot = after_path
             
             # Store result
-            self.verification_results.append(result)
+            self._store_result(result)
             
             self.logger.info(
                 f"Verification complete for {action_type}: "
@@ -738,47 +969,14 @@ class ExecutionVerifier:
                 - structural_similarity: SSIM-like metric
         """
         try:
-            # Ensure images are same size
-            if img1.size != img2.size:
-                img2 = img2.resize(img1.size, Image.Resampling.LANCZOS)
-            
-            # Convert to numpy arrays
-            arr1 = np.array(img1, dtype=np.float32)
-            arr2 = np.array(img2, dtype=np.float32)
-            
-            # Calculate absolute difference
-            diff = np.abs(arr1 - arr2)
-            
-            # Calculate per-pixel difference magnitude (max across RGB channels)
-            diff_magnitude = np.max(diff, axis=2)
-            
-            # Create binary mask of changed pixels
-            changed_mask = diff_magnitude > threshold
-            diff_pixels = np.sum(changed_mask)
-            total_pixels = img1.width * img1.height
-            
-            # Calculate similarity metrics
-            similarity = 1.0 - (diff_pixels / total_pixels)
-            diff_percentage = (diff_pixels / total_pixels) * 100
-            mean_diff = np.mean(diff_magnitude[changed_mask]) if diff_pixels > 0 else 0.0
-            max_diff = np.max(diff_magnitude)
-            
-            # Find difference regions (connected components)
-            diff_regions = self._find_difference_regions(changed_mask)
-            
-            # Calculate structural similarity (simplified SSIM)
-            structural_similarity = self._calculate_structural_similarity(arr1, arr2)
-            
-            return {
-                'similarity': float(similarity),
-                'diff_pixels': int(diff_pixels),
-                'diff_percentage': float(diff_percentage),
-                'mean_diff': float(mean_diff),
-                'max_diff': float(max_diff),
-                'diff_regions': diff_regions,
-                'structural_similarity': float(structural_similarity),
-                'threshold_used': threshold
-            }
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _get_compare_executor(),
+                self._compare_images_advanced_sync,
+                img1,
+                img2,
+                threshold
+            )
             
         except Exception as e:
             self.logger.error(f"Failed advanced image comparison: {e}")
@@ -793,6 +991,291 @@ class ExecutionVerifier:
                 'threshold_used': threshold
             }
     
+    def _compare_images_advanced_sync(
+        self,
+        img1: Image.Image,
+        img2: Image.Image,
+        threshold: int = 30,
+        bounds: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Blocking implementation of _compare_images_advanced.
+        
+        Runs on the shared comparison thread pool.
+        
+        Args:
+            img1: First image
+            img2: Second image
+            threshold: Pixel difference threshold (0-255)
+            bounds: Optional (left, top, right, bottom) region to compare
+            
+        Returns:
+            Comparison dictionary as returned by _compare_images_advanced
+        """
+        arr1, arr2 = self._to_comparable_arrays(img1, img2)
+        
+        if bounds is not None:
+            # Compare the region as zero-copy array slices (no PIL crop)
+            left, top, right, bottom = bounds
+            arr1 = arr1[top:bottom, left:right]
+            arr2 = arr2[top:bottom, left:right]
+        
+        return self._compare_arrays(arr1, arr2, threshold)
+    
+    def _to_comparable_arrays(
+        self,
+        img1: Image.Image,
+        img2: Image.Image
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert two images to same-sized uint8 arrays for comparison.
+        
+        Args:
+            img1: First image
+            img2: Second image (resized to match img1 if needed)
+            
+        Returns:
+            Tuple of (arr1, arr2) uint8 arrays
+        """
+        # Ensure images are same size
+        if img1.size != img2.size:
+            resized = img2.resize(img1.size, Image.Resampling.LANCZOS)
+            return self._as_array(img1), np.asarray(resized.convert('RGB'), dtype=np.uint8)
+        
+        return self._as_array(img1), self._as_array(img2)
+    
+    def _as_array(self, img: Image.Image) -> np.ndarray:
+        """
+        Get the RGB uint8 array for an image, converting it at most once.
+        
+        Comparing the full image and then a region of it (as verify_click
+        does) would otherwise copy the whole buffer each time. Images are
+        assumed not to be modified after their first comparison.
+        
+        Args:
+            img: Image to convert
+            
+        Returns:
+            Read-only uint8 array of shape (height, width, 3)
+        """
+        key = id(img)
+        arr = self._ndarray_cache.get(key)
+        if arr is None:
+            rgb = img if img.mode == 'RGB' else img.convert('RGB')
+            arr = np.asarray(rgb, dtype=np.uint8)
+            self._ndarray_cache[key] = arr
+            weakref.finalize(img, self._ndarray_cache.pop, key, None)
+        return arr
+    
+    def _compare_arrays(
+        self,
+        arr1: np.ndarray,
+        arr2: np.ndarray,
+        threshold: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Compare two same-sized uint8 image arrays.
+        
+        Core of _compare_images_advanced; also used on array slices by
+        compare_region so regions are never re-converted from PIL.
+        
+        Args:
+            arr1: First image array
+            arr2: Second image array
+            threshold: Pixel difference threshold (0-255)
+            
+        Returns:
+            Comparison dictionary as returned by _compare_images_advanced
+        """
+        total_pixels = arr1.shape[0] * arr1.shape[1]
+        
+        changed_mask, (top, left), diff_pixels, mean_diff, max_diff = (
+            self._compute_difference(arr1, arr2, threshold)
+        )
+        
+        if changed_mask is None:
+            # No pixel exceeds the threshold, so the per-pixel analysis
+            # would find nothing; only SSIM can still differ
+            if max_diff == 0:
+                structural_similarity = 1.0
+            else:
+                structural_similarity = self._calculate_structural_similarity(arr1, arr2)
+            
+            return {
+                'similarity': 1.0,
+                'diff_pixels': 0,
+                'diff_percentage': 0.0,
+                'mean_diff': 0.0,
+                'max_diff': max_diff,
+                'diff_regions': [],
+                'structural_similarity': float(structural_similarity),
+                'threshold_used': threshold
+            }
+        
+        # Calculate similarity metrics
+        similarity = 1.0 - (diff_pixels / total_pixels)
+        diff_percentage = (diff_pixels / total_pixels) * 100
+        
+        # Find difference regions (connected components) within the window
+        # and shift them back into full-image coordinates
+        regions = self._find_difference_region_array(changed_mask)
+        regions['left'] += left
+        regions['right'] += left
+        regions['top'] += top
+        regions['bottom'] += top
+        diff_regions = self._regions_to_dicts(regions)
+        
+        # Calculate structural similarity (simplified SSIM)
+        structural_similarity = self._calculate_structural_similarity(arr1, arr2)
+        
+        return {
+            'similarity': float(similarity),
+            'diff_pixels': int(diff_pixels),
+            'diff_percentage': float(diff_percentage),
+            'mean_diff': float(mean_diff),
+            'max_diff': max_diff,
+            'diff_regions': diff_regions,
+            'structural_similarity': float(structural_similarity),
+            'threshold_used': threshold
+        }
+    
+    def _compute_difference(
+        self,
+        arr1: np.ndarray,
+        arr2: np.ndarray,
+        threshold: int
+    ) -> Tuple[Optional[np.ndarray], Tuple[int, int], int, float, float]:
+        """
+        Compute thresholded pixel differences between two image arrays.
+        
+        Two-pass scheme: a coarse block pass flags blocks containing any
+        pixel above the threshold, and the per-pixel mask is only built
+        inside the bounding window of those blocks. With Numba available
+        both passes are fused into a single tiled kernel.
+        
+        Args:
+            arr1: First image as numpy array
+            arr2: Second image as numpy array
+            threshold: Pixel difference threshold (0-255)
+            
+        Returns:
+            Tuple of (changed_mask, (top, left), diff_pixels, mean_diff, max_diff).
+            changed_mask covers the changed window whose origin is (top, left),
+            and is None when no pixel exceeds the threshold.
+        """
+        if NUMBA_AVAILABLE and arr1.dtype == np.uint8 and arr1.ndim == 3:
+            # Single fused pass: magnitude, mask and per-block statistics
+            mask, counts, sums, maxima = _fused_diff_blocks(
+                np.ascontiguousarray(arr1),
+                np.ascontiguousarray(arr2),
+                int(threshold),
+                self._diff_block_size
+            )
+            max_diff = float(maxima.max())
+            changed_blocks = counts > 0
+            
+            if not changed_blocks.any():
+                return None, (0, 0), 0, 0.0, max_diff
+            
+            top, bottom, left, right = self._changed_blocks_window(changed_blocks, mask.shape)
+            diff_pixels = int(counts.sum())
+            mean_diff = float(sums.sum()) / diff_pixels
+            
+            return mask[top:bottom, left:right], (top, left), diff_pixels, mean_diff, max_diff
+        
+        if CV2_AVAILABLE:
+            # OpenCV's SIMD kernels cover the absdiff/threshold/count passes
+            diff = cv2.absdiff(arr1, arr2)
+        else:
+            # Absolute difference in int16 to avoid uint8 wrap-around
+            diff = np.abs(arr1.astype(np.int16) - arr2.astype(np.int16)).astype(np.uint8)
+        
+        # Per-pixel difference magnitude (max across RGB channels)
+        diff_magnitude = np.max(diff, axis=2) if diff.ndim == 3 else diff
+        max_diff = float(np.max(diff_magnitude))
+        
+        # Coarse pass: flag blocks containing any pixel above the threshold
+        changed_blocks = self._find_changed_blocks(diff_magnitude, threshold)
+        
+        if not changed_blocks.any():
+            return None, (0, 0), 0, 0.0, max_diff
+        
+        # Fine pass: restrict the per-pixel analysis to the bounding
+        # window of changed blocks (nothing outside it is above threshold)
+        top, bottom, left, right = self._changed_blocks_window(
+            changed_blocks, diff_magnitude.shape
+        )
+        window = diff_magnitude[top:bottom, left:right]
+        
+        if CV2_AVAILABLE:
+            mask_u8 = cv2.compare(window, threshold, cv2.CMP_GT)
+            changed_mask = mask_u8 > 0
+            diff_pixels = cv2.countNonZero(mask_u8)
+            mean_diff = cv2.mean(window, mask=mask_u8)[0]
+        else:
+            # Create binary mask of changed pixels
+            changed_mask = window > threshold
+            diff_pixels = int(np.sum(changed_mask))
+            mean_diff = float(np.mean(window[changed_mask]))
+        
+        return changed_mask, (top, left), diff_pixels, mean_diff, max_diff
+    
+    def _find_changed_blocks(
+        self,
+        diff_magnitude: np.ndarray,
+        threshold: int
+    ) -> np.ndarray:
+        """
+        Flag fixed-size blocks that contain at least one changed pixel.
+        
+        Cheap first pass of the two-pass comparison: most screenshot pairs
+        are nearly identical, so the expensive per-pixel analysis only
+        needs to run where a block actually changed.
+        
+        Args:
+            diff_magnitude: Per-pixel difference magnitude (H x W)
+            threshold: Pixel difference threshold (0-255)
+            
+        Returns:
+            Boolean array of shape (ceil(H / block), ceil(W / block))
+        """
+        block = self._diff_block_size
+        height, width = diff_magnitude.shape
+        
+        # Block-wise maximum without padding to a multiple of the block size
+        block_max = np.maximum.reduceat(diff_magnitude, np.arange(0, height, block), axis=0)
+        block_max = np.maximum.reduceat(block_max, np.arange(0, width, block), axis=1)
+        
+        return block_max > threshold
+    
+    def _changed_blocks_window(
+        self,
+        changed_blocks: np.ndarray,
+        shape: Tuple[int, int]
+    ) -> Tuple[int, int, int, int]:
+        """
+        Get the pixel bounding window covering all changed blocks.
+        
+        Args:
+            changed_blocks: Block flags from _find_changed_blocks
+            shape: Full image shape (height, width)
+            
+        Returns:
+            Tuple of (top, bottom, left, right) pixel bounds (exclusive end)
+        """
+        block = self._diff_block_size
+        height, width = shape
+        
+        rows = np.flatnonzero(changed_blocks.any(axis=1))
+        cols = np.flatnonzero(changed_blocks.any(axis=0))
+        
+        top = int(rows[0]) * block
+        bottom = min(height, (int(rows[-1]) + 1) * block)
+        left = int(cols[0]) * block
+        right = min(width, (int(cols[-1]) + 1) * block)
+        
+        return top, bottom, left, right
+    
     def _find_difference_regions(
         self,
         mask: np.ndarray,
@@ -806,111 +1289,226 @@ class ExecutionVerifier:
             min_region_size: Minimum number of pixels for a region
             
         Returns:
-            List of region dictionaries with keys: left, top, right, bottom, area
+            List of up to 50 region dictionaries, largest first, with keys:
+            left, top, right, bottom, area, width, height
+        """
+        return self._regions_to_dicts(
+            self._find_difference_region_array(mask, min_region_size)
+        )
+    
+    def _find_difference_region_array(
+        self,
+        mask: np.ndarray,
+        min_region_size: int = 100
+    ) -> np.ndarray:
+        """
+        Find difference regions as a structured array.
+        
+        Columnar form of _find_difference_regions for internal consumers,
+        which can filter or offset regions with vectorized column ops.
+        
+        Args:
+            mask: Binary mask of changed pixels (True = changed)
+            min_region_size: Minimum number of pixels for a region
+            
+        Returns:
+            Array of dtype REGION_DTYPE holding up to 50 regions, largest first
         """
         try:
-            # Find connected components using simple flood fill approach
-            # For production, could use scipy.ndimage.label or cv2.connectedComponents
-            
-            regions = []
-            visited = np.zeros_like(mask, dtype=bool)
-            height, width = mask.shape
-            
-            def flood_fill(start_y: int, start_x: int) -> Optional[Dict[str, int]]:
-                """Flood fill to find connected region."""
-                stack = [(start_y, start_x)]
-                min_x, min_y = start_x, start_y
-                max_x, max_y = start_x, start_y
-                area = 0
-                
-                while stack and area < 10000:  # Limit to prevent infinite loops
-                    y, x = stack.pop()
-                    
-                    if (y < 0 or y >= height or x < 0 or x >= width or
-                        visited[y, x] or not mask[y, x]):
-                        continue
-                    
-                    visited[y, x] = True
-                    area += 1
-                    
-                    min_x = min(min_x, x)
-                    max_x = max(max_x, x)
-                    min_y = min(min_y, y)
-                    max_y = max(max_y, y)
-                    
-                    # Add neighbors
-                    stack.extend([(y-1, x), (y+1, x), (y, x-1), (y, x+1)])
-                
-                if area >= min_region_size:
-                    return {
-                        'left': int(min_x),
-                        'top': int(min_y),
-                        'right': int(max_x),
-                        'bottom': int(max_y),
-                        'area': int(area),
-                        'width': int(max_x - min_x + 1),
-                        'height': int(max_y - min_y + 1)
-                    }
-                return None
-            
-            # Find all regions
-            for y in range(height):
-                for x in range(width):
-                    if mask[y, x] and not visited[y, x]:
-                        region = flood_fill(y, x)
-                        if region:
-                            regions.append(region)
-                            
-                            # Limit number of regions to prevent excessive processing
-                            if len(regions) >= 50:
-                                return regions
-            
-            return regions
+            if CV2_AVAILABLE:
+                mask_u8 = np.ascontiguousarray(mask, dtype=np.uint8)
+                _, _, stats, _ = cv2.connectedComponentsWithStats(mask_u8, connectivity=4)
+                regions = self._regions_from_stats(stats, min_region_size)
+            elif NUMBA_AVAILABLE:
+                _, stats = _label_ccl(np.ascontiguousarray(mask, dtype=np.bool_))
+                regions = self._regions_from_stats(stats, min_region_size)
+            else:
+                regions = self._label_regions_flood_fill(mask, min_region_size)
+            
+            # Keep the 50 largest regions rather than the first 50 in raster order
+            return regions[np.argsort(-regions['area'], kind='stable')][:50]
             
         except Exception as e:
             self.logger.error(f"Failed to find difference regions: {e}")
-            return []
+            return np.empty(0, dtype=REGION_DTYPE)
+    
+    def _regions_to_dicts(self, regions: np.ndarray) -> List[Dict[str, int]]:
+        """
+        Convert a REGION_DTYPE array to region dictionaries.
+        
+        Args:
+            regions: Structured region array
+            
+        Returns:
+            List of region dictionaries
+        """
+        names = REGION_DTYPE.names
+        return [dict(zip(names, row)) for row in regions.tolist()]
+    
+    def _label_regions_flood_fill(
+        self,
+        mask: np.ndarray,
+        min_region_size: int
+    ) -> np.ndarray:
+        """
+        Find difference regions with a simple flood fill.
+        
+        Fallback when neither OpenCV nor Numba is available.
+        
+        Args:
+            mask: Binary mask of changed pixels (True = changed)
+            min_region_size: Minimum number of pixels for a region
+            
+        Returns:
+            Unordered array of dtype REGION_DTYPE
+        """
+        regions = []
+        visited = np.zeros_like(mask, dtype=bool)
+        height, width = mask.shape
+        
+        def flood_fill(start_y: int, start_x: int) -> Optional[Tuple[int, ...]]:
+            """Flood fill to find connected region."""
+            stack = [(start_y, start_x)]
+            min_x, min_y = start_x, start_y
+            max_x, max_y = start_x, start_y
+            area = 0
+            
+            while stack and area < 10000:  # Limit to prevent infinite loops
+                y, x = stack.pop()
+                
+                if (y < 0 or y >= height or x < 0 or x >= width or
+                    visited[y, x] or not mask[y, x]):
+                    continue
+                
+                visited[y, x] = True
+                area += 1
+                
+                min_x = min(min_x, x)
+                max_x = max(max_x, x)
+                min_y = min(min_y, y)
+                max_y = max(max_y, y)
+                
+                # Add neighbors
+                stack.extend([(y-1, x), (y+1, x), (y, x-1), (y, x+1)])
+            
+            if area >= min_region_size:
+                return (
+                    min_x, min_y, max_x, max_y, area,
+                    max_x - min_x + 1, max_y - min_y + 1
+                )
+            return None
+        
+        # Find all regions
+        for y in range(height):
+            for x in range(width):
+                if mask[y, x] and not visited[y, x]:
+                    region = flood_fill(y, x)
+                    if region:
+                        regions.append(region)
+        
+        return np.array(regions, dtype=REGION_DTYPE)
+    
+    def _regions_from_stats(
+        self,
+        stats: np.ndarray,
+        min_region_size: int
+    ) -> np.ndarray:
+        """
+        Build regions from connected component statistics.
+        
+        Accepts the stats layout of cv2.connectedComponentsWithStats (and
+        _label_ccl): one row per label with columns left, top, width,
+        height, area, where row 0 is the background. Both labelers use
+        4-connectivity to match the flood fill fallback.
+        
+        Args:
+            stats: Component statistics (N x 5)
+            min_region_size: Minimum number of pixels for a region
+            
+        Returns:
+            Unordered array of dtype REGION_DTYPE
+        """
+        # Drop the background label and undersized components
+        stats = stats[1:]
+        stats = stats[stats[:, 4] >= min_region_size]
+        
+        regions = np.empty(len(stats), dtype=REGION_DTYPE)
+        regions['left'] = stats[:, 0]
+        regions['top'] = stats[:, 1]
+        regions['width'] = stats[:, 2]
+        regions['height'] = stats[:, 3]
+        regions['area'] = stats[:, 4]
+        regions['right'] = regions['left'] + regions['width'] - 1
+        regions['bottom'] = regions['top'] + regions['height'] - 1
+        
+        return regions
     
     def _calculate_structural_similarity(
         self,
         arr1: np.ndarray,
         arr2: np.ndarray,
-        window_size: int = 11
+        window_size: int = 11,
+        ssim_scale: float = 0.5
     ) -> float:
         """
         Calculate structural similarity between two images.
         
         Simplified SSIM (Structural Similarity Index) implementation.
         
+        The grayscale images are area-downsampled by ssim_scale before the
+        statistics are taken. Means are preserved exactly, but averaging
+        smooths fine texture, so variances shrink slightly and scores may
+        drift by a few percent versus full resolution in exchange for
+        touching 1/scale^2 fewer pixels. Pixel counts and difference regions
+        are always computed at full resolution elsewhere.
+        
         Args:
             arr1: First image as numpy array
             arr2: Second image as numpy array
             window_size: Size of sliding window for local comparison
+            ssim_scale: Downsampling factor (0-1]; 1.0 disables downsampling
             
         Returns:
             Structural similarity score (0.0-1.0)
         """
         try:
             # Convert to grayscale for SSIM calculation
-            if len(arr1.shape) == 3:
-                gray1 = np.mean(arr1, axis=2)
-                gray2 = np.mean(arr2, axis=2)
-            else:
-                gray1 = arr1
-                gray2 = arr2
+            gray1 = self._to_grayscale(arr1)
+            gray2 = self._to_grayscale(arr2)
+            
+            # Fast path: compare downsampled images
+            if ssim_scale < 1.0 and min(gray1.shape) * ssim_scale >= 1:
+                gray1 = self._downsample(gray1, ssim_scale)
+                gray2 = self._downsample(gray2, ssim_scale)
+            
+            # float32 is plenty for 8-bit data and half the traffic of float64
+            gray1 = gray1.astype(np.float32, copy=False)
+            gray2 = gray2.astype(np.float32, copy=False)
             
             # Constants for SSIM
             C1 = (0.01 * 255) ** 2
             C2 = (0.03 * 255) ** 2
             
-            # Calculate means
-            mu1 = gray1.mean()
-            mu2 = gray2.mean()
-            
-            # Calculate variances and covariance
-            sigma1_sq = np.var(gray1)
-            sigma2_sq = np.var(gray2)
-            sigma12 = np.cov(gray1.flatten(), gray2.flatten())[0, 1]
+            if CV2_AVAILABLE:
+                # Single vectorized pass per statistic via OpenCV
+                gray1 = np.ascontiguousarray(gray1)
+                gray2 = np.ascontiguousarray(gray2)
+                mean1, std1 = cv2.meanStdDev(gray1)
+                mean2, std2 = cv2.meanStdDev(gray2)
+                mu1, mu2 = float(mean1[0, 0]), float(mean2[0, 0])
+                sigma1_sq = float(std1[0, 0]) ** 2
+                sigma2_sq = float(std2[0, 0]) ** 2
+                sigma12 = cv2.mean(cv2.multiply(gray1, gray2))[0] - mu1 * mu2
+            else:
+                # Calculate means
+                mu1 = gray1.mean()
+                mu2 = gray2.mean()
+                
+                # Calculate variances and covariance (population, like np.var);
+                # avoids np.cov's flattened copies and 2xN stacking
+                sigma1_sq = np.var(gray1)
+                sigma2_sq = np.var(gray2)
+                sigma12 = np.mean((gray1 - mu1) * (gray2 - mu2), dtype=np.float64)
             
             # Calculate SSIM
             numerator = (2 * mu1 * mu2 + C1) * (2 * sigma12 + C2)
@@ -927,6 +1525,58 @@ class ExecutionVerifier:
             self.logger.error(f"Failed to calculate structural similarity: {e}")
             return 0.0
     
+    def _to_grayscale(self, arr: np.ndarray) -> np.ndarray:
+        """
+        Convert an RGB image array to BT.601 luma.
+        
+        Uses OpenCV's SIMD cvtColor for uint8 input when available, else
+        the integer approximation Y = (77*R + 150*G + 29*B) >> 8, which
+        keeps intermediates in uint16 instead of promoting to float64.
+        
+        Args:
+            arr: Image array (H x W x C); 2-D arrays are returned unchanged
+            
+        Returns:
+            Grayscale array (uint8 for uint8 input, float32 otherwise)
+        """
+        if arr.ndim == 2:
+            return arr
+        
+        if arr.dtype == np.uint8:
+            if CV2_AVAILABLE:
+                return cv2.cvtColor(np.ascontiguousarray(arr[..., :3]), cv2.COLOR_RGB2GRAY)
+            
+            luma = (
+                77 * arr[..., 0].astype(np.uint16)
+                + 150 * arr[..., 1].astype(np.uint16)
+                + 29 * arr[..., 2].astype(np.uint16)
+            )
+            return (luma >> 8).astype(np.uint8)
+        
+        rgb = arr.astype(np.float32, copy=False)
+        return (77 * rgb[..., 0] + 150 * rgb[..., 1] + 29 * rgb[..., 2]) / 256
+    
+    def _downsample(self, gray: np.ndarray, scale: float) -> np.ndarray:
+        """
+        Area-average downsample a grayscale image.
+        
+        Args:
+            gray: Grayscale image (H x W)
+            scale: Scale factor (0-1)
+            
+        Returns:
+            Downsampled grayscale image
+        """
+        if CV2_AVAILABLE:
+            return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        # Integer block averaging (trailing partial blocks are dropped)
+        factor = max(1, int(round(1 / scale)))
+        height = gray.shape[0] // factor * factor
+        width = gray.shape[1] // factor * factor
+        blocks = gray[:height, :width].reshape(height // factor, factor, width // factor, factor)
+        return blocks.mean(axis=(1, 3), dtype=np.float32)
+    
     async def compare_region(
         self,
         img1: Image.Image,
@@ -949,24 +1599,25 @@ class ExecutionVerifier:
             Dictionary with comparison results for the region
         """
         try:
-            # Extract region coordinates
-            left = region.get('left', 0)
-            top = region.get('top', 0)
-            right = region.get('right', img1.width)
-            bottom = region.get('bottom', img1.height)
-            
-            # Validate coordinates
-            left = max(0, min(left, img1.width - 1))
-            top = max(0, min(top, img1.height - 1))
-            right = max(left + 1, min(right, img1.width))
-            bottom = max(top + 1, min(bottom, img1.height))
-            
-            # Crop regions
-            region1 = img1.crop((left, top, right, bottom))
-            region2 = img2.crop((left, top, right, bottom))
-            
-            # Compare cropped regions
-            comparison = await self._compare_images_advanced(region1, region2, threshold)
+            width, height = img1.size
+            
+            # Extract region coordinates and clamp them into the image,
+            # keeping at least one pixel in each dimension
+            left = max(0, min(region.get('left', 0), width - 1))
+            top = max(0, min(region.get('top', 0), height - 1))
+            right = max(left + 1, min(region.get('right', width), width))
+            bottom = max(top + 1, min(region.get('bottom', height), height))
+            
+            # Compare cropped region off the event loop
+            loop = asyncio.get_running_loop()
+            comparison = await loop.run_in_executor(
+                _get_compare_executor(),
+                self._compare_images_advanced_sync,
+                img1,
+                img2,
+                threshold,
+                (left, top, right, bottom)
+            )
             
             # Add region info
             comparison['region'] = {
@@ -988,14 +1639,91 @@ class ExecutionVerifier:
                 'error': str(e)
             }
     
-    def get_verification_results(self) -> List[VerificationResult]:
+    def get_verification_results(self) -> Tuple[VerificationResult, ...]:
         """
         Get all verification results.
         
         Returns:
-            List of VerificationResult objects
+            Immutable snapshot of VerificationResult objects
+        """
+        return tuple(self.verification_results)
+    
+    def iter_results(self) -> Iterator[VerificationResult]:
+        """
+        Iterate over verification results without copying them.
+        
+        Do not store new verification results while iterating.
+        
+        Returns:
+            Iterator of VerificationResult objects
+        """
+        return iter(self.verification_results)
+    
+    def get_verification_batch(self) -> VerificationBatch:
+        """
+        Get all verification results as a VerificationBatch.
+        
+        Returns:
+            VerificationBatch with one entry per stored result
+        """
+        count = self._sync_result_arrays()
+        results = self.verification_results
+        return VerificationBatch(
+            success=self._result_success[:count].copy(),
+            confidence=self._result_confidence[:count].copy(),
+            action_type=[r.action_type for r in results],
+            error_message=[r.error_message for r in results],
+            metadata=[r.metadata for r in results],
+        )
+    
+    def _store_result(self, result: VerificationResult) -> None:
+        """Store a verification result and mirror it into the columnar arrays."""
+        self._sync_result_arrays()
+        self.verification_results.append(result)
+        self._mirror_result(result)
+    
+    def _mirror_result(self, result: VerificationResult) -> None:
+        """Write a result into the next slot of the columnar arrays."""
+        index = self._result_count
+        if index == len(self._result_success):
+            # Grow by doubling to keep appends amortized O(1)
+            capacity = 2 * len(self._result_success)
+            success = np.empty(capacity, dtype=bool)
+            confidence = np.empty(capacity, dtype=np.float64)
+            success[:index] = self._result_success[:index]
+            confidence[:index] = self._result_confidence[:index]
+            self._result_success = success
+            self._result_confidence = confidence
+        
+        self._result_success[index] = result.success
+        self._result_confidence[index] = result.confidence
+        self._result_count = index + 1
+        self._result_last = result
+    
+    def _sync_result_arrays(self) -> int:
+        """
+        Bring the columnar success/confidence arrays up to date.
+        
+        Results stored by verify_action are written into the arrays as
+        they are stored. The list is public, so results appended to it
+        directly are copied in here, and the arrays are rebuilt if the list
+        no longer ends with the last mirrored result (it was cleared,
+        truncated or refilled). Results edited in place after being stored
+        are not detected.
+        
+        Returns:
+            Number of valid entries in the arrays
         """
-        return self.verification_results.copy()
+        results = self.verification_results
+        count = self._result_count
+        if count and (len(results) < count or results[count - 1] is not self._result_last):
+            self._result_count = 0
+            self._result_last = None
+        
+        for index in range(self._result_count, len(results)):
+            self._mirror_result(results[index])
+        
+        return self._result_count
     
     def get_success_rate(self) -> float:
         """
@@ -1004,16 +1732,19 @@ class ExecutionVerifier:
         Returns:
             Success rate (0.0 to 1.0)
         """
-        if not self.verification_results:
+        count = self._sync_result_arrays()
+        if count == 0:
             return 0.0
         
-        successful = sum(1 for r in self.verification_results if r.success)
-        return successful / len(self.verification_results)
+        successful = int(np.count_nonzero(self._result_success[:count]))
+        return successful / count
     
     def clear_results(self) -> None:
         """Clear all verification results and screenshots."""
         self.verification_results.clear()
         self.verification_screenshots.clear()
+        self._result_count = 0
+        self._result_last = None
         self.logger.info("Verification results cleared")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -1023,7 +1754,8 @@ class ExecutionVerifier:
         Returns:
             Dictionary with verification stats
         """
-        if not self.verification_results:
+        count = self._sync_result_arrays()
+        if count == 0:
             return {
                 'total_verifications': 0,
                 'successful': 0,
@@ -1032,15 +1764,15 @@ class ExecutionVerifier:
                 'average_confidence': 0.0
             }
         
-        successful = sum(1 for r in self.verification_results if r.success)
-        failed = len(self.verification_results) - successful
-        avg_confidence = sum(r.confidence for r in self.verification_results) / len(self.verification_results)
+        successful = int(np.count_nonzero(self._result_success[:count]))
+        failed = count - successful
+        avg_confidence = float(self._result_confidence[:count].mean())
         
         return {
-            'total_verifications': len(self.verification_results),
+            'total_verifications': count,
             'successful': successful,
             'failed': failed,
-            'success_rate': successful / len(self.verification_results),
+            'success_rate': successful / count,
             'average_confidence': avg_confidence,
             'screenshots_stored': len(self.verification_screenshots)
         }
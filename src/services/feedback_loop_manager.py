@@ -9,17 +9,172 @@ This module provides feedback loop capabilities for automation execution:
 """
 
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
-from collections import defaultdict
+import copy
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Union, Deque, Tuple
+from dataclasses import dataclass, field, replace
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterator, MutableMapping
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from src.config import get_config
 from src.logger import get_app_logger
-from src.services.execution_verifier import VerificationResult
+from src.services.execution_verifier import VerificationResult, VerificationBatch
+
+
+# Failure types, indexed by the codes produced by the classification kernel
+FAILURE_TYPES = ('timing', 'coordinate', 'selector', 'validation', 'unknown')
+
+# Error message keywords for the timing, coordinate and selector failure types
+_FAILURE_KEYWORDS = (
+    ('timeout', 'time'),
+    ('coordinate', 'position', 'bounds'),
+    ('selector', 'element', 'not found'),
+)
+
+# One alternation per keyword group, so a single scan of the message finds
+# every keyword and match.lastindex identifies its group
+_FAILURE_KEYWORD_RE = re.compile(
+    '|'.join(
+        '(' + '|'.join(re.escape(keyword) for keyword in keywords) + ')'
+        for keywords in _FAILURE_KEYWORDS
+    ),
+    re.IGNORECASE
+)
+
+# Execution history log size at which it is rewritten from memory
+_HISTORY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize an object as one line of JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode() + b'\n'
+
+
+def _history_log_path(state_path: Path) -> Path:
+    """Get the execution history log that accompanies a state file."""
+    return state_path.with_name(state_path.stem + '_history.jsonl')
+
+
+# Suggestions for recurring failure types: (failure type, count threshold, message)
+_PATTERN_RULES = (
+    ('timing', 3, "Add wait steps between actions to allow UI to update"),
+    ('coordinate', 3, "Use relative positioning or element detection instead of fixed coordinates"),
+    ('selector', 3, "Update element selectors - target elements may have changed"),
+    ('validation', 3, "Add explicit verification steps after critical actions"),
+)
+
+# Suggestions that do not depend on workflow state
+_NO_HISTORY_SUGGESTION = "No execution history available for analysis"
+_LOW_SUCCESS_RATE_SUGGESTION = (
+    "Low success rate detected. Consider manual review of workflow steps."
+)
+_PARAMETERIZE_SUGGESTION = "Consider parameterizing workflow values for better reusability"
+_LOW_CONFIDENCE_SUGGESTION = (
+    "Very low confidence score. Workflow may need significant revision."
+)
+_PERFORMING_WELL_SUGGESTION = (
+    "Workflow is performing well. No improvements suggested at this time."
+)
+
+
+@lru_cache(maxsize=128)
+def _repeated_failure_suggestion(failure_count: int) -> str:
+    """Get the manual review suggestion for a number of consecutive failures."""
+    return (
+        f"Workflow has failed {failure_count} times consecutively. "
+        "Manual review recommended."
+    )
+
+
+def _trailing_failures(history: Deque[Dict[str, Any]], saved_count: int,
+                       unsaved_count: int) -> int:
+    """
+    Count the consecutive failed executions at the end of a history.
+    
+    Args:
+        history: Execution result entries, oldest first
+        saved_count: Consecutive failures recorded when the state was saved
+        unsaved_count: Number of entries at the end of the history logged
+            after the state was saved
+        
+    Returns:
+        Number of consecutive failures
+    """
+    for count, entry in enumerate(reversed(history)):
+        if entry.get('success', False):
+            return count
+    
+    # Every retained execution failed; the run may have started before the
+    # oldest one, which the saved count still covers
+    return max(len(history), saved_count + unsaved_count)
+
+
+@lru_cache(maxsize=1024)
+def _error_message_code(error_message: Optional[str]) -> int:
+    """
+    Map an error message to the index of its highest priority keyword group.
+    
+    Groups earlier in _FAILURE_KEYWORDS take priority wherever they occur
+    in the message.
+    
+    Args:
+        error_message: Verification error message, if any
+        
+    Returns:
+        Index into _FAILURE_KEYWORDS, or -1 if no keyword matches
+    """
+    code = -1
+    for match in _FAILURE_KEYWORD_RE.finditer(error_message or ""):
+        group = match.lastindex - 1
+        if group == 0:
+            return 0
+        if code < 0 or group < code:
+            code = group
+    return code
 
 
-@dataclass
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _classify_failure_codes(error_codes, confidence):
+        """
+        Classify failures from pre-tokenized error codes and confidences.
+        
+        Returns an int8 array of indices into FAILURE_TYPES.
+        """
+        failure_codes = np.empty(error_codes.shape[0], dtype=np.int8)
+        for i in range(error_codes.shape[0]):
+            if error_codes[i] >= 0:
+                failure_codes[i] = error_codes[i]
+            elif confidence[i] < 0.5:
+                failure_codes[i] = 3
+            else:
+                failure_codes[i] = 4
+        return failure_codes
+
+
+@dataclass(slots=True)
 class Adjustment:
     """
     Represents a workflow adjustment based on feedback analysis.
@@ -38,12 +193,18 @@ class Adjustment:
         return {
             'action_index': self.action_index,
             'adjustment_type': self.adjustment_type,
-            'old_value': str(self.old_value),
-            'new_value': str(self.new_value),
+            'old_value': self._format_value(self.old_value),
+            'new_value': self._format_value(self.new_value),
             'reason': self.reason,
             'confidence': self.confidence,
         }
     
+    def _format_value(self, value: Any) -> str:
+        """Format a value for storage; timing values are stored as e.g. '2.0s'."""
+        if self.adjustment_type == 'timing' and isinstance(value, (int, float)):
+            return f"{value}s"
+        return str(value)
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Adjustment':
         """Create Adjustment from dictionary."""
@@ -57,7 +218,53 @@ class Adjustment:
         )
 
 
-@dataclass
+
+# Suggested adjustments that do not depend on the failed action; copied
+# with the action index filled in
+_ADJUSTMENT_TEMPLATES = {
+    # Suggest adding delay
+    'timing': Adjustment(
+        action_index=-1,
+        adjustment_type='timing',
+        old_value=0.5,
+        new_value=2.0,
+        reason='Increase delay to allow UI to update',
+        confidence=0.8
+    ),
+    # Suggest trying alternative selector
+    'selector': Adjustment(
+        action_index=-1,
+        adjustment_type='selector',
+        old_value='current_selector',
+        new_value='alternative_selector',
+        reason='Try alternative element selector',
+        confidence=0.5
+    ),
+    # Suggest adding verification step
+    'validation': Adjustment(
+        action_index=-1,
+        adjustment_type='validation',
+        old_value='none',
+        new_value='add_wait_and_verify',
+        reason='Add explicit wait and verification step',
+        confidence=0.7
+    ),
+}
+
+
+@lru_cache(maxsize=1024)
+def _coordinate_adjustment(x: int, y: int) -> Adjustment:
+    """Get the coordinate adjustment template for a click location."""
+    return Adjustment(
+        action_index=-1,
+        adjustment_type='coordinate',
+        old_value=(x, y),
+        new_value=(x + 5, y + 5),
+        reason='Adjust click position based on verification',
+        confidence=0.6
+    )
+
+@dataclass(slots=True)
 class FeedbackAnalysis:
     """
     Result of execution feedback analysis.
@@ -108,6 +315,57 @@ class FeedbackAnalysis:
             timestamp=datetime.fromisoformat(data['timestamp']),
             metadata=data.get('metadata', {}),
         )
+    
+    def to_json(self) -> str:
+        """Convert analysis to JSON string."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict()).decode()
+        return json.dumps(self.to_dict())
+    
+    @classmethod
+    def from_json(cls, json_str: Union[str, bytes]) -> 'FeedbackAnalysis':
+        """Create FeedbackAnalysis from JSON string."""
+        if ORJSON_AVAILABLE:
+            return cls.from_dict(orjson.loads(json_str))
+        return cls.from_dict(json.loads(json_str))
+
+
+class _ConfidenceView(MutableMapping):
+    """
+    Live workflow_id -> confidence mapping over a manager's confidence array.
+    
+    Reads and writes go straight to the array, so assigning a confidence
+    behaves as it did when confidences were kept in a dict.
+    """
+    
+    __slots__ = ('_manager',)
+    
+    def __init__(self, manager: 'FeedbackLoopManager'):
+        self._manager = manager
+    
+    def __getitem__(self, workflow_id: str) -> float:
+        slot = self._manager._confidence_slots[workflow_id]
+        return float(self._manager._confidence_values[slot])
+    
+    def __setitem__(self, workflow_id: str, confidence: float) -> None:
+        manager = self._manager
+        manager._confidence_values[manager._confidence_slot(workflow_id)] = confidence
+        manager._suggestion_cache.pop(workflow_id, None)
+    
+    def __delitem__(self, workflow_id: str) -> None:
+        if workflow_id not in self._manager._confidence_slots:
+            raise KeyError(workflow_id)
+        self._manager._release_confidence_slot(workflow_id)
+        self._manager._suggestion_cache.pop(workflow_id, None)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._manager._confidence_slots)
+    
+    def __len__(self) -> int:
+        return len(self._manager._confidence_slots)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 class FeedbackLoopManager:
@@ -120,23 +378,107 @@ class FeedbackLoopManager:
     - Adjust workflow parameters automatically
     - Track confidence scores over time
     - Suggest improvements to users
+    
+    Analysis, adjustment and confidence updates are CPU-only; each async
+    method has a *_sync counterpart for synchronous callers.
     """
     
-    def __init__(self):
+    __slots__ = (
+        'config',
+        'logger',
+        'execution_history',
+        'workflow_adjustments',
+        'consecutive_failures',
+        'failure_patterns',
+        '_history_success_count',
+        '_recent_success',
+        '_recent_success_count',
+        '_last_seen',
+        '_confidence_slots',
+        '_confidence_values',
+        '_confidence_count',
+        '_free_confidence_slots',
+        '_suggestion_cache',
+        '_workflow_stores',
+        '_base_confidence',
+        '_confidence_increase',
+        '_confidence_decrease',
+        '_max_confidence',
+        '_min_confidence',
+        '_retry_threshold',
+        '_history_window',
+        '_max_history',
+        '_max_adjustments',
+        '_inactive_after',
+        '_deep_copy_workflows',
+        '_adjustment_handlers',
+        '_state_path',
+    )
+    
+    def __init__(self, state_path: Optional[Path] = None):
+        """
+        Initialize the feedback loop manager.
+        
+        Args:
+            state_path: File that learned state is loaded from on startup and
+                saved to by save_state, or None to keep state in memory only
+        """
         self.config = get_config()
         self.logger = get_app_logger()
         
-        # Execution history: workflow_id -> list of execution results
-        self.execution_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # Execution history: workflow_id -> most recent execution results
+        self.execution_history: Dict[str, Deque[Dict[str, Any]]] = defaultdict(
+            lambda: deque(maxlen=self._max_history)
+        )
+        
+        # Workflow adjustments: workflow_id -> most recent adjustments
+        self.workflow_adjustments: Dict[str, Deque[Adjustment]] = defaultdict(
+            lambda: deque(maxlen=self._max_adjustments)
+        )
+        
+        # Successful executions in execution_history: workflow_id -> count
+        self._history_success_count: Dict[str, int] = defaultdict(int)
+        
+        # Success bits of the most recent executions used for the
+        # suggest_improvements success rate, with their running sum
+        self._recent_success: Dict[str, Deque[bool]] = defaultdict(
+            lambda: deque(maxlen=self._history_window)
+        )
+        self._recent_success_count: Dict[str, int] = defaultdict(int)
         
-        # Workflow adjustments: workflow_id -> list of adjustments
-        self.workflow_adjustments: Dict[str, List[Adjustment]] = defaultdict(list)
+        # Time of the most recent analysis: workflow_id -> timestamp
+        self._last_seen: Dict[str, datetime] = {}
         
-        # Workflow confidence scores: workflow_id -> confidence
-        self.workflow_confidence: Dict[str, float] = {}
+        # Consecutive failed executions: workflow_id -> count, kept in step
+        # with execution_history so it never has to be rescanned
+        self.consecutive_failures: Dict[str, int] = defaultdict(int)
         
-        # Failure patterns: workflow_id -> pattern counts
-        self.failure_patterns: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # Workflow confidence scores, stored as one array indexed through
+        # workflow_id -> slot so batches of updates are vector operations
+        self._confidence_slots: Dict[str, int] = {}
+        self._confidence_values = np.empty(64, dtype=np.float64)
+        self._confidence_count = 0  # Slots allocated so far
+        self._free_confidence_slots: List[int] = []  # Released slots, reused first
+        
+        # Failure patterns: (workflow_id, failure_type) -> count
+        self.failure_patterns: Counter[Tuple[str, str]] = Counter()
+        
+        # Cached suggest_improvements results: workflow_id -> suggestions,
+        # stored as tuples since callers get their own list copy
+        self._suggestion_cache: Dict[str, Tuple[str, ...]] = {}
+        
+        # Stores keyed directly by workflow_id, cleared together
+        self._workflow_stores = (
+            self.execution_history,
+            self.workflow_adjustments,
+            self._confidence_slots,
+            self.consecutive_failures,
+            self._history_success_count,
+            self._recent_success,
+            self._recent_success_count,
+            self._last_seen,
+            self._suggestion_cache,
+        )
         
         # Settings
         self._base_confidence = 0.5
@@ -145,6 +487,25 @@ class FeedbackLoopManager:
         self._max_confidence = 1.0
         self._min_confidence = 0.0
         self._retry_threshold = 3  # Suggest manual review after 3 failures
+        self._history_window = 10  # Recent executions used for the success rate suggestion
+        self._max_history = 100  # Executions kept per workflow
+        self._max_adjustments = 50  # Adjustments kept per workflow
+        self._inactive_after = timedelta(days=30)  # Age at which evict_inactive drops a workflow
+        self._deep_copy_workflows = False  # Deep-copy whole workflows in adjust_workflow
+        
+        # Handlers for adjustments that modify a single action in place;
+        # validation adjustments insert steps and are handled separately
+        self._adjustment_handlers = {
+            'timing': self._apply_timing_adjustment,
+            'coordinate': self._apply_coordinate_adjustment,
+            'selector': self._apply_selector_adjustment,
+        }
+        
+        self._state_path = state_path
+        if state_path is not None and (
+            state_path.exists() or _history_log_path(state_path).exists()
+        ):
+            self.load_state(state_path)
         
         self.logger.info("Feedback loop manager initialized")
     
@@ -158,13 +519,21 @@ class FeedbackLoopManager:
             self.logger.info("Feedback loop manager initialization complete")
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize feedback loop manager: {e}")
+            self.logger.error("Failed to initialize feedback loop manager: %s", e)
             raise
     
     async def analyze_execution(
         self,
         execution: Any,  # WorkflowExecution object
-        verification_results: List[VerificationResult]
+        verification_results: Union[VerificationBatch, List[VerificationResult]]
+    ) -> FeedbackAnalysis:
+        """Analyze execution results and generate feedback (see analyze_execution_sync)."""
+        return self.analyze_execution_sync(execution, verification_results)
+    
+    def analyze_execution_sync(
+        self,
+        execution: Any,  # WorkflowExecution object
+        verification_results: Union[VerificationBatch, List[VerificationResult]]
     ) -> FeedbackAnalysis:
         """
         Analyze execution results and generate feedback.
@@ -173,224 +542,489 @@ class FeedbackLoopManager:
         
         Args:
             execution: WorkflowExecution instance
-            verification_results: List of VerificationResult objects
+            verification_results: VerificationBatch, or a list of
+                VerificationResult objects
             
         Returns:
             FeedbackAnalysis with detected issues and suggestions
         """
         try:
-            workflow_id = execution.workflow_id
-            execution_id = execution.id
-            
-            self.logger.info(f"Analyzing execution: {execution_id}")
+            batch = self._as_batch(verification_results)
+            count = len(batch)
             
-            # Calculate overall success rate
-            if verification_results:
-                successful_verifications = sum(1 for vr in verification_results if vr.success)
-                success_rate = successful_verifications / len(verification_results)
+            # Calculate overall success rate and confidence
+            if count:
+                success_rate = float(batch.success.mean())
+                avg_confidence = float(batch.confidence.mean())
             else:
                 success_rate = 1.0 if execution.state.value == 'completed' else 0.0
+                avg_confidence = 0.5
             
-            overall_success = success_rate >= 0.8  # 80% threshold
+            return self._record_analysis(execution, batch, success_rate, avg_confidence)
             
-            # Calculate confidence based on verification results
-            if verification_results:
-                avg_confidence = sum(vr.confidence for vr in verification_results) / len(verification_results)
-            else:
-                avg_confidence = 0.5
+        except Exception as e:
+            return self._analysis_error(execution, e)
+    
+    async def analyze_batch(
+        self,
+        executions: List[Any],
+        verification_results: List[Union[VerificationBatch, List[VerificationResult]]],
+        workers: Optional[int] = None
+    ) -> List[FeedbackAnalysis]:
+        """Analyze many executions at once (see analyze_batch_sync)."""
+        return self.analyze_batch_sync(executions, verification_results, workers)
+    
+    def analyze_batch_sync(
+        self,
+        executions: List[Any],
+        verification_results: List[Union[VerificationBatch, List[VerificationResult]]],
+        workers: Optional[int] = None
+    ) -> List[FeedbackAnalysis]:
+        """
+        Analyze many executions at once.
+        
+        Success rates and average confidences for all executions are
+        computed together over the concatenated verification results;
+        issues, adjustments and history are then recorded per execution,
+        in order, exactly as analyze_execution would.
+        
+        With workers > 1, failures of executions that had any are
+        classified and described in a process pool first; only the
+        merge into history and failure patterns runs in this process.
+        
+        Args:
+            executions: WorkflowExecution instances
+            verification_results: Verification results for each execution
+            workers: Number of worker processes, or None to run in-process
             
-            # Detect issues
-            issues_detected = []
-            suggested_adjustments = []
-            
-            # Analyze each verification result
-            for i, vr in enumerate(verification_results):
-                if not vr.success:
-                    # Identify failure type
-                    if vr.error_message:
-                        issues_detected.append(
-                            f"Action {i+1} ({vr.action_type}): {vr.error_message}"
-                        )
-                    else:
-                        issues_detected.append(
-                            f"Action {i+1} ({vr.action_type}): Verification failed "
-                            f"(confidence: {vr.confidence:.2f})"
-                        )
-                    
-                    # Detect failure patterns
-                    failure_type = self._classify_failure(vr)
-                    self.failure_patterns[workflow_id][failure_type] += 1
-                    
-                    # Generate adjustment suggestions
-                    adjustment = self._suggest_adjustment(i, vr, failure_type)
-                    if adjustment:
-                        suggested_adjustments.append(adjustment)
-            
-            # Check for common patterns
-            common_issues = self._identify_common_patterns(workflow_id, verification_results)
-            issues_detected.extend(common_issues)
-            
-            # Determine if retry is recommended
-            failure_count = self._get_failure_count(workflow_id)
-            should_retry = not overall_success and failure_count < self._retry_threshold
-            retry_delay = min(5 * (failure_count + 1), 30)  # Exponential backoff, max 30s
-            
-            # Create analysis
-            analysis = FeedbackAnalysis(
-                execution_id=execution_id,
-                workflow_id=workflow_id,
-                overall_success=overall_success,
-                confidence=avg_confidence,
-                issues_detected=issues_detected,
-                suggested_adjustments=suggested_adjustments,
-                should_retry=should_retry,
-                retry_delay=retry_delay,
-                metadata={
-                    'success_rate': success_rate,
-                    'verification_count': len(verification_results),
-                    'failure_count': failure_count,
-                    'execution_state': execution.state.value,
-                }
+        Returns:
+            FeedbackAnalysis for each execution
+        """
+        if len(executions) != len(verification_results):
+            raise ValueError(
+                f"Got {len(executions)} executions but "
+                f"{len(verification_results)} verification result sets"
+            )
+        
+        try:
+            batches = [self._as_batch(results) for results in verification_results]
+            counts = np.fromiter((len(b) for b in batches), dtype=np.int64, count=len(batches))
+            
+            # Sum each execution's entries with one bincount per field
+            owner = np.repeat(np.arange(len(batches)), counts)
+            success_sums = np.bincount(
+                owner,
+                weights=np.concatenate([b.success for b in batches] or [np.empty(0, bool)]),
+                minlength=len(batches)
+            )
+            confidence_sums = np.bincount(
+                owner,
+                weights=np.concatenate([b.confidence for b in batches] or [np.empty(0)]),
+                minlength=len(batches)
             )
             
-            # Store execution result in history
-            self.execution_history[workflow_id].append({
-                'execution_id': execution_id,
-                'timestamp': datetime.now().isoformat(),
-                'success': overall_success,
-                'confidence': avg_confidence,
-                'issues': len(issues_detected),
-            })
+            divisor = np.maximum(counts, 1)
+            success_rates = (success_sums / divisor).tolist()
+            avg_confidences = (confidence_sums / divisor).tolist()
             
-            # Limit history size
-            if len(self.execution_history[workflow_id]) > 100:
-                self.execution_history[workflow_id] = self.execution_history[workflow_id][-100:]
+        except Exception as e:
+            self.logger.error("Failed to prepare batch analysis: %s", e)
+            return [
+                self.analyze_execution_sync(execution, results)
+                for execution, results in zip(executions, verification_results)
+            ]
+        
+        failures = [None] * len(batches)
+        if workers is not None and workers > 1:
+            failures = self._describe_failures_parallel(batches, workers)
+        
+        analyses = []
+        for i, execution in enumerate(executions):
+            try:
+                if counts[i]:
+                    success_rate = success_rates[i]
+                    avg_confidence = avg_confidences[i]
+                else:
+                    success_rate = 1.0 if execution.state.value == 'completed' else 0.0
+                    avg_confidence = 0.5
+                
+                analyses.append(
+                    self._record_analysis(
+                        execution, batches[i], success_rate, avg_confidence, failures[i]
+                    )
+                )
+            except Exception as e:
+                analyses.append(self._analysis_error(execution, e))
+        
+        return analyses
+    
+    def _describe_failures_parallel(
+        self,
+        batches: List[VerificationBatch],
+        workers: int
+    ) -> List[Optional[Tuple[List[str], List[str], List[Adjustment]]]]:
+        """
+        Run _describe_failures for batches with failures in worker processes.
+        
+        Args:
+            batches: Verification results for each execution
+            workers: Number of worker processes
             
-            self.logger.info(
-                f"Analysis complete: success={overall_success}, "
-                f"confidence={avg_confidence:.2f}, issues={len(issues_detected)}"
-            )
+        Returns:
+            _describe_failures result per batch; None for batches without
+            failures, or for all batches if the pool could not be used
+        """
+        failures = [None] * len(batches)
+        failed = [i for i, batch in enumerate(batches) if not batch.success.all()]
+        if not failed:
+            return failures
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    _describe_failures_in_worker,
+                    [batches[i] for i in failed],
+                    chunksize=max(1, len(failed) // (workers * 4))
+                )
+                for i, result in zip(failed, results):
+                    failures[i] = result
+        except Exception as e:
+            self.logger.warning("Parallel failure analysis unavailable, running in-process: %s", e)
+            return [None] * len(batches)
+        
+        return failures
+    
+    def _as_batch(
+        self,
+        verification_results: Union[VerificationBatch, List[VerificationResult]]
+    ) -> VerificationBatch:
+        """Get verification results as a VerificationBatch."""
+        if isinstance(verification_results, VerificationBatch):
+            return verification_results
+        return VerificationBatch.from_list(verification_results)
+    
+    def _record_analysis(
+        self,
+        execution: Any,
+        batch: VerificationBatch,
+        success_rate: float,
+        avg_confidence: float,
+        failures: Optional[Tuple[List[str], List[str], List[Adjustment]]] = None
+    ) -> FeedbackAnalysis:
+        """
+        Build the analysis for one execution and record it in history.
+        
+        Args:
+            execution: WorkflowExecution instance
+            batch: Verification results of the execution
+            success_rate: Fraction of successful verifications
+            avg_confidence: Average verification confidence
+            failures: Precomputed result of _describe_failures, if any
             
-            return analysis
+        Returns:
+            FeedbackAnalysis with detected issues and suggestions
+        """
+        workflow_id = execution.workflow_id
+        execution_id = execution.id
+        now = datetime.now()
+        
+        self.logger.info("Analyzing execution: %s", execution_id)
+        
+        conf = batch.confidence
+        count = len(batch)
+        overall_success = success_rate >= 0.8  # 80% threshold
+        
+        # Detect issues
+        if failures is None:
+            failures = self._describe_failures(batch)
+        failure_types, issues_detected, suggested_adjustments = failures
+        
+        # Detect failure patterns
+        for failure_type in failure_types:
+            self.failure_patterns[(workflow_id, failure_type)] += 1
+        
+        # Check for common patterns
+        common_issues = self._identify_common_patterns(workflow_id, conf)
+        issues_detected.extend(common_issues)
+        
+        # Determine if retry is recommended
+        failure_count = self._get_failure_count(workflow_id)
+        should_retry = not overall_success and failure_count < self._retry_threshold
+        retry_delay = min(5 * (failure_count + 1), 30)  # Exponential backoff, max 30s
+        
+        # Create analysis
+        analysis = FeedbackAnalysis(
+            execution_id=execution_id,
+            workflow_id=workflow_id,
+            overall_success=overall_success,
+            confidence=avg_confidence,
+            issues_detected=issues_detected,
+            suggested_adjustments=suggested_adjustments,
+            should_retry=should_retry,
+            retry_delay=retry_delay,
+            timestamp=now,
+            metadata={
+                'success_rate': success_rate,
+                'verification_count': count,
+                'failure_count': failure_count,
+                'execution_state': execution.state.value,
+            }
+        )
+        
+        # Store execution result in history
+        entry = {
+            'execution_id': execution_id,
+            'timestamp': now.isoformat(),
+            'success': overall_success,
+            'confidence': avg_confidence,
+            'issues': len(issues_detected),
+        }
+        if failure_types:
+            # Lets load_state count failures logged after the last save
+            entry['failure_types'] = list(failure_types)
+        self._append_history(workflow_id, entry)
+        if self._state_path is not None:
+            self._log_history(workflow_id, entry)
+        
+        if overall_success:
+            self.consecutive_failures[workflow_id] = 0
+        else:
+            self.consecutive_failures[workflow_id] += 1
+        
+        self._last_seen[workflow_id] = now
+        self._suggestion_cache.pop(workflow_id, None)
+        
+        self.logger.info(
+            "Analysis complete: success=%s, confidence=%.2f, issues=%d",
+            overall_success, avg_confidence, len(issues_detected)
+        )
+        
+        return analysis
+    
+    def _describe_failures(
+        self,
+        batch: VerificationBatch
+    ) -> Tuple[List[str], List[str], List[Adjustment]]:
+        """
+        Classify, describe and suggest adjustments for failed verifications.
+        
+        Reads no manager state, so it can run in a worker process.
+        
+        Args:
+            batch: Verification results of one execution
+            
+        Returns:
+            Tuple of (failure types, issue descriptions, suggested adjustments)
+        """
+        count = len(batch)
+        
+        # Analyze each failed verification result; skipped entirely in the
+        # common case where every verification succeeded. The failure count
+        # is known up front, so results are written into pre-sized lists
+        n_failures = count - int(np.count_nonzero(batch.success))
+        issues_detected = [None] * n_failures
+        suggested_adjustments = [None] * n_failures
+        failure_types: List[str] = []
+        
+        if n_failures:
+            failed = np.flatnonzero(~batch.success)
+            conf = batch.confidence
+            failure_types = self._classify_failures(batch, failed)
             
+            for slot, (i, failure_type) in enumerate(zip(failed.tolist(), failure_types)):
+                error_message = batch.error_message[i]
+                
+                # Identify failure type
+                if error_message:
+                    issues_detected[slot] = (
+                        f"Action {i+1} ({batch.action_type[i]}): {error_message}"
+                    )
+                else:
+                    issues_detected[slot] = (
+                        f"Action {i+1} ({batch.action_type[i]}): Verification failed "
+                        f"(confidence: {conf[i]:.2f})"
+                    )
+                
+                # Generate adjustment suggestions
+                suggested_adjustments[slot] = self._suggest_adjustment(
+                    i, failure_type, batch.metadata[i]
+                )
+            
+            suggested_adjustments = [a for a in suggested_adjustments if a is not None]
+        
+        return failure_types, issues_detected, suggested_adjustments
+    
+    def _append_history(self, workflow_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Append an execution result to history, keeping success counts in step.
+        
+        Args:
+            workflow_id: Workflow identifier
+            entry: Execution result entry
+        """
+        history = self.execution_history[workflow_id]
+        if len(history) == history.maxlen and history[0].get('success', False):
+            # The oldest entry is about to be evicted
+            self._history_success_count[workflow_id] -= 1
+        
+        success = entry.get('success', False)
+        history.append(entry)
+        if success:
+            self._history_success_count[workflow_id] += 1
+        
+        recent = self._recent_success[workflow_id]
+        if len(recent) == recent.maxlen and recent[0]:
+            self._recent_success_count[workflow_id] -= 1
+        recent.append(success)
+        if success:
+            self._recent_success_count[workflow_id] += 1
+    
+    def _log_history(self, workflow_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Append an execution result to the history log next to the state file.
+        
+        The log is rewritten from the in-memory history once it grows past
+        _HISTORY_LOG_MAX_BYTES.
+        
+        Args:
+            workflow_id: Workflow identifier
+            entry: Execution result entry
+        """
+        log_path = _history_log_path(self._state_path)
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, 'ab') as f:
+                f.write(_dumps_line({'workflow_id': workflow_id, **entry}))
+                size = f.tell()
+            
+            if size > _HISTORY_LOG_MAX_BYTES:
+                self._write_history_log(log_path)
+                
         except Exception as e:
-            self.logger.error(f"Failed to analyze execution: {e}")
-            # Return minimal analysis on error
-            return FeedbackAnalysis(
-                execution_id=getattr(execution, 'id', 'unknown'),
-                workflow_id=getattr(execution, 'workflow_id', 'unknown'),
-                overall_success=False,
-                confidence=0.0,
-                issues_detected=[f"Analysis error: {str(e)}"],
-            )
+            self.logger.error("Failed to log execution history: %s", e)
+    
+    def _write_history_log(self, log_path: Path) -> None:
+        """Rewrite a history log with exactly the in-memory execution history."""
+        tmp_path = log_path.with_name(log_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            for workflow_id, history in self.execution_history.items():
+                for entry in history:
+                    f.write(_dumps_line({'workflow_id': workflow_id, **entry}))
+        os.replace(tmp_path, log_path)
+    
+    def _analysis_error(self, execution: Any, error: Exception) -> FeedbackAnalysis:
+        """Log an analysis failure and return a minimal analysis."""
+        self.logger.error("Failed to analyze execution: %s", error)
+        return FeedbackAnalysis(
+            execution_id=getattr(execution, 'id', 'unknown'),
+            workflow_id=getattr(execution, 'workflow_id', 'unknown'),
+            overall_success=False,
+            confidence=0.0,
+            issues_detected=[f"Analysis error: {str(error)}"],
+        )
     
-    def _classify_failure(self, verification_result: VerificationResult) -> str:
+    def _classify_failure(self, error_message: Optional[str], confidence: float) -> str:
         """
-        Classify the type of failure from verification result.
+        Classify the type of failure from verification result fields.
         
         Args:
-            verification_result: VerificationResult object
+            error_message: Verification error message, if any
+            confidence: Verification confidence
             
         Returns:
             Failure type string (timing, coordinate, selector, validation, unknown)
         """
         # Check error message for clues
-        error_msg = (verification_result.error_message or "").lower()
-        
-        if 'timeout' in error_msg or 'time' in error_msg:
-            return 'timing'
-        elif 'coordinate' in error_msg or 'position' in error_msg or 'bounds' in error_msg:
-            return 'coordinate'
-        elif 'selector' in error_msg or 'element' in error_msg or 'not found' in error_msg:
-            return 'selector'
-        elif verification_result.confidence < 0.5:
+        code = _error_message_code(error_message)
+        if code >= 0:
+            return FAILURE_TYPES[code]
+        elif confidence < 0.5:
             # Low confidence suggests validation issue
             return 'validation'
         else:
             return 'unknown'
     
+    def _classify_failures(
+        self,
+        batch: VerificationBatch,
+        indices: np.ndarray
+    ) -> List[str]:
+        """
+        Classify the failures at the given batch indices.
+        
+        Uses the compiled classification kernel when Numba is available.
+        
+        Args:
+            batch: VerificationBatch being analyzed
+            indices: Indices of failed verification results
+            
+        Returns:
+            Failure type string for each index
+        """
+        if not NUMBA_AVAILABLE or indices.size == 0:
+            return [
+                self._classify_failure(batch.error_message[i], float(batch.confidence[i]))
+                for i in indices.tolist()
+            ]
+        
+        error_codes = np.fromiter(
+            (_error_message_code(batch.error_message[i]) for i in indices.tolist()),
+            dtype=np.int32,
+            count=indices.size
+        )
+        confidence = np.ascontiguousarray(batch.confidence[indices], dtype=np.float64)
+        failure_codes = _classify_failure_codes(error_codes, confidence)
+        return [FAILURE_TYPES[code] for code in failure_codes.tolist()]
+    
     def _suggest_adjustment(
         self,
         action_index: int,
-        verification_result: VerificationResult,
-        failure_type: str
+        failure_type: str,
+        metadata: Optional[Dict[str, Any]]
     ) -> Optional[Adjustment]:
         """
         Suggest an adjustment based on failure type.
         
         Args:
             action_index: Index of failed action
-            verification_result: VerificationResult object
             failure_type: Type of failure
+            metadata: Verification result metadata
             
         Returns:
             Adjustment object or None
         """
         try:
-            if failure_type == 'timing':
-                # Suggest adding delay
-                return Adjustment(
-                    action_index=action_index,
-                    adjustment_type='timing',
-                    old_value='0.5s',
-                    new_value='2.0s',
-                    reason='Increase delay to allow UI to update',
-                    confidence=0.8
-                )
+            # Timing, selector and validation suggestions are constant
+            template = _ADJUSTMENT_TEMPLATES.get(failure_type)
+            if template is not None:
+                return replace(template, action_index=action_index)
             
-            elif failure_type == 'coordinate':
+            if failure_type == 'coordinate':
                 # Suggest coordinate adjustment
-                metadata = verification_result.metadata or {}
-                click_loc = metadata.get('click_location', {})
+                click_loc = (metadata or {}).get('click_location', {})
                 if click_loc:
-                    return Adjustment(
-                        action_index=action_index,
-                        adjustment_type='coordinate',
-                        old_value=f"({click_loc.get('x', 0)}, {click_loc.get('y', 0)})",
-                        new_value=f"({click_loc.get('x', 0) + 5}, {click_loc.get('y', 0) + 5})",
-                        reason='Adjust click position based on verification',
-                        confidence=0.6
+                    template = _coordinate_adjustment(
+                        click_loc.get('x', 0), click_loc.get('y', 0)
                     )
-            
-            elif failure_type == 'selector':
-                # Suggest trying alternative selector
-                return Adjustment(
-                    action_index=action_index,
-                    adjustment_type='selector',
-                    old_value='current_selector',
-                    new_value='alternative_selector',
-                    reason='Try alternative element selector',
-                    confidence=0.5
-                )
-            
-            elif failure_type == 'validation':
-                # Suggest adding verification step
-                return Adjustment(
-                    action_index=action_index,
-                    adjustment_type='validation',
-                    old_value='none',
-                    new_value='add_wait_and_verify',
-                    reason='Add explicit wait and verification step',
-                    confidence=0.7
-                )
+                    return replace(template, action_index=action_index)
             
             return None
             
         except Exception as e:
-            self.logger.error(f"Failed to suggest adjustment: {e}")
+            self.logger.error("Failed to suggest adjustment: %s", e)
             return None
     
     def _identify_common_patterns(
         self,
         workflow_id: str,
-        verification_results: List[VerificationResult]
+        confidences: np.ndarray
     ) -> List[str]:
         """
         Identify common failure patterns across executions.
         
         Args:
             workflow_id: Workflow identifier
-            verification_results: List of verification results
+            confidences: Confidence of each verification result
             
         Returns:
             List of common pattern descriptions
@@ -398,7 +1032,7 @@ class FeedbackLoopManager:
         patterns = []
         
         # Check failure pattern counts
-        pattern_counts = self.failure_patterns.get(workflow_id, {})
+        pattern_counts = self.get_failure_patterns(workflow_id)
         
         for pattern_type, count in pattern_counts.items():
             if count >= 3:
@@ -407,17 +1041,32 @@ class FeedbackLoopManager:
                 )
         
         # Check for consistent low confidence
-        if verification_results:
-            low_confidence_count = sum(
-                1 for vr in verification_results if vr.confidence < 0.6
-            )
-            if low_confidence_count > len(verification_results) * 0.5:
+        if confidences.size:
+            low_confidence_count = int((confidences < 0.6).sum())
+            if low_confidence_count > confidences.size * 0.5:
                 patterns.append(
                     "Multiple actions have low verification confidence"
                 )
         
         return patterns
     
+    def get_failure_patterns(self, workflow_id: str) -> Dict[str, int]:
+        """
+        Get failure counts by failure type for a workflow.
+        
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            Dictionary of failure type -> count, for types seen at least once
+        """
+        patterns = self.failure_patterns
+        return {
+            failure_type: patterns[(workflow_id, failure_type)]
+            for failure_type in FAILURE_TYPES
+            if (workflow_id, failure_type) in patterns
+        }
+    
     def _get_failure_count(self, workflow_id: str) -> int:
         """
         Get consecutive failure count for workflow.
@@ -428,25 +1077,22 @@ class FeedbackLoopManager:
         Returns:
             Number of consecutive failures
         """
-        history = self.execution_history.get(workflow_id, [])
-        if not history:
-            return 0
-        
-        # Count consecutive failures from most recent
-        failure_count = 0
-        for execution in reversed(history):
-            if not execution.get('success', False):
-                failure_count += 1
-            else:
-                break
-        
-        return failure_count
+        return self.consecutive_failures.get(workflow_id, 0)
     
     async def adjust_workflow(
         self,
         workflow_id: str,
         workflow_data: Dict[str, Any],
         analysis: FeedbackAnalysis
+    ) -> Dict[str, Any]:
+        """Adjust workflow based on feedback analysis (see adjust_workflow_sync)."""
+        return self.adjust_workflow_sync(workflow_id, workflow_data, analysis)
+    
+    def adjust_workflow_sync(
+        self,
+        workflow_id: str,
+        workflow_data: Dict[str, Any],
+        analysis: FeedbackAnalysis
     ) -> Dict[str, Any]:
         """
         Adjust workflow based on feedback analysis.
@@ -463,20 +1109,38 @@ class FeedbackLoopManager:
             Adjusted workflow data dictionary with modifications applied
         """
         try:
-            self.logger.info(f"Adjusting workflow: {workflow_id}")
-            
-            # Create a deep copy of workflow data to modify
-            import copy
-            adjusted_workflow = copy.deepcopy(workflow_data)
+            now = datetime.now()
+            self.logger.info("Adjusting workflow: %s", workflow_id)
             
             # Get the actions/steps list (handle both 'actions' and 'steps' keys)
-            actions_key = 'actions' if 'actions' in adjusted_workflow else 'steps'
-            actions = adjusted_workflow.get(actions_key, [])
+            actions_key = 'actions' if 'actions' in workflow_data else 'steps'
+            
+            if self._deep_copy_workflows:
+                adjusted_workflow = copy.deepcopy(workflow_data)
+                actions = adjusted_workflow.get(actions_key, [])
+            else:
+                # Copy-on-write: share unmodified actions with the original
+                # and deep-copy an action only before it is first mutated
+                adjusted_workflow = dict(workflow_data)
+                actions = list(workflow_data.get(actions_key) or [])
+                if actions:
+                    adjusted_workflow[actions_key] = actions
             
             if not actions:
-                self.logger.warning(f"No actions found in workflow {workflow_id}")
+                self.logger.warning("No actions found in workflow %s", workflow_id)
                 return adjusted_workflow
             
+            # ids of actions owned by the adjusted workflow
+            owned = set() if not self._deep_copy_workflows else {id(a) for a in actions}
+            
+            def own(index: int) -> Dict[str, Any]:
+                action = actions[index]
+                if id(action) not in owned:
+                    action = copy.deepcopy(action)
+                    actions[index] = action
+                    owned.add(id(action))
+                return action
+            
             # Track applied adjustments
             adjustments_applied = []
             
@@ -487,37 +1151,34 @@ class FeedbackLoopManager:
                 # Validate action index
                 if action_index < 0 or action_index >= len(actions):
                     self.logger.warning(
-                        f"Invalid action index {action_index} for workflow with "
-                        f"{len(actions)} actions"
+                        "Invalid action index %d for workflow with %d actions",
+                        action_index, len(actions)
                     )
                     continue
                 
-                action = actions[action_index]
-                
                 # Apply adjustment based on type
-                if adjustment.adjustment_type == 'timing':
-                    action = self._apply_timing_adjustment(action, adjustment)
-                    adjustments_applied.append(adjustment)
-                    
-                elif adjustment.adjustment_type == 'coordinate':
-                    action = self._apply_coordinate_adjustment(action, adjustment)
-                    adjustments_applied.append(adjustment)
-                    
-                elif adjustment.adjustment_type == 'selector':
-                    action = self._apply_selector_adjustment(action, adjustment)
+                handler = self._adjustment_handlers.get(adjustment.adjustment_type)
+                if handler is not None:
+                    action = handler(own(action_index), adjustment)
                     adjustments_applied.append(adjustment)
                     
                 elif adjustment.adjustment_type == 'validation':
-                    # Validation adjustments may add new steps
+                    # Validation adjustments add new steps and renumber the
+                    # existing ones, so every numbered action gets mutated
+                    for i, existing in enumerate(actions):
+                        if 'step' in existing:
+                            own(i)
+                    action = actions[action_index]
                     new_actions = self._apply_validation_adjustment(
                         actions, action_index, adjustment
                     )
                     if new_actions:
                         actions = new_actions
+                        owned.update(id(a) for a in actions)
                         adjustments_applied.append(adjustment)
                 else:
                     self.logger.warning(
-                        f"Unknown adjustment type: {adjustment.adjustment_type}"
+                        "Unknown adjustment type: %s", adjustment.adjustment_type
                     )
                     continue
                 
@@ -525,39 +1186,34 @@ class FeedbackLoopManager:
                 actions[action_index] = action
                 
                 self.logger.debug(
-                    f"Applied {adjustment.adjustment_type} adjustment to action {action_index}"
+                    "Applied %s adjustment to action %d",
+                    adjustment.adjustment_type, action_index
                 )
             
             # Update the workflow with adjusted actions
             adjusted_workflow[actions_key] = actions
             
-            # Store adjustments in history
-            for adjustment in adjustments_applied:
-                self.workflow_adjustments[workflow_id].append(adjustment)
+            # Store adjustments in history (oldest are evicted past 50)
+            self.workflow_adjustments[workflow_id].extend(adjustments_applied)
+            self._suggestion_cache.pop(workflow_id, None)
             
-            # Limit adjustment history
-            if len(self.workflow_adjustments[workflow_id]) > 50:
-                self.workflow_adjustments[workflow_id] = \
-                    self.workflow_adjustments[workflow_id][-50:]
+            # Add metadata about adjustments (copied, as it may be shared)
+            adjusted_workflow['metadata'] = dict(adjusted_workflow.get('metadata') or {})
             
-            # Add metadata about adjustments
-            if 'metadata' not in adjusted_workflow:
-                adjusted_workflow['metadata'] = {}
-            
-            adjusted_workflow['metadata']['last_adjusted'] = datetime.now().isoformat()
+            adjusted_workflow['metadata']['last_adjusted'] = now.isoformat()
             adjusted_workflow['metadata']['adjustments_count'] = len(adjustments_applied)
             adjusted_workflow['metadata']['adjustment_history'] = [
                 adj.to_dict() for adj in adjustments_applied
             ]
             
             self.logger.info(
-                f"Applied {len(adjustments_applied)} adjustments to workflow {workflow_id}"
+                "Applied %d adjustments to workflow %s", len(adjustments_applied), workflow_id
             )
             
             return adjusted_workflow
             
         except Exception as e:
-            self.logger.error(f"Failed to adjust workflow: {e}")
+            self.logger.error("Failed to adjust workflow: %s", e)
             # Return original workflow on error
             return workflow_data
     
@@ -579,9 +1235,11 @@ class FeedbackLoopManager:
             Modified action dictionary
         """
         try:
-            # Parse new delay value (e.g., "2.0s" -> 2.0)
-            new_delay_str = str(adjustment.new_value)
-            new_delay = float(new_delay_str.rstrip('s'))
+            # Delay in seconds; stored adjustments hold strings such as "2.0s"
+            new_delay = adjustment.new_value
+            if isinstance(new_delay, str):
+                new_delay = new_delay.rstrip('s')
+            new_delay = float(new_delay)
             
             # Add or update delay field
             if 'delay_after' not in action:
@@ -598,10 +1256,10 @@ class FeedbackLoopManager:
                 f"Timing adjusted: delay increased to {new_delay}s - {adjustment.reason}"
             )
             
-            self.logger.debug(f"Applied timing adjustment: delay={new_delay}s")
+            self.logger.debug("Applied timing adjustment: delay=%ss", new_delay)
             
         except Exception as e:
-            self.logger.error(f"Failed to apply timing adjustment: {e}")
+            self.logger.error("Failed to apply timing adjustment: %s", e)
         
         return action
     
@@ -623,12 +1281,13 @@ class FeedbackLoopManager:
             Modified action dictionary
         """
         try:
-            # Parse new coordinates (e.g., "(100, 200)" -> (100, 200))
-            new_coords_str = str(adjustment.new_value)
-            new_coords_str = new_coords_str.strip('()')
-            x_str, y_str = new_coords_str.split(',')
-            new_x = int(x_str.strip())
-            new_y = int(y_str.strip())
+            # (x, y) pair; stored adjustments hold strings such as "(100, 200)"
+            new_coords = adjustment.new_value
+            if isinstance(new_coords, str):
+                new_coords = new_coords.strip('()').split(',')
+            x_value, y_value = new_coords
+            new_x = int(x_value)
+            new_y = int(y_value)
             
             # Update coordinates
             if 'coordinates' in action:
@@ -651,10 +1310,10 @@ class FeedbackLoopManager:
                 f"Coordinates adjusted: ({new_x}, {new_y}) - {adjustment.reason}"
             )
             
-            self.logger.debug(f"Applied coordinate adjustment: ({new_x}, {new_y})")
+            self.logger.debug("Applied coordinate adjustment: (%d, %d)", new_x, new_y)
             
         except Exception as e:
-            self.logger.error(f"Failed to apply coordinate adjustment: {e}")
+            self.logger.error("Failed to apply coordinate adjustment: %s", e)
         
         return action
     
@@ -699,10 +1358,10 @@ class FeedbackLoopManager:
                 f"Selector adjusted: {new_selector} - {adjustment.reason}"
             )
             
-            self.logger.debug(f"Applied selector adjustment: {new_selector}")
+            self.logger.debug("Applied selector adjustment: %s", new_selector)
             
         except Exception as e:
-            self.logger.error(f"Failed to apply selector adjustment: {e}")
+            self.logger.error("Failed to apply selector adjustment: %s", e)
         
         return action
     
@@ -755,19 +1414,27 @@ class FeedbackLoopManager:
                     action['step'] = i + 1
             
             self.logger.debug(
-                f"Added validation steps after action {action_index}"
+                "Added validation steps after action %d", action_index
             )
             
             return actions
             
         except Exception as e:
-            self.logger.error(f"Failed to apply validation adjustment: {e}")
+            self.logger.error("Failed to apply validation adjustment: %s", e)
             return None
     
     async def update_confidence(
         self,
         workflow_id: str,
         success: bool
+    ) -> float:
+        """Update workflow confidence score based on execution result (see update_confidence_sync)."""
+        return self.update_confidence_sync(workflow_id, success)
+    
+    def update_confidence_sync(
+        self,
+        workflow_id: str,
+        success: bool
     ) -> float:
         """
         Update workflow confidence score based on execution result.
@@ -782,11 +1449,8 @@ class FeedbackLoopManager:
             Updated confidence score (0.0 to 1.0)
         """
         try:
-            # Get current confidence or start with base
-            current_confidence = self.workflow_confidence.get(
-                workflow_id,
-                self._base_confidence
-            )
+            slot = self._confidence_slot(workflow_id)
+            current_confidence = float(self._confidence_values[slot])
             
             # Adjust confidence
             if success:
@@ -795,7 +1459,7 @@ class FeedbackLoopManager:
                     current_confidence + self._confidence_increase
                 )
                 self.logger.debug(
-                    f"Confidence increased: {current_confidence:.2f} -> {new_confidence:.2f}"
+                    "Confidence increased: %.2f -> %.2f", current_confidence, new_confidence
                 )
             else:
                 new_confidence = max(
@@ -803,18 +1467,123 @@ class FeedbackLoopManager:
                     current_confidence - self._confidence_decrease
                 )
                 self.logger.debug(
-                    f"Confidence decreased: {current_confidence:.2f} -> {new_confidence:.2f}"
+                    "Confidence decreased: %.2f -> %.2f", current_confidence, new_confidence
                 )
             
             # Store updated confidence
-            self.workflow_confidence[workflow_id] = new_confidence
+            self._confidence_values[slot] = new_confidence
+            self._suggestion_cache.pop(workflow_id, None)
             
             return new_confidence
             
         except Exception as e:
-            self.logger.error(f"Failed to update confidence: {e}")
+            self.logger.error("Failed to update confidence: %s", e)
             return self._base_confidence
     
+    def update_confidence_batch(
+        self,
+        updates: List[Tuple[str, bool]]
+    ) -> Dict[str, float]:
+        """
+        Apply many confidence updates at once.
+        
+        Equivalent to calling update_confidence_sync for each update in
+        order. Each round applies the earliest remaining update of every
+        workflow as one vector operation, so the number of rounds is the
+        largest number of updates to a single workflow.
+        
+        Args:
+            updates: (workflow_id, success) pairs in execution order
+            
+        Returns:
+            Updated confidence score of each workflow in the batch
+        """
+        slots = np.fromiter(
+            (self._confidence_slot(workflow_id) for workflow_id, _ in updates),
+            dtype=np.int64,
+            count=len(updates)
+        )
+        deltas = np.where(
+            np.fromiter((success for _, success in updates), dtype=bool, count=len(updates)),
+            self._confidence_increase,
+            -self._confidence_decrease
+        )
+        
+        values = self._confidence_values
+        while slots.size:
+            round_slots, first = np.unique(slots, return_index=True)
+            values[round_slots] = np.minimum(
+                self._max_confidence,
+                np.maximum(self._min_confidence, values[round_slots] + deltas[first])
+            )
+            remaining = np.ones(slots.size, dtype=bool)
+            remaining[first] = False
+            slots = slots[remaining]
+            deltas = deltas[remaining]
+        
+        for workflow_id, _ in updates:
+            self._suggestion_cache.pop(workflow_id, None)
+        
+        return {
+            workflow_id: float(values[self._confidence_slots[workflow_id]])
+            for workflow_id, _ in updates
+        }
+    
+    def get_confidence(self, workflow_id: str) -> float:
+        """
+        Get the confidence score of a workflow.
+        
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            Confidence score (0.0 to 1.0), or the base confidence if the
+            workflow has no updates
+        """
+        slot = self._confidence_slots.get(workflow_id)
+        if slot is None:
+            return self._base_confidence
+        return float(self._confidence_values[slot])
+    
+    @property
+    def workflow_confidence(self) -> MutableMapping:
+        """Confidence score of each workflow with at least one update, writable."""
+        return _ConfidenceView(self)
+    
+    def _confidence_slot(self, workflow_id: str) -> int:
+        """
+        Get the confidence array slot of a workflow, allocating one if needed.
+        
+        New slots start at the base confidence.
+        
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            Index into the confidence array
+        """
+        slot = self._confidence_slots.get(workflow_id)
+        if slot is None:
+            if self._free_confidence_slots:
+                slot = self._free_confidence_slots.pop()
+            else:
+                slot = self._confidence_count
+                self._confidence_count += 1
+            if slot >= len(self._confidence_values):
+                # Grow by doubling to keep new workflows amortized O(1)
+                values = np.empty(2 * len(self._confidence_values), dtype=np.float64)
+                values[:slot] = self._confidence_values[:slot]
+                self._confidence_values = values
+            self._confidence_values[slot] = self._base_confidence
+            self._confidence_slots[workflow_id] = slot
+        return slot
+    
+    def _release_confidence_slot(self, workflow_id: str) -> None:
+        """Free the confidence array slot of a workflow for reuse, if it has one."""
+        slot = self._confidence_slots.pop(workflow_id, None)
+        if slot is not None:
+            self._free_confidence_slots.append(slot)
+    
     async def suggest_improvements(
         self,
         workflow_id: str
@@ -831,80 +1600,70 @@ class FeedbackLoopManager:
             List of improvement suggestion strings
         """
         try:
-            suggestions = []
-            
-            # Get execution history
-            history = self.execution_history.get(workflow_id, [])
-            if not history:
-                return ["No execution history available for analysis"]
-            
-            # Calculate success rate
-            recent_history = history[-10:]  # Last 10 executions
-            success_count = sum(1 for h in recent_history if h.get('success', False))
-            success_rate = success_count / len(recent_history)
-            
-            # Suggest based on success rate
-            if success_rate < 0.5:
-                suggestions.append(
-                    "Low success rate detected. Consider manual review of workflow steps."
-                )
-            
-            # Check failure patterns
-            pattern_counts = self.failure_patterns.get(workflow_id, {})
-            
-            if pattern_counts.get('timing', 0) >= 3:
-                suggestions.append(
-                    "Add wait steps between actions to allow UI to update"
-                )
-            
-            if pattern_counts.get('coordinate', 0) >= 3:
-                suggestions.append(
-                    "Use relative positioning or element detection instead of fixed coordinates"
-                )
-            
-            if pattern_counts.get('selector', 0) >= 3:
-                suggestions.append(
-                    "Update element selectors - target elements may have changed"
-                )
-            
-            if pattern_counts.get('validation', 0) >= 3:
-                suggestions.append(
-                    "Add explicit verification steps after critical actions"
-                )
-            
-            # Check for repeated failures
-            failure_count = self._get_failure_count(workflow_id)
-            if failure_count >= self._retry_threshold:
-                suggestions.append(
-                    f"Workflow has failed {failure_count} times consecutively. "
-                    "Manual review recommended."
-                )
-            
-            # Check for hardcoded values
-            adjustments = self.workflow_adjustments.get(workflow_id, [])
-            if len(adjustments) > 10:
-                suggestions.append(
-                    "Consider parameterizing workflow values for better reusability"
-                )
-            
-            # Check confidence
-            confidence = self.workflow_confidence.get(workflow_id, self._base_confidence)
-            if confidence < 0.3:
-                suggestions.append(
-                    "Very low confidence score. Workflow may need significant revision."
-                )
-            
-            if not suggestions:
-                suggestions.append(
-                    "Workflow is performing well. No improvements suggested at this time."
-                )
-            
-            return suggestions
+            # Suggestions only change when the workflow's state does, and
+            # every mutation drops the workflow's cached suggestions
+            cached = self._suggestion_cache.get(workflow_id)
+            if cached is None:
+                cached = tuple(self._build_suggestions(workflow_id))
+                self._suggestion_cache[workflow_id] = cached
+            return list(cached)
             
         except Exception as e:
-            self.logger.error(f"Failed to suggest improvements: {e}")
+            self.logger.error("Failed to suggest improvements: %s", e)
             return [f"Error generating suggestions: {str(e)}"]
     
+    def _build_suggestions(self, workflow_id: str) -> List[str]:
+        """
+        Generate improvement suggestions for workflow from its current state.
+        
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            List of improvement suggestion strings
+        """
+        suggestions = []
+        
+        # Get execution history
+        history = self.execution_history.get(workflow_id, [])
+        if not history:
+            return [_NO_HISTORY_SUGGESTION]
+            
+        # Calculate success rate over the recent executions
+        recent_count = max(len(self._recent_success.get(workflow_id, ())), 1)
+        success_rate = self._recent_success_count.get(workflow_id, 0) / recent_count
+        
+        # Suggest based on success rate
+        if success_rate < 0.5:
+            suggestions.append(_LOW_SUCCESS_RATE_SUGGESTION)
+        
+        # Check failure patterns
+        pattern_counts = self.get_failure_patterns(workflow_id)
+        suggestions.extend(
+            message for failure_type, threshold, message in _PATTERN_RULES
+            if pattern_counts.get(failure_type, 0) >= threshold
+        )
+        
+        # Check for repeated failures
+        failure_count = self._get_failure_count(workflow_id)
+        if failure_count >= self._retry_threshold:
+            suggestions.append(_repeated_failure_suggestion(failure_count))
+        
+        # Check for hardcoded values
+        adjustments = self.workflow_adjustments.get(workflow_id, [])
+        if len(adjustments) > 10:
+            suggestions.append(_PARAMETERIZE_SUGGESTION)
+        
+        # Check confidence
+        confidence = self.get_confidence(workflow_id)
+        if confidence < 0.3:
+            suggestions.append(_LOW_CONFIDENCE_SUGGESTION)
+        
+        if not suggestions:
+            suggestions.append(_PERFORMING_WELL_SUGGESTION)
+        
+        return suggestions
+    
     def get_workflow_stats(self, workflow_id: str) -> Dict[str, Any]:
         """
         Get statistics for a workflow.
@@ -928,7 +1687,7 @@ class FeedbackLoopManager:
                 'adjustments_made': 0,
             }
         
-        success_count = sum(1 for h in history if h.get('success', False))
+        success_count = self._history_success_count.get(workflow_id, 0)
         failure_count = len(history) - success_count
         
         return {
@@ -937,27 +1696,288 @@ class FeedbackLoopManager:
             'success_count': success_count,
             'failure_count': failure_count,
             'success_rate': success_count / len(history),
-            'confidence': self.workflow_confidence.get(workflow_id, self._base_confidence),
+            'confidence': self.get_confidence(workflow_id),
             'adjustments_made': len(self.workflow_adjustments.get(workflow_id, [])),
             'consecutive_failures': self._get_failure_count(workflow_id),
         }
     
+    def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics for every workflow with execution history.
+        
+        Equivalent to calling get_workflow_stats for each workflow, with the
+        counts, success rates and confidence lookups done as array operations.
+        
+        Returns:
+            Dictionary of workflow_id -> workflow statistics
+        """
+        workflow_ids = [
+            workflow_id for workflow_id, history in self.execution_history.items()
+            if history
+        ]
+        if not workflow_ids:
+            return {}
+        
+        count = len(workflow_ids)
+        execution_counts = np.fromiter(
+            (len(self.execution_history[w]) for w in workflow_ids),
+            dtype=np.int64, count=count
+        )
+        success_counts = np.fromiter(
+            (self._history_success_count.get(w, 0) for w in workflow_ids),
+            dtype=np.int64, count=count
+        )
+        failure_counts = execution_counts - success_counts
+        success_rates = success_counts / execution_counts
+        
+        # Workflows without a confidence slot report the base confidence
+        slots = np.fromiter(
+            (self._confidence_slots.get(w, -1) for w in workflow_ids),
+            dtype=np.int64, count=count
+        )
+        confidences = np.where(
+            slots >= 0, self._confidence_values[slots], self._base_confidence
+        )
+        
+        return {
+            workflow_id: {
+                'workflow_id': workflow_id,
+                'execution_count': int(execution_counts[i]),
+                'success_count': int(success_counts[i]),
+                'failure_count': int(failure_counts[i]),
+                'success_rate': float(success_rates[i]),
+                'confidence': float(confidences[i]),
+                'adjustments_made': len(self.workflow_adjustments.get(workflow_id, [])),
+                'consecutive_failures': self._get_failure_count(workflow_id),
+            }
+            for i, workflow_id in enumerate(workflow_ids)
+        }
+    
     def clear_history(self, workflow_id: Optional[str] = None) -> None:
         """
         Clear execution history and adjustments.
         
+        Clearing a single workflow also evicts workflows that have not been
+        analyzed recently (see evict_inactive).
+        
         Args:
             workflow_id: Workflow identifier, or None to clear all
         """
         if workflow_id:
-            self.execution_history.pop(workflow_id, None)
-            self.workflow_adjustments.pop(workflow_id, None)
-            self.workflow_confidence.pop(workflow_id, None)
-            self.failure_patterns.pop(workflow_id, None)
-            self.logger.info(f"Cleared history for workflow: {workflow_id}")
+            self._clear_workflow(workflow_id)
+            self.logger.info("Cleared history for workflow: %s", workflow_id)
+            self._evict_inactive(self._inactive_after)
         else:
-            self.execution_history.clear()
-            self.workflow_adjustments.clear()
-            self.workflow_confidence.clear()
-            self.failure_patterns.clear()
+            self._clear_all()
             self.logger.info("Cleared all workflow history")
+        
+        if self._state_path is not None:
+            self.save_state()
+    
+    def _clear_workflow(self, workflow_id: str) -> None:
+        """Remove a workflow from every per-workflow store."""
+        self._release_confidence_slot(workflow_id)
+        for store in self._workflow_stores:
+            store.pop(workflow_id, None)
+        for failure_type in FAILURE_TYPES:
+            self.failure_patterns.pop((workflow_id, failure_type), None)
+    
+    def _clear_all(self) -> None:
+        """Empty every per-workflow store."""
+        for store in self._workflow_stores:
+            store.clear()
+        self.failure_patterns.clear()
+        self._confidence_count = 0
+        self._free_confidence_slots.clear()
+    
+    def evict_inactive(self, max_age: Optional[timedelta] = None) -> List[str]:
+        """
+        Clear all state of workflows that have not been analyzed recently.
+        
+        Keeps failure patterns, confidence scores and other per-workflow
+        stores from growing with every workflow ever seen.
+        
+        Args:
+            max_age: Time since the last analysis after which a workflow is
+                evicted, or None to use the default of 30 days
+            
+        Returns:
+            IDs of the evicted workflows
+        """
+        inactive = self._evict_inactive(max_age or self._inactive_after)
+        if inactive and self._state_path is not None:
+            self.save_state()
+        return inactive
+    
+    def _evict_inactive(self, max_age: timedelta) -> List[str]:
+        """Clear workflows last analyzed more than max_age ago, without saving."""
+        cutoff = datetime.now() - max_age
+        inactive = [
+            workflow_id for workflow_id, last_seen in self._last_seen.items()
+            if last_seen < cutoff
+        ]
+        
+        for workflow_id in inactive:
+            self._clear_workflow(workflow_id)
+        
+        if inactive:
+            self.logger.info("Evicted %d inactive workflows", len(inactive))
+        
+        return inactive
+    
+    def save_state(self, path: Optional[Path] = None) -> None:
+        """
+        Save learned state so a new manager can start warm.
+        
+        Saves confidence scores, failure patterns, consecutive failures and
+        adjustments, keyed by workflow ID. Execution history goes to a
+        separate log of one JSON line per execution, which managers with a
+        state path append to as executions are analyzed; saving compacts it.
+        
+        Args:
+            path: Destination file, or None to use the manager's state path
+        """
+        path = path or self._state_path
+        if path is None:
+            return
+        
+        failure_patterns: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (workflow_id, failure_type), count in self.failure_patterns.items():
+            failure_patterns[workflow_id][failure_type] = count
+        
+        state = {
+            'saved_at': datetime.now().isoformat(),
+            'workflow_confidence': dict(self.workflow_confidence),
+            'failure_patterns': failure_patterns,
+            'consecutive_failures': dict(self.consecutive_failures),
+            'workflow_adjustments': {
+                workflow_id: [adj.to_dict() for adj in adjustments]
+                for workflow_id, adjustments in self.workflow_adjustments.items()
+            },
+        }
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(state)
+            else:
+                data = json.dumps(state).encode()
+            
+            # Write to a temporary file first so a crash never leaves a
+            # truncated state file behind
+            tmp_path = path.with_name(path.name + '.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            
+            self._write_history_log(_history_log_path(path))
+            
+            self.logger.info("Saved feedback state to %s", path)
+            
+        except Exception as e:
+            self.logger.error("Failed to save feedback state: %s", e)
+    
+    def load_state(self, path: Optional[Path] = None) -> bool:
+        """
+        Replace the current state with one saved by save_state.
+        
+        Execution history is replayed from the history log, and success
+        counts are rebuilt from it. The log is appended to on every
+        analysis but the state file only on save, so failure patterns and
+        consecutive failures are brought up to date from the replayed
+        history: failure types of executions logged after the save are
+        added to the saved counts, and consecutive failures are counted
+        back from the most recent execution.
+        
+        Args:
+            path: Source file, or None to use the manager's state path
+            
+        Returns:
+            True if the state was loaded
+        """
+        path = path or self._state_path
+        if path is None:
+            return False
+        
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        log_path = _history_log_path(path)
+        try:
+            state = loads(path.read_bytes()) if path.exists() else {}
+            log_lines = log_path.read_bytes().splitlines() if log_path.exists() else []
+            
+        except Exception as e:
+            self.logger.error("Failed to load feedback state: %s", e)
+            return False
+        
+        self._clear_all()
+        
+        for workflow_id, confidence in state.get('workflow_confidence', {}).items():
+            self._confidence_values[self._confidence_slot(workflow_id)] = confidence
+        
+        for workflow_id, counts in state.get('failure_patterns', {}).items():
+            for failure_type, count in counts.items():
+                self.failure_patterns[(workflow_id, failure_type)] = count
+        
+        saved_failures = state.get('consecutive_failures', {})
+        self.consecutive_failures.update(saved_failures)
+        
+        # State files written before the history log kept history inline
+        for workflow_id, entries in state.get('execution_history', {}).items():
+            for entry in entries:
+                self._append_history(workflow_id, entry)
+        
+        # Executions logged after the state was saved, per workflow; without
+        # a state file every logged execution is unsaved
+        saved_at = state.get('saved_at', '') if state else None
+        unsaved: Dict[str, int] = defaultdict(int)
+        
+        skipped = 0
+        for line in log_lines:
+            try:
+                entry = loads(line)
+                workflow_id = entry.pop('workflow_id')
+            except Exception:
+                # e.g. a line cut short by a crash
+                skipped += 1
+                continue
+            self._append_history(workflow_id, entry)
+            
+            if saved_at is None or (saved_at and entry.get('timestamp', '') > saved_at):
+                unsaved[workflow_id] += 1
+                for failure_type in entry.get('failure_types', ()):
+                    self.failure_patterns[(workflow_id, failure_type)] += 1
+        if skipped:
+            self.logger.warning("Skipped %d unreadable execution history records", skipped)
+            try:
+                # Drop the unreadable lines so new records start on a clean line
+                self._write_history_log(log_path)
+            except Exception as e:
+                self.logger.error("Failed to rewrite execution history log: %s", e)
+        
+        for workflow_id, history in self.execution_history.items():
+            if history:
+                self._last_seen[workflow_id] = datetime.fromisoformat(history[-1]['timestamp'])
+                self.consecutive_failures[workflow_id] = _trailing_failures(
+                    history, saved_failures.get(workflow_id, 0), unsaved[workflow_id]
+                )
+        
+        for workflow_id, adjustments in state.get('workflow_adjustments', {}).items():
+            self.workflow_adjustments[workflow_id].extend(
+                Adjustment.from_dict(adj) for adj in adjustments
+            )
+        
+        self.logger.info("Loaded feedback state from %s", path)
+        return True
+
+
+# Manager used by _describe_failures_in_worker, created once per worker process
+_worker_manager: Optional[FeedbackLoopManager] = None
+
+
+def _describe_failures_in_worker(
+    batch: VerificationBatch
+) -> Tuple[List[str], List[str], List[Adjustment]]:
+    """Process pool entry point for FeedbackLoopManager._describe_failures."""
+    global _worker_manager
+    if _worker_manager is None:
+        _worker_manager = FeedbackLoopManager()
+    return _worker_manager._describe_failures(batch)
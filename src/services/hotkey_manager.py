@@ -1,13 +1,150 @@
 """Global hotkey manager for capture controls."""
 
 import asyncio
-from typing import Callable, Optional
+import sys
+import threading
+from functools import lru_cache, partial
+from typing import Callable, Dict, Optional, Tuple
 from pynput import keyboard
 
+# Native Win32 hotkeys; pynput's listener is used everywhere else
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    WIN32_HOTKEYS_AVAILABLE = True
+else:
+    WIN32_HOTKEYS_AVAILABLE = False
+
 from src.config import get_config
 from src.logger import get_app_logger
 
 
+# Common key names mapped to pynput modifier tokens
+_MOD_MAP = {
+    'ctrl': '<ctrl>',
+    'control': '<ctrl>',
+    'shift': '<shift>',
+    'alt': '<alt>',
+    'cmd': '<cmd>',
+    'super': '<cmd>',
+    'win': '<cmd>',
+}
+
+
+@lru_cache(maxsize=32)
+def _to_pynput_hotkey(hotkey_str: str) -> str:
+    """Convert a hotkey like "ctrl+shift+p" to pynput's "<ctrl>+<shift>+p"."""
+    return '+'.join(
+        _MOD_MAP.get(part.strip(), part.strip())
+        for part in hotkey_str.lower().split('+')
+    )
+
+
+# RegisterHotKey modifier flags for pynput modifier tokens
+_WIN32_MODIFIERS = {
+    '<alt>': 0x0001,  # MOD_ALT
+    '<ctrl>': 0x0002,  # MOD_CONTROL
+    '<shift>': 0x0004,  # MOD_SHIFT
+    '<cmd>': 0x0008,  # MOD_WIN
+}
+_WIN32_MOD_NOREPEAT = 0x4000
+
+# Virtual-key codes for named keys; letters and digits use their ASCII code
+_WIN32_NAMED_KEYS = {
+    'esc': 0x1B,
+    'space': 0x20,
+    'tab': 0x09,
+    'enter': 0x0D,
+    **{f'f{n}': 0x6F + n for n in range(1, 13)},
+}
+
+_WM_HOTKEY = 0x0312
+_WM_QUIT = 0x0012
+
+
+def _to_win32_hotkey(hotkey: str) -> Optional[Tuple[int, int]]:
+    """
+    Convert a pynput hotkey to RegisterHotKey arguments.
+    
+    Args:
+        hotkey: Hotkey in pynput format, e.g. "<ctrl>+<shift>+p"
+        
+    Returns:
+        (modifiers, virtual-key code), or None if the hotkey is not a set
+        of modifiers plus exactly one supported key
+    """
+    modifiers = _WIN32_MOD_NOREPEAT
+    virtual_key = None
+    
+    for part in hotkey.split('+'):
+        if part in _WIN32_MODIFIERS:
+            modifiers |= _WIN32_MODIFIERS[part]
+        elif virtual_key is not None:
+            return None
+        elif len(part) == 1 and part.isascii() and part.isalnum():
+            virtual_key = ord(part.upper())
+        elif part.strip('<>') in _WIN32_NAMED_KEYS:
+            virtual_key = _WIN32_NAMED_KEYS[part.strip('<>')]
+        else:
+            return None
+    
+    if virtual_key is None:
+        return None
+    return modifiers, virtual_key
+
+
+class _Win32HotkeyListener(threading.Thread):
+    """
+    Listener thread for hotkeys registered with the Win32 RegisterHotKey API.
+    
+    Windows only posts WM_HOTKEY for the registered combinations, so unlike
+    pynput's listener no Python code runs for other keystrokes. Provides the
+    start()/stop() interface of pynput's GlobalHotKeys.
+    """
+    
+    def __init__(self, hotkeys: Dict[Tuple[int, int], Callable[[], None]]):
+        super().__init__(name='Win32HotkeyListener', daemon=True)
+        self._hotkeys = list(hotkeys.items())
+        self._thread_id: Optional[int] = None
+        self._registered = False
+        self._ready = threading.Event()
+    
+    def run(self) -> None:
+        user32 = ctypes.windll.user32
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        
+        # Hotkeys registered without a window are posted to this thread's
+        # message queue, with the hotkey ID in wParam
+        registered = []
+        for hotkey_id, ((modifiers, virtual_key), _) in enumerate(self._hotkeys, 1):
+            if not user32.RegisterHotKey(None, hotkey_id, modifiers, virtual_key):
+                break
+            registered.append(hotkey_id)
+        
+        self._registered = len(registered) == len(self._hotkeys)
+        self._ready.set()
+        
+        try:
+            if self._registered:
+                msg = wintypes.MSG()
+                while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                    if msg.message == _WM_HOTKEY:
+                        self._hotkeys[msg.wParam - 1][1]()
+        finally:
+            for hotkey_id in registered:
+                user32.UnregisterHotKey(None, hotkey_id)
+    
+    def wait_registered(self) -> bool:
+        """Wait for registration and return whether every hotkey was registered."""
+        self._ready.wait()
+        return self._registered
+    
+    def stop(self) -> None:
+        """Stop the message loop and unregister the hotkeys."""
+        if self._thread_id is not None and self.is_alive():
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, _WM_QUIT, 0, 0)
+
+
 class HotkeyManager:
     """
     Manages global hotkeys for application control.
@@ -15,17 +152,33 @@ class HotkeyManager:
     Supports:
     - Pause/Resume capture (Ctrl+Shift+P)
     - Custom hotkey combinations
+    
+    On Windows hotkeys are registered with the OS where possible, falling
+    back to pynput's keyboard listener.
     """
     
+    __slots__ = (
+        'config',
+        'logger',
+        '_listener',
+        '_loop',
+        '_callbacks',
+        '_running',
+        '_pause_hotkey',
+        '_emergency_stop_hotkey',
+    )
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_app_logger()
         
-        self._listener: Optional[keyboard.GlobalHotKeys] = None
-        self._pause_callback: Optional[Callable] = None
-        self._emergency_stop_callback: Optional[Callable] = None
+        self._listener: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._running = False
         
+        # Hotkey callbacks: name -> (callback, is coroutine function)
+        self._callbacks: Dict[str, Tuple[Callable, bool]] = {}
+        
         # Parse pause shortcut
         self._pause_hotkey = self._parse_hotkey(self.config.privacy.pause_shortcut)
         
@@ -37,11 +190,11 @@ class HotkeyManager:
     
     def set_pause_callback(self, callback: Callable) -> None:
         """Set callback for pause/resume hotkey."""
-        self._pause_callback = callback
+        self._callbacks['pause'] = (callback, asyncio.iscoroutinefunction(callback))
     
     def set_emergency_stop_callback(self, callback: Callable) -> None:
         """Set callback for emergency stop hotkey."""
-        self._emergency_stop_callback = callback
+        self._callbacks['emergency_stop'] = (callback, asyncio.iscoroutinefunction(callback))
     
     def start(self) -> None:
         """Start listening for global hotkeys."""
@@ -49,17 +202,26 @@ class HotkeyManager:
             return
         
         try:
+            # Hotkey handlers run on the listener thread and hand
+            # callbacks over to this loop
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._loop = None
+                self.logger.warning("No running event loop; hotkey callbacks will not be scheduled")
+            
             hotkeys = {}
             
-            if self._pause_hotkey and self._pause_callback:
-                hotkeys[self._pause_hotkey] = self._on_pause_hotkey
+            if self._pause_hotkey and 'pause' in self._callbacks:
+                hotkeys[self._pause_hotkey] = partial(self._dispatch, 'pause')
             
-            if self._emergency_stop_hotkey and self._emergency_stop_callback:
-                hotkeys[self._emergency_stop_hotkey] = self._on_emergency_stop_hotkey
+            if self._emergency_stop_hotkey and 'emergency_stop' in self._callbacks:
+                hotkeys[self._emergency_stop_hotkey] = partial(self._dispatch, 'emergency_stop')
             
             if hotkeys:
-                self._listener = keyboard.GlobalHotKeys(hotkeys)
-                self._listener.start()
+                if not self._start_win32_listener(hotkeys):
+                    self._listener = keyboard.GlobalHotKeys(hotkeys)
+                    self._listener.start()
                 self._running = True
                 
                 self.logger.info("Global hotkey listener started")
@@ -70,6 +232,37 @@ class HotkeyManager:
         except Exception as e:
             self.logger.error(f"Failed to start hotkey listener: {e}")
     
+    def _start_win32_listener(self, hotkeys: Dict[str, Callable[[], None]]) -> bool:
+        """
+        Register hotkeys with the Win32 RegisterHotKey API.
+        
+        Args:
+            hotkeys: Handlers keyed by hotkey in pynput format
+            
+        Returns:
+            True if every hotkey was registered and the listener started
+        """
+        if not WIN32_HOTKEYS_AVAILABLE:
+            return False
+        
+        win32_hotkeys = {}
+        for hotkey, handler in hotkeys.items():
+            win32_hotkey = _to_win32_hotkey(hotkey)
+            if win32_hotkey is None:
+                return False
+            win32_hotkeys[win32_hotkey] = handler
+        
+        listener = _Win32HotkeyListener(win32_hotkeys)
+        listener.start()
+        if not listener.wait_registered():
+            # Combinations reserved by Windows, or taken by another
+            # application, cannot be registered
+            self.logger.warning("Failed to register native hotkeys, falling back to pynput")
+            return False
+        
+        self._listener = listener
+        return True
+    
     def stop(self) -> None:
         """Stop listening for global hotkeys."""
         if not self._running:
@@ -89,73 +282,37 @@ class HotkeyManager:
     def _parse_hotkey(self, hotkey_str: str) -> Optional[str]:
         """Parse hotkey string into pynput format."""
         try:
-            # Convert common formats to pynput format
-            # e.g., "ctrl+shift+p" -> "<ctrl>+<shift>+p"
-            
-            parts = hotkey_str.lower().split('+')
-            parsed_parts = []
-            
-            for part in parts:
-                part = part.strip()
-                
-                # Map common key names
-                if part in ['ctrl', 'control']:
-                    parsed_parts.append('<ctrl>')
-                elif part in ['shift']:
-                    parsed_parts.append('<shift>')
-                elif part in ['alt']:
-                    parsed_parts.append('<alt>')
-                elif part in ['cmd', 'super', 'win']:
-                    parsed_parts.append('<cmd>')
-                else:
-                    # Regular key
-                    parsed_parts.append(part)
-            
-            return '+'.join(parsed_parts)
+            return _to_pynput_hotkey(hotkey_str)
             
         except Exception as e:
             self.logger.error(f"Failed to parse hotkey '{hotkey_str}': {e}")
             return None
     
-    def _on_pause_hotkey(self) -> None:
-        """Handle pause/resume hotkey press."""
+    def _dispatch(self, name: str) -> None:
+        """Handle a hotkey press by scheduling its callback on the event loop."""
         try:
-            if self._pause_callback:
-                # Run callback in thread-safe way
-                asyncio.create_task(self._call_pause_callback())
+            if name == 'emergency_stop':
+                self.logger.warning("Emergency stop hotkey pressed (Ctrl+Shift+Esc)")
             
-        except Exception as e:
-            self.logger.error(f"Error handling pause hotkey: {e}")
-    
-    async def _call_pause_callback(self) -> None:
-        """Call pause callback safely."""
-        try:
-            if asyncio.iscoroutinefunction(self._pause_callback):
-                await self._pause_callback()
-            else:
-                self._pause_callback()
-                
-        except Exception as e:
-            self.logger.error(f"Error in pause callback: {e}")
-    
-    def _on_emergency_stop_hotkey(self) -> None:
-        """Handle emergency stop hotkey press."""
-        try:
-            self.logger.warning("Emergency stop hotkey pressed (Ctrl+Shift+Esc)")
-            if self._emergency_stop_callback:
-                # Run callback in thread-safe way
-                asyncio.create_task(self._call_emergency_stop_callback())
+            callback, is_coroutine = self._callbacks[name]
+            if self._loop:
+                # Called on the listener thread; schedule on the event loop
+                self._loop.call_soon_threadsafe(
+                    lambda: self._loop.create_task(
+                        self._run_callback(name, callback, is_coroutine)
+                    )
+                )
             
         except Exception as e:
-            self.logger.error(f"Error handling emergency stop hotkey: {e}")
+            self.logger.error(f"Error handling {name} hotkey: {e}")
     
-    async def _call_emergency_stop_callback(self) -> None:
-        """Call emergency stop callback safely."""
+    async def _run_callback(self, name: str, callback: Callable, is_coroutine: bool) -> None:
+        """Call a hotkey callback safely."""
         try:
-            if asyncio.iscoroutinefunction(self._emergency_stop_callback):
-                await self._emergency_stop_callback()
+            if is_coroutine:
+                await callback()
             else:
-                self._emergency_stop_callback()
+                callback()
                 
         except Exception as e:
-            self.logger.error(f"Error in emergency stop callback: {e}")
\ No newline at end of file
+            self.logger.error(f"Error in {name} callback: {e}")
@@ -1,11 +1,25 @@
 """Local LLM service using Ollama for workflow analysis."""
 
 import asyncio
+import hashlib
 import json
-from typing import Optional, Dict, Any, List
+import logging
+import string
+import time
+from collections import OrderedDict, defaultdict, deque
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator, Iterable, List, Tuple
 from datetime import datetime
+import httpx
+import numpy as np
 import ollama
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from src.config import get_config
 from src.logger import get_app_logger
 from src.services.event_system import (
@@ -13,6 +27,263 @@ from src.services.event_system import (
 )
 
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+_ACTION_TYPES = [
+    'click', 'type', 'navigate', 'scroll', 'select', 'copy', 'paste',
+    'save', 'open', 'close', 'other',
+]
+_LEVELS = ['low', 'medium', 'high']
+
+# Fields an action analysis must contain to be used
+_REQUIRED_ACTION_FIELDS = frozenset({'action_type', 'description', 'confidence'})
+
+_ACTION_PROPERTIES = {
+    'action_type': {'type': 'string', 'enum': _ACTION_TYPES},
+    'description': {'type': 'string'},
+    'target_element': {'type': 'string'},
+    'application': {'type': 'string'},
+    'confidence': {'type': 'number', 'minimum': 0, 'maximum': 1},
+    'automation_feasible': {'type': 'boolean'},
+    'automation_complexity': {'type': 'string', 'enum': _LEVELS},
+}
+
+
+def _array_schema(properties: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
+    """Build a JSON schema for an array of objects."""
+    return {
+        'type': 'array',
+        'items': {'type': 'object', 'properties': properties, 'required': required},
+    }
+
+
+# Structured output format per query type; Ollama constrains generation
+# to valid JSON, and to the schema where one is given
+_RESPONSE_FORMATS = {
+    'action_analysis': 'json',
+    'action_batch_analysis': _array_schema(
+        {'index': {'type': 'integer'}, **_ACTION_PROPERTIES},
+        ['index', 'action_type', 'description', 'confidence'],
+    ),
+    'pattern_detection': _array_schema(
+        {
+            'pattern_id': {'type': 'string'},
+            'pattern_type': {
+                'type': 'string',
+                'enum': ['repetitive_sequence', 'data_entry', 'navigation', 'file_management'],
+            },
+            'description': {'type': 'string'},
+            'actions_involved': {'type': 'array', 'items': {'type': 'string'}},
+            'frequency': {'type': 'integer'},
+            'confidence': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'automation_potential': {'type': 'string', 'enum': _LEVELS},
+        },
+        ['pattern_id', 'pattern_type', 'description', 'actions_involved', 'confidence'],
+    ),
+    'suggestion_generation': _array_schema(
+        {
+            'suggestion_id': {'type': 'string'},
+            'title': {'type': 'string'},
+            'description': {'type': 'string'},
+            'pattern_ids': {'type': 'array', 'items': {'type': 'string'}},
+            'automation_type': {'type': 'string', 'enum': ['macro', 'script', 'template', 'shortcut']},
+            'complexity': {'type': 'string', 'enum': _LEVELS},
+            'time_saved_estimate': {'type': 'string'},
+            'implementation_steps': {'type': 'array', 'items': {'type': 'string'}},
+            'confidence': {'type': 'number', 'minimum': 0, 'maximum': 1},
+        },
+        ['suggestion_id', 'title', 'description', 'automation_type', 'confidence'],
+    ),
+}
+
+# Most recent actions summarized in a pattern detection prompt
+_PROMPT_ACTION_LIMIT = 20
+
+# Minimum cosine similarity for the semantic cache to reuse a response,
+# per query type using the cache. Action analysis prompts differ mostly in
+# the screenshot path and timestamp, so near-identical prompts can still
+# describe different actions; they are only cached by exact prompt.
+_SEMANTIC_CACHE_THRESHOLDS = {
+    'pattern_detection': 0.95,
+    'suggestion_generation': 0.92,
+}
+
+
+@lru_cache(maxsize=1024)
+def _action_summary(action_type: Any, description: Any, application: Any) -> str:
+    """
+    Format an action for the pattern detection prompt.
+    
+    Cached because detection runs over a sliding window, so most actions
+    are summarized again on every call.
+    """
+    summary = f"{action_type} - {description}"
+    if application:
+        summary += f" (in {application})"
+    return summary
+
+
+# Current time formatted for prompts, rebuilt at most once per second:
+# (epoch second, ISO timestamp)
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """Get the current time as an ISO timestamp with second precision."""
+    global _now_iso_cache
+    now = int(time.time())
+    if now != _now_iso_cache[0]:
+        _now_iso_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _now_iso_cache[1]
+
+
+async def _no_results() -> List[Any]:
+    """Stand in for a pipeline stage with nothing to do."""
+    return []
+
+
+def _compile_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a prompt template into (literal text, slot name) parts once."""
+    return tuple(
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+
+def _render_template(parts: Tuple[Tuple[str, Optional[str]], ...], **slots: Any) -> str:
+    """Fill the slots of a compiled prompt template."""
+    return "".join([
+        literal if field is None else f"{literal}{slots[field]}"
+        for literal, field in parts
+    ])
+
+
+def _structural_cache_key(query_type: str, slots: Iterable[Any]) -> str:
+    """
+    Build a response cache key from a prompt's template and slot structure.
+    
+    Args:
+        query_type: Type of query, identifying the prompt template
+        slots: Canonical values of the prompt's variable slot
+        
+    Returns:
+        Cache key for LLMService._query_llm
+    """
+    return f"{query_type}\0{tuple(slots)!r}"
+
+
+class _JsonArrayStream:
+    """
+    Incremental decoder for the elements of a streamed JSON array.
+    
+    Text chunks are fed as they arrive; each complete element is returned
+    as soon as its closing bracket has been received.
+    """
+    
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._started = False
+        self.done = False
+        self.malformed = False
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add a chunk of text and decode the elements it completes.
+        
+        Args:
+            chunk: Next chunk of the response text
+            
+        Returns:
+            Newly decoded array elements
+        """
+        self._buffer += chunk
+        
+        if not self._started:
+            start = self._buffer.find('[')
+            lead = self._buffer if start < 0 else self._buffer[:start]
+            if lead.strip():
+                self.malformed = True
+                return []
+            if start < 0:
+                return []
+            self._buffer = self._buffer[start + 1:]
+            self._started = True
+        
+        items = []
+        pos = 0
+        while not self.done:
+            while pos < len(self._buffer) and self._buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == ']':
+                self.done = True
+                pos += 1
+                break
+            try:
+                item, pos = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                # Element not complete yet
+                break
+            items.append(item)
+        
+        self._buffer = self._buffer[pos:]
+        return items
+
+
+class _SemanticCache:
+    """
+    LLM responses indexed by normalized prompt embedding.
+    
+    Holds up to `capacity` responses, overwriting the oldest when full.
+    """
+    
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._responses: List[str] = []
+        self._next_slot = 0
+    
+    def lookup(self, vector: np.ndarray, threshold: float) -> Optional[str]:
+        """
+        Find the response to the most similar cached prompt.
+        
+        Args:
+            vector: Normalized prompt embedding
+            threshold: Minimum cosine similarity
+            
+        Returns:
+            Cached response text, or None if no prompt is similar enough
+        """
+        if not self._responses:
+            return None
+        
+        scores = self._vectors[:len(self._responses)] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] >= threshold:
+            return self._responses[best]
+        return None
+    
+    def add(self, vector: np.ndarray, response: str) -> None:
+        """Cache a response under its normalized prompt embedding."""
+        if self._vectors is None:
+            self._vectors = np.empty((self.capacity, vector.shape[0]), dtype=np.float32)
+        
+        slot = self._next_slot
+        self._vectors[slot] = vector
+        if slot < len(self._responses):
+            self._responses[slot] = response
+        else:
+            self._responses.append(response)
+        self._next_slot = (slot + 1) % self.capacity
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._vectors = None
+        self._responses.clear()
+        self._next_slot = 0
+
+
 class LLMService:
     """
     Local LLM service for analyzing user actions and generating workflow insights.
@@ -31,9 +302,66 @@ class LLMService:
         
         # LLM configuration
         self.model_name = self.config.llm.model_name
+        
+        # Model per query type: per-action analysis runs on every event and
+        # only classifies, so it may use a smaller model than the rarer
+        # queries that need reasoning
+        fast_model = self.config.llm.model_name_fast or self.model_name
+        full_model = self.config.llm.model_name_full or self.model_name
+        self.query_models = {
+            'action_analysis': fast_model,
+            'action_batch_analysis': fast_model,
+            'pattern_detection': full_model,
+            'suggestion_generation': full_model,
+        }
         self.context_window = self.config.llm.context_window
         self.temperature = self.config.llm.temperature
         self.max_tokens = self.config.llm.max_tokens
+        self.keep_alive = self.config.llm.keep_alive
+        
+        self.max_concurrency = self.config.llm.max_concurrency
+        
+        # Async Ollama client, so queries are awaited on the event loop
+        # instead of occupying executor threads. Its connection pool keeps
+        # a connection alive per concurrent query (plus one for embedding
+        # requests) so queries never wait on a new connection.
+        self._aclient = ollama.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency + 1,
+                max_keepalive_connections=self.max_concurrency + 1
+            )
+        )
+        
+        # Responses to previously seen prompts: prompt digest -> response
+        # text, least recently used first
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._response_cache_size = 1024
+        
+        # Responses to similar prompts, per query type
+        self._semantic_cache_enabled = self.config.llm.semantic_cache
+        self.embedding_model = self.config.llm.embedding_model
+        self._semantic_caches: Dict[str, _SemanticCache] = defaultdict(_SemanticCache)
+        
+        # Query limits: at most max_concurrency queries in flight, started
+        # at no more than requests_per_second (token bucket, 0 = unlimited)
+        self.requests_per_second = self.config.llm.requests_per_second
+        self._query_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._rate_tokens = max(self.requests_per_second, 1.0)
+        self._rate_last_refill = time.monotonic()
+        self._queries_in_flight = 0
+        self._rate_limited_queries = 0
+        
+        # Last idle frame (no transcription) and its analysis; unchanged
+        # idle frames reuse the analysis instead of querying the LLM
+        self._idle_frame: Optional[Tuple[Any, int, bytes]] = None
+        self._idle_result: Optional[Dict[str, Any]] = None
+        self._idle_frames_skipped = 0
+        
+        # Pipeline state for process_tick: recently analyzed actions, and
+        # detected patterns awaiting suggestions
+        self._tick_actions: deque = deque(maxlen=50)
+        self._tick_patterns: List[Dict[str, Any]] = []
         
         # Service state
         self._initialized = False
@@ -63,10 +391,10 @@ class LLMService:
         
         try:
             # Check if Ollama is running
-            await self._check_ollama_status()
+            model_names = await self._check_ollama_status()
             
             # Ensure model is available
-            await self._ensure_model_available()
+            await self._ensure_model_available(model_names)
             
             self._initialized = True
             self.logger.info(f"LLM service initialized with model: {self.model_name}")
@@ -94,6 +422,14 @@ class LLMService:
                 self.logger.warning("LLM model not available for action analysis")
                 return None
             
+            # Idle frames dominate capture traffic; skip the query when
+            # nothing was said and the screen has not changed
+            frame = None if transcription else self._frame_signature(screenshot_path, context)
+            if frame is not None and frame == self._idle_frame and self._idle_result:
+                self._idle_frames_skipped += 1
+                self.logger.debug("Screen unchanged while idle, reusing action analysis")
+                return dict(self._idle_result)
+            
             # Prepare analysis prompt
             prompt = self._create_action_analysis_prompt(
                 screenshot_path, transcription, context
@@ -107,7 +443,11 @@ class LLMService:
                 action_data = self._parse_action_response(response)
                 
                 if action_data:
-                    self.logger.debug(f"Action analyzed: {action_data.get('action_type', 'unknown')}")
+                    self.logger.debug("Action analyzed: %s", action_data.get('action_type', 'unknown'))
+                    if frame is not None:
+                        self._idle_frame = frame
+                        self._idle_result = dict(action_data)
+                    await self._publish_result(EventType.LLM_ACTION_ANALYZED, action_data)
                     return action_data
             
             return None
@@ -116,6 +456,66 @@ class LLMService:
             self.logger.error(f"Error analyzing action: {e}")
             return None
     
+    async def analyze_actions_batch(
+        self,
+        items: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze several user actions with a single LLM query.
+        
+        Cheaper than calling analyze_action per action, since the prompt
+        instructions are evaluated once for the whole batch.
+        
+        Args:
+            items: (screenshot_path, transcription, context) per action
+            
+        Returns:
+            Action analysis per item, in order, with None for items the
+            response did not cover
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        try:
+            if not self._model_available:
+                self.logger.warning("LLM model not available for action analysis")
+                return results
+            
+            if not items:
+                return results
+            
+            prompt = self._create_action_batch_prompt(items)
+            
+            # Leave room for one analysis per action
+            response = await self._query_llm(
+                prompt, "action_batch_analysis", num_predict=self.max_tokens * len(items)
+            )
+            
+            if response:
+                for action_data in self._parse_json(response, list, "action batch") or []:
+                    if not isinstance(action_data, dict):
+                        continue
+                    index = action_data.pop('index', None)
+                    if (
+                        isinstance(index, int) and 1 <= index <= len(items)
+                        and action_data.keys() >= _REQUIRED_ACTION_FIELDS
+                    ):
+                        results[index - 1] = action_data
+                
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Batch analyzed %d/%d actions",
+                        sum(r is not None for r in results), len(items)
+                    )
+                
+                for action_data in results:
+                    if action_data:
+                        await self._publish_result(EventType.LLM_ACTION_ANALYZED, action_data)
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing action batch: {e}")
+            return results
+    
     async def detect_workflow_patterns(self, actions: List[Dict[str, Any]], 
                                      window_size: int = 50) -> List[Dict[str, Any]]:
         """
@@ -140,10 +540,10 @@ class LLMService:
                 return []
             
             # Prepare pattern detection prompt
-            prompt = self._create_pattern_detection_prompt(recent_actions)
+            prompt, cache_key = self._pattern_detection_query(recent_actions)
             
             # Get LLM response
-            response = await self._query_llm(prompt, "pattern_detection")
+            response = await self._query_llm(prompt, "pattern_detection", cache_key)
             
             if response:
                 # Parse patterns
@@ -151,6 +551,7 @@ class LLMService:
                 
                 if patterns:
                     self.logger.info(f"Detected {len(patterns)} workflow patterns")
+                    await self._publish_result(EventType.LLM_PATTERNS_DETECTED, {'patterns': patterns})
                     return patterns
             
             return []
@@ -174,10 +575,10 @@ class LLMService:
                 return []
             
             # Prepare suggestion generation prompt
-            prompt = self._create_suggestion_prompt(patterns)
+            prompt, cache_key = self._suggestion_query(patterns)
             
             # Get LLM response
-            response = await self._query_llm(prompt, "suggestion_generation")
+            response = await self._query_llm(prompt, "suggestion_generation", cache_key)
             
             if response:
                 # Parse suggestions
@@ -185,6 +586,9 @@ class LLMService:
                 
                 if suggestions:
                     self.logger.info(f"Generated {len(suggestions)} automation suggestions")
+                    await self._publish_result(
+                        EventType.LLM_SUGGESTIONS_GENERATED, {'suggestions': suggestions}
+                    )
                     return suggestions
             
             return []
@@ -193,76 +597,289 @@ class LLMService:
             self.logger.error(f"Error generating suggestions: {e}")
             return []
     
-    async def _check_ollama_status(self) -> None:
-        """Check if Ollama service is running."""
+    async def process_tick(self, screenshot_path: str, transcription: str,
+                           context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one step of the analysis pipeline for a new capture.
+        
+        The new action is analyzed while suggestions are generated for the
+        patterns queued by the last detect_tick_patterns call, so the two
+        queries run concurrently. Pattern detection is not part of a tick;
+        it runs on its own schedule through detect_tick_patterns.
+        
+        Args:
+            screenshot_path: Path to screenshot file
+            transcription: Audio transcription of user action
+            context: Additional context (window title, timestamp, etc.)
+            
+        Returns:
+            Dictionary with the analyzed action (or None) and the generated
+            suggestions
+        """
+        pending_patterns = self._tick_patterns
+        self._tick_patterns = []
+        
+        action, suggestions = await asyncio.gather(
+            self.analyze_action(screenshot_path, transcription, context),
+            self.generate_automation_suggestions(pending_patterns) if pending_patterns else _no_results()
+        )
+        
+        if action:
+            self._tick_actions.append(action)
+        
+        return {
+            'action': action,
+            'suggestions': suggestions
+        }
+    
+    async def detect_tick_patterns(self) -> List[Dict[str, Any]]:
+        """
+        Detect patterns in the actions analyzed by process_tick.
+        
+        The patterns are queued so the next process_tick generates
+        suggestions for them alongside its action analysis.
+        
+        Returns:
+            List of detected patterns
+        """
+        patterns = await self.detect_workflow_patterns(list(self._tick_actions))
+        self._tick_patterns = patterns
+        return patterns
+    
+    async def detect_workflow_patterns_stream(
+        self,
+        actions: List[Dict[str, Any]],
+        window_size: int = 50
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Detect workflow patterns, yielding each one as soon as it is generated.
+        
+        Args:
+            actions: List of analyzed actions
+            window_size: Number of recent actions to analyze
+            
+        Yields:
+            Detected patterns
+        """
+        try:
+            if not self._model_available:
+                self.logger.warning("LLM model not available for pattern detection")
+                return
+            
+            recent_actions = actions[-window_size:]
+            if len(recent_actions) < 3:  # Need at least 3 actions for pattern
+                return
+            
+            prompt, cache_key = self._pattern_detection_query(recent_actions)
+            async for pattern in self._stream_llm_items(prompt, "pattern_detection", cache_key):
+                yield pattern
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting patterns: {e}")
+    
+    async def generate_automation_suggestions_stream(
+        self,
+        patterns: List[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate automation suggestions, yielding each one as soon as it is generated.
+        
+        Args:
+            patterns: List of detected workflow patterns
+            
+        Yields:
+            Automation suggestions
+        """
+        try:
+            if not self._model_available or not patterns:
+                return
+            
+            prompt, cache_key = self._suggestion_query(patterns)
+            async for suggestion in self._stream_llm_items(prompt, "suggestion_generation", cache_key):
+                yield suggestion
+            
+        except Exception as e:
+            self.logger.error(f"Error generating suggestions: {e}")
+    
+    def _pattern_detection_query(self, actions: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """Create the pattern detection prompt and its response cache key."""
+        prompt = self._create_pattern_detection_prompt(actions)
+        
+        # Action lists that agree in every field the prompt shows yield the
+        # same patterns, whatever else (timestamps, confidences) differs
+        cache_key = _structural_cache_key("pattern_detection", (
+            (
+                action.get('action_type', 'unknown'),
+                action.get('description', 'No description'),
+                action.get('application')
+            )
+            for action in actions[-_PROMPT_ACTION_LIMIT:]
+        ))
+        return prompt, cache_key
+    
+    def _suggestion_query(self, patterns: List[Dict[str, Any]]) -> Tuple[str, str]:
+        """Create the suggestion generation prompt and its response cache key."""
+        prompt = self._create_suggestion_prompt(patterns)
+        
+        # Patterns that agree in every field the prompt shows yield the
+        # same suggestions
+        cache_key = _structural_cache_key("suggestion_generation", (
+            (
+                pattern.get('pattern_type', 'unknown'),
+                pattern.get('description', 'No description'),
+                pattern.get('frequency', 'unknown')
+            )
+            for pattern in patterns
+        ))
+        return prompt, cache_key
+    
+    def _frame_signature(
+        self,
+        screenshot_path: str,
+        context: Dict[str, Any]
+    ) -> Optional[Tuple[Any, int, bytes]]:
+        """
+        Identify a screenshot's content for idle frame detection.
+        
+        Every capture is a new file, so its modification time never
+        matches; a digest of the content is used instead.
+        
+        Args:
+            screenshot_path: Path to screenshot file
+            context: Action context; the window title is part of the frame
+            
+        Returns:
+            (window title, size, content digest), or None if the screenshot
+            cannot be read
+        """
+        try:
+            with open(screenshot_path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            return (context.get('window_title'), len(data), digest)
+        except OSError:
+            return None
+    
+    async def _check_ollama_status(self) -> frozenset:
+        """
+        Check if Ollama service is running.
+        
+        Returns:
+            Names of the installed models
+        """
         try:
             # Try to list models to check if Ollama is running
-            models = ollama.list()
+            models = await self._aclient.list()
             self.logger.info(f"Ollama is running with {len(models['models'])} models")
             
+            # Newer Ollama clients report the name as 'model'
+            return frozenset(
+                model.get('model') or model.get('name') for model in models['models']
+            )
+            
         except Exception as e:
             self.logger.error(f"Ollama is not running or not accessible: {e}")
             raise RuntimeError("Ollama service is not available. Please start Ollama first.")
     
-    async def _ensure_model_available(self) -> None:
-        """Ensure the required model is available."""
+    async def _ensure_model_available(self, model_names: frozenset) -> None:
+        """
+        Ensure the required models are available.
+        
+        Args:
+            model_names: Names of the installed models
+        """
         try:
-            # Check if model exists
-            models = ollama.list()
-            model_names = [model['name'] for model in models['models']]
+            for model in dict.fromkeys(self.query_models.values()):
+                await self._ensure_query_model(model, model_names)
             
-            if self.model_name not in model_names:
-                self.logger.info(f"Model {self.model_name} not found. Pulling...")
-                
-                # Pull the model
-                ollama.pull(self.model_name)
-                self.logger.info(f"Model {self.model_name} pulled successfully")
-            
-            # Test the model with a simple query
-            test_response = ollama.generate(
-                model=self.model_name,
-                prompt="Hello, respond with 'OK' if you're working.",
-                options={
-                    'temperature': 0.1,
-                    'num_predict': 10
-                }
-            )
+            if self._semantic_cache_enabled and not (
+                self.embedding_model in model_names
+                or f"{self.embedding_model}:latest" in model_names
+            ):
+                self.logger.info(
+                    f"Embedding model {self.embedding_model} not found, semantic cache disabled"
+                )
+                self._semantic_cache_enabled = False
             
-            if test_response and 'response' in test_response:
-                self._model_available = True
-                self.logger.info(f"Model {self.model_name} is working correctly")
-            else:
-                raise RuntimeError("Model test failed")
+            self._model_available = True
                 
         except Exception as e:
             self.logger.error(f"Failed to ensure model availability: {e}")
             raise
     
-    async def _query_llm(self, prompt: str, query_type: str) -> Optional[str]:
+    async def _ensure_query_model(self, model: str, model_names: frozenset) -> None:
+        """
+        Pull a query model if missing, and test it.
+        
+        Args:
+            model: Name of the model
+            model_names: Names of the installed models
+        """
+        # Check if model exists
+        if model not in model_names:
+            self.logger.info(f"Model {model} not found. Pulling...")
+            
+            # Pull the model
+            await self._aclient.pull(model)
+            self.logger.info(f"Model {model} pulled successfully")
+        
+        # Test the model with a simple query; this also loads it, and
+        # keep_alive keeps it loaded for the first real query
+        test_response = await self._aclient.generate(
+            model=model,
+            prompt="Hello, respond with 'OK' if you're working.",
+            options={
+                'temperature': 0.1,
+                'num_predict': 10
+            },
+            keep_alive=self.keep_alive
+        )
+        
+        if test_response and 'response' in test_response:
+            self.logger.info(f"Model {model} is working correctly")
+        else:
+            raise RuntimeError(f"Model test failed for {model}")
+    
+    async def _query_llm(
+        self,
+        prompt: str,
+        query_type: str,
+        cache_key: Optional[str] = None,
+        num_predict: Optional[int] = None
+    ) -> Optional[str]:
         """
         Query the LLM with a prompt.
         
         Args:
-            prompt: The prompt to send to the LLM
-            query_type: Type of query for logging
+            prompt: The user prompt to send to the LLM
+            query_type: Type of query, selecting the system prompt
+            cache_key: Key identifying prompts that share a response, or
+                None to cache by the exact prompt
+            num_predict: Maximum response tokens, or None for max_tokens
             
         Returns:
             LLM response text or None if query fails
         """
         try:
-            self.logger.debug(f"Querying LLM for {query_type}")
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                self._run_ollama_query,
-                prompt
-            )
+            key, vector, cached = await self._lookup_response(prompt, query_type, cache_key)
+            if cached is not None:
+                return cached
             
-            if response and 'response' in response:
-                response_text = response['response'].strip()
-                self.logger.debug(f"LLM response for {query_type}: {len(response_text)} characters")
+            self.logger.debug("Querying LLM for %s", query_type)
+            
+            async with self._query_semaphore:
+                await self._wait_for_rate_limit()
+                self._queries_in_flight += 1
+                try:
+                    response = await self._chat(prompt, query_type, num_predict)
+                finally:
+                    self._queries_in_flight -= 1
+            
+            if response and 'message' in response:
+                response_text = response['message']['content'].strip()
+                self.logger.debug("LLM response for %s: %d characters", query_type, len(response_text))
+                
+                self._store_response(key, vector, query_type, response_text)
                 return response_text
             
             return None
@@ -271,33 +888,158 @@ class LLMService:
             self.logger.error(f"Error querying LLM for {query_type}: {e}")
             return None
     
-    def _run_ollama_query(self, prompt: str) -> Dict[str, Any]:
-        """Run Ollama query in thread pool."""
-        return ollama.generate(
-            model=self.model_name,
-            prompt=prompt,
+    async def _stream_llm_items(
+        self,
+        prompt: str,
+        query_type: str,
+        cache_key: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query the LLM for a JSON array, yielding its objects as they are generated.
+        
+        Generation stops early once the array is complete, or as soon as
+        the response turns out not to start with one.
+        
+        Args:
+            prompt: The user prompt to send to the LLM
+            query_type: Type of query, selecting the system prompt
+            cache_key: Key identifying prompts that share a response, or
+                None to cache by the exact prompt
+            
+        Yields:
+            Objects of the JSON array
+        """
+        key, vector, cached = await self._lookup_response(prompt, query_type, cache_key)
+        if cached is not None:
+            for item in self._parse_json(cached, list, query_type) or []:
+                if isinstance(item, dict):
+                    yield item
+            return
+        
+        self.logger.debug("Streaming LLM response for %s", query_type)
+        
+        decoder = _JsonArrayStream()
+        chunks = []
+        async with self._query_semaphore:
+            await self._wait_for_rate_limit()
+            self._queries_in_flight += 1
+            stream = None
+            try:
+                stream = await self._chat(prompt, query_type, stream=True)
+                async for chunk in stream:
+                    text = chunk['message']['content']
+                    chunks.append(text)
+                    for item in decoder.feed(text):
+                        if isinstance(item, dict):
+                            yield item
+                    
+                    if decoder.done:
+                        break
+                    if decoder.malformed:
+                        self.logger.warning(f"LLM response for {query_type} is not a JSON array, stopping")
+                        break
+            finally:
+                self._queries_in_flight -= 1
+                if stream is not None and hasattr(stream, 'aclose'):
+                    await stream.aclose()
+        
+        if decoder.done:
+            self._store_response(key, vector, query_type, "".join(chunks).strip())
+    
+    def _chat(
+        self,
+        prompt: str,
+        query_type: str,
+        num_predict: Optional[int] = None,
+        stream: bool = False
+    ):
+        """Send a chat request with the query type's system prompt and output format."""
+        return self._aclient.chat(
+            model=self.query_models[query_type],
+            messages=[
+                {'role': 'system', 'content': self.system_prompts[query_type]},
+                {'role': 'user', 'content': prompt},
+            ],
             options={
                 'temperature': self.temperature,
-                'num_predict': self.max_tokens,
+                'num_predict': num_predict or self.max_tokens,
                 'top_k': 40,
                 'top_p': 0.9
-            }
+            },
+            format=_RESPONSE_FORMATS[query_type],
+            keep_alive=self.keep_alive,
+            stream=stream
         )
     
+    async def _lookup_response(
+        self,
+        prompt: str,
+        query_type: str,
+        cache_key: Optional[str]
+    ) -> Tuple[bytes, Optional[np.ndarray], Optional[str]]:
+        """
+        Look up a cached response to a prompt.
+        
+        Args:
+            prompt: The user prompt
+            query_type: Type of query
+            cache_key: Key identifying prompts that share a response, or None
+            
+        Returns:
+            (response cache key, prompt embedding if computed, cached
+            response text or None)
+        """
+        # Identical prompts recur for repeating workflows; reuse the
+        # earlier response instead of generating it again
+        key = hashlib.blake2b((cache_key or prompt).encode(), digest_size=16).digest()
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            self.logger.debug("Using cached LLM response for %s", query_type)
+            return key, None, cached
+        
+        # Prompts from repeating workflows often differ only in details
+        # such as paths and timestamps; reuse responses to similar ones
+        vector = None
+        threshold = _SEMANTIC_CACHE_THRESHOLDS.get(query_type)
+        if self._semantic_cache_enabled and threshold is not None:
+            vector = await self._embed_prompt(prompt)
+            if vector is not None:
+                cached = self._semantic_caches[query_type].lookup(vector, threshold)
+                if cached is not None:
+                    self.logger.debug("Using similar cached LLM response for %s", query_type)
+        
+        return key, vector, cached
+    
+    def _store_response(
+        self,
+        key: bytes,
+        vector: Optional[np.ndarray],
+        query_type: str,
+        response_text: str
+    ) -> None:
+        """Add a generated response to the response caches."""
+        self._response_cache[key] = response_text
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+        if vector is not None:
+            self._semantic_caches[query_type].add(vector, response_text)
+    
     def _setup_prompt_templates(self) -> None:
-        """Set up prompt templates for different analysis types."""
+        """
+        Set up prompt templates for different analysis types.
         
-        self.action_analysis_template = """
+        Instructions and output formats are fixed system prompts, sent
+        separately from the per-query user prompt so Ollama can reuse their
+        evaluated prefix across queries.
+        """
+        
+        self.system_prompts = {
+            'action_analysis': """
 You are an AI assistant that analyzes user computer actions. Based on the provided information, identify what action the user performed.
 
-Context:
-- Screenshot: {screenshot_path}
-- Audio transcription: "{transcription}"
-- Window title: {window_title}
-- Timestamp: {timestamp}
-
 Analyze this information and respond with a JSON object containing:
-{{
+{
     "action_type": "click|type|navigate|scroll|select|copy|paste|save|open|close|other",
     "description": "Brief description of what the user did",
     "target_element": "What UI element was interacted with (if identifiable)",
@@ -305,20 +1047,35 @@ Analyze this information and respond with a JSON object containing:
     "confidence": 0.0-1.0,
     "automation_feasible": true/false,
     "automation_complexity": "low|medium|high"
-}}
+}
 
 Respond only with valid JSON, no additional text.
-"""
-        
-        self.pattern_detection_template = """
-You are an AI assistant that detects workflow patterns in user actions. Analyze the sequence of actions to identify repetitive patterns.
+""",
+            'action_batch_analysis': """
+You are an AI assistant that analyzes user computer actions. Based on the provided information, identify what action the user performed in each numbered entry.
 
-Recent Actions:
-{actions_summary}
+Analyze every entry and respond with a JSON array containing one object per entry:
+[
+    {
+        "index": entry number,
+        "action_type": "click|type|navigate|scroll|select|copy|paste|save|open|close|other",
+        "description": "Brief description of what the user did",
+        "target_element": "What UI element was interacted with (if identifiable)",
+        "application": "Application name",
+        "confidence": 0.0-1.0,
+        "automation_feasible": true/false,
+        "automation_complexity": "low|medium|high"
+    }
+]
+
+Respond only with valid JSON, no additional text.
+""",
+            'pattern_detection': """
+You are an AI assistant that detects workflow patterns in user actions. Analyze the sequence of actions to identify repetitive patterns.
 
 Identify workflow patterns and respond with a JSON array of patterns:
 [
-    {{
+    {
         "pattern_id": "unique_identifier",
         "pattern_type": "repetitive_sequence|data_entry|navigation|file_management",
         "description": "Description of the pattern",
@@ -326,21 +1083,17 @@ Identify workflow patterns and respond with a JSON array of patterns:
         "frequency": "Number of times this pattern occurred",
         "confidence": 0.0-1.0,
         "automation_potential": "low|medium|high"
-    }}
+    }
 ]
 
 Only include patterns that occur at least 2 times. Respond only with valid JSON, no additional text.
-"""
-        
-        self.suggestion_generation_template = """
+""",
+            'suggestion_generation': """
 You are an AI assistant that generates automation suggestions based on detected workflow patterns.
 
-Detected Patterns:
-{patterns_summary}
-
 Generate automation suggestions and respond with a JSON array:
 [
-    {{
+    {
         "suggestion_id": "unique_identifier",
         "title": "Brief title for the automation",
         "description": "Detailed description of what could be automated",
@@ -350,33 +1103,89 @@ Generate automation suggestions and respond with a JSON array:
         "time_saved_estimate": "Estimated time saved per execution",
         "implementation_steps": ["step1", "step2", "step3"],
         "confidence": 0.0-1.0
-    }}
+    }
 ]
 
 Focus on practical, implementable suggestions. Respond only with valid JSON, no additional text.
+""",
+        }
+        
+        self.action_analysis_template = """
+Context:
+- Screenshot: {screenshot_path}
+- Audio transcription: "{transcription}"
+- Window title: {window_title}
+- Timestamp: {timestamp}
+"""
+        
+        self.action_batch_template = """
+Actions:
+{actions_summary}
+"""
+        
+        self.pattern_detection_template = """
+Recent Actions:
+{actions_summary}
+"""
+        
+        self.suggestion_generation_template = """
+Detected Patterns:
+{patterns_summary}
 """
+        
+        # Templates are filled on every query; parse their slots only once
+        self._action_analysis_parts = _compile_template(self.action_analysis_template)
+        self._action_batch_parts = _compile_template(self.action_batch_template)
+        self._pattern_detection_parts = _compile_template(self.pattern_detection_template)
+        self._suggestion_generation_parts = _compile_template(self.suggestion_generation_template)
     
     def _create_action_analysis_prompt(self, screenshot_path: str, transcription: str, 
                                      context: Dict[str, Any]) -> str:
         """Create prompt for action analysis."""
-        return self.action_analysis_template.format(
+        return _render_template(
+            self._action_analysis_parts,
             screenshot_path=screenshot_path,
             transcription=transcription or "No audio transcription available",
             window_title=context.get('window_title', 'Unknown'),
-            timestamp=context.get('timestamp', datetime.now().isoformat())
+            timestamp=context['timestamp'] if 'timestamp' in context else _now_iso()
+        )
+    
+    def _create_action_batch_prompt(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> str:
+        """Create prompt for batch action analysis."""
+        entries = []
+        for i, (screenshot_path, transcription, context) in enumerate(items, 1):
+            timestamp = context['timestamp'] if 'timestamp' in context else _now_iso()
+            entries.append(
+                f"{i}. Screenshot: {screenshot_path}\n"
+                f"   Audio transcription: \"{transcription or 'No audio transcription available'}\"\n"
+                f"   Window title: {context.get('window_title', 'Unknown')}\n"
+                f"   Timestamp: {timestamp}"
+            )
+        
+        return _render_template(
+            self._action_batch_parts,
+            actions_summary="\n".join(entries)
         )
     
     def _create_pattern_detection_prompt(self, actions: List[Dict[str, Any]]) -> str:
         """Create prompt for pattern detection."""
         # Summarize actions for the prompt
         actions_summary = []
-        for i, action in enumerate(actions[-20:], 1):  # Last 20 actions
-            summary = f"{i}. {action.get('action_type', 'unknown')} - {action.get('description', 'No description')}"
-            if action.get('application'):
-                summary += f" (in {action['application']})"
-            actions_summary.append(summary)
+        for i, action in enumerate(actions[-_PROMPT_ACTION_LIMIT:], 1):
+            fields = (
+                action.get('action_type', 'unknown'),
+                action.get('description', 'No description'),
+                action.get('application'),
+            )
+            try:
+                summary = _action_summary(*fields)
+            except TypeError:
+                # Unhashable values from a malformed analysis
+                summary = _action_summary.__wrapped__(*fields)
+            actions_summary.append(f"{i}. {summary}")
         
-        return self.pattern_detection_template.format(
+        return _render_template(
+            self._pattern_detection_parts,
             actions_summary="\n".join(actions_summary)
         )
     
@@ -390,76 +1199,117 @@ Focus on practical, implementable suggestions. Respond only with valid JSON, no
             summary += f"Frequency: {pattern.get('frequency', 'unknown')})"
             patterns_summary.append(summary)
         
-        return self.suggestion_generation_template.format(
+        return _render_template(
+            self._suggestion_generation_parts,
             patterns_summary="\n".join(patterns_summary)
         )
     
-    def _parse_action_response(self, response: str) -> Optional[Dict[str, Any]]:
-        """Parse LLM response for action analysis."""
-        try:
-            # Try to extract JSON from response
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            
-            action_data = json.loads(response)
-            
-            # Validate required fields
-            required_fields = ['action_type', 'description', 'confidence']
-            if all(field in action_data for field in required_fields):
-                return action_data
-            
-            return None
+    def _parse_json(self, response: str, expected_type: type, kind: str) -> Optional[Any]:
+        """
+        Parse JSON from a structured LLM response.
+        
+        Args:
+            response: LLM response text
+            expected_type: Type the parsed value must have (dict or list)
+            kind: Kind of response, for logging
             
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse action response as JSON: {e}")
+        Returns:
+            Parsed value, or None if it is not valid JSON of the expected type
+        """
+        try:
+            data = _json_loads(response)
+        except ValueError as e:
+            self.logger.error(f"Failed to parse {kind} response as JSON: {e}")
             return None
+        
+        return data if isinstance(data, expected_type) else None
+    
+    def _parse_action_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """Parse LLM response for action analysis."""
+        action_data = self._parse_json(response, dict, "action")
+        
+        # Validate required fields
+        if action_data and action_data.keys() >= _REQUIRED_ACTION_FIELDS:
+            return action_data
+        
+        return None
     
     def _parse_pattern_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse LLM response for pattern detection."""
-        try:
-            # Try to extract JSON from response
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            
-            patterns = json.loads(response)
-            
-            # Validate that it's a list
-            if isinstance(patterns, list):
-                return patterns
-            
-            return []
-            
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse pattern response as JSON: {e}")
-            return []
+        return self._parse_json(response, list, "pattern") or []
     
     def _parse_suggestion_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse LLM response for automation suggestions."""
-        try:
-            # Try to extract JSON from response
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
+        return self._parse_json(response, list, "suggestion") or []
+    
+    async def _publish_result(self, event_type: EventType, data: Dict[str, Any]) -> None:
+        """Publish an analysis result so any number of consumers can use it."""
+        await self.event_bus.publish(Event(
+            type=event_type,
+            timestamp=datetime.now(),
+            source="llm_service",
+            data=data
+        ))
+    
+    async def _wait_for_rate_limit(self) -> None:
+        """Wait until the token bucket allows another query to start."""
+        rate = self.requests_per_second
+        if rate <= 0:
+            return
+        
+        async with self._rate_lock:
+            now = time.monotonic()
+            self._rate_tokens = min(
+                max(rate, 1.0),
+                self._rate_tokens + (now - self._rate_last_refill) * rate
+            )
+            self._rate_last_refill = now
             
-            suggestions = json.loads(response)
+            if self._rate_tokens >= 1.0:
+                self._rate_tokens -= 1.0
+                return
             
-            # Validate that it's a list
-            if isinstance(suggestions, list):
-                return suggestions
+            # Sleep until the missing fraction of a token has accrued; the
+            # lock keeps later queries queued behind this one
+            self._rate_limited_queries += 1
+            await asyncio.sleep((1.0 - self._rate_tokens) / rate)
+            self._rate_tokens = 0.0
+            self._rate_last_refill = time.monotonic()
+    
+    async def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """
+        Embed a prompt for the semantic cache.
+        
+        A failed embedding request only skips the semantic cache for this
+        prompt, so transient errors do not disable it.
+        
+        Args:
+            prompt: The prompt to embed
             
-            return []
+        Returns:
+            Normalized embedding, or None if it could not be computed
+        """
+        try:
+            response = await self._aclient.embeddings(
+                model=self.embedding_model, prompt=prompt, keep_alive=self.keep_alive
+            )
+            vector = np.asarray(response['embedding'], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
             
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse suggestion response as JSON: {e}")
-            return []
+        except Exception as e:
+            self.logger.warning(f"Prompt embedding failed, skipping semantic cache: {e}")
+            return None
+    
+    def cache_clear(self) -> None:
+        """Clear cached LLM responses."""
+        self._response_cache.clear()
+        for cache in self._semantic_caches.values():
+            cache.clear()
+    
+    async def aclose(self) -> None:
+        """Close the connections to Ollama."""
+        await self._aclient.close()
     
     def is_available(self) -> bool:
         """Check if LLM service is available."""
@@ -469,9 +1319,16 @@ Focus on practical, implementable suggestions. Respond only with valid JSON, no
         """Get information about the current model."""
         return {
             'model_name': self.model_name,
+            'query_models': dict(self.query_models),
             'available': self._model_available,
             'initialized': self._initialized,
             'context_window': self.context_window,
             'temperature': self.temperature,
-            'max_tokens': self.max_tokens
+            'max_tokens': self.max_tokens,
+            'keep_alive': self.keep_alive,
+            'max_concurrency': self.max_concurrency,
+            'requests_per_second': self.requests_per_second,
+            'queries_in_flight': self._queries_in_flight,
+            'rate_limited_queries': self._rate_limited_queries,
+            'idle_frames_skipped': self._idle_frames_skipped,
         }
\ No newline at end of file
@@ -1,10 +1,23 @@
 """Pattern detection engine for identifying repetitive workflow sequences."""
 
 import asyncio
+import heapq
+import math
+import operator
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import defaultdict
+from functools import lru_cache
 import json
+import re
+import numpy as np
+
+try:
+    from numba import njit, types
+    from numba.typed import Dict as NumbaDict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from src.config import get_config
 from src.logger import get_app_logger
@@ -16,6 +29,229 @@ from src.services.event_system import (
 )
 
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _count_windows(sequences, base, min_frequency):
+        """
+        Count repeated rows of a sliding window view of signature ids.
+        
+        Each row is packed into an exact base-`base` integer key, so equal
+        keys always mean equal rows. Returns the start index of the first
+        occurrence of each row occurring at least min_frequency times, in
+        order of first occurrence, and the row counts.
+        """
+        n, length = sequences.shape
+        keys = np.empty(n, dtype=np.int64)
+        counts = NumbaDict.empty(key_type=types.int64, value_type=types.int64)
+        for i in range(n):
+            key = 0
+            for j in range(length):
+                key = key * base + sequences[i, j]
+            keys[i] = key
+            counts[key] = counts.get(key, 0) + 1
+        
+        starts = np.empty(n, dtype=np.int64)
+        frequencies = np.empty(n, dtype=np.int64)
+        found = 0
+        for i in range(n):
+            count = counts[keys[i]]
+            if count > 0 and count >= min_frequency:
+                starts[found] = i
+                frequencies[found] = count
+                found += 1
+                # Report each row only at its first occurrence
+                counts[keys[i]] = 0
+        return starts[:found], frequencies[:found]
+
+
+# Common UI element generalizations as (substring, general name), checked
+# in order
+_ELEMENT_GENERALIZATIONS = (
+    ('btn', 'button'),
+    ('button', 'button'),
+    ('text', 'textfield'),
+    ('input', 'textfield'),
+    ('field', 'textfield'),
+    ('textbox', 'textfield'),
+    ('menu', 'menu'),
+    ('dropdown', 'menu'),
+    ('link', 'link'),
+    ('hyperlink', 'link'),
+    ('icon', 'icon'),
+    ('image', 'icon'),
+)
+
+_ACTION_TYPE_DESCRIPTIONS = {
+    'click': 'Click',
+    'double_click': 'Double-click',
+    'right_click': 'Right-click',
+    'type': 'Type',
+    'hotkey': 'Press hotkey',
+    'navigate': 'Navigate',
+    'scroll': 'Scroll',
+    'drag_drop': 'Drag and drop',
+    'copy': 'Copy',
+    'paste': 'Paste',
+    'save_file': 'Save file',
+    'open_file': 'Open file',
+    'open_app': 'Open application',
+    'close_app': 'Close application'
+}
+
+
+# Action types that can be replayed automatically
+_AUTOMATABLE_ACTIONS = frozenset({
+    'click', 'double_click', 'type', 'hotkey',
+    'copy', 'paste', 'save_file', 'open_file'
+})
+
+
+# Input data generalizations in one anchored alternation; branches are
+# tried in order so earlier categories take precedence
+_INPUT_PATTERN = re.compile(
+    r'(?P<number>\d+\Z)'
+    r'|(?P<email>(?=.*@).*\.)'
+    r'|(?P<url>.*(?:http|www|\.com))'
+    r'|(?P<text>[^\W\d_]{1,19}\Z)',
+    re.DOTALL
+)
+
+
+# Patterns are ranked by frequency, then automation feasibility
+_PATTERN_RANK = operator.attrgetter('frequency', 'automation_feasibility')
+
+
+@lru_cache(maxsize=8192)
+def _is_automatable_signature(signature: str) -> bool:
+    """Check whether the action type of a signature can be automated."""
+    return signature.partition('|')[0] in _AUTOMATABLE_ACTIONS
+
+
+@lru_cache(maxsize=1024)
+def _generalize_element_name(element: str) -> str:
+    """
+    Generalize a UI element name for pattern matching.
+    
+    Cached because the same elements recur across every analyzed window.
+    """
+    element = element.lower()
+    
+    for specific, general in _ELEMENT_GENERALIZATIONS:
+        if specific in element:
+            return general
+    
+    return element
+
+
+def _generalize_input_data(input_data: str) -> Optional[str]:
+    """Generalize input data for pattern matching."""
+    if not input_data or len(input_data) > 50:
+        return None
+    
+    match = _INPUT_PATTERN.match(input_data.lower().strip())
+    return match.lastgroup if match else None
+
+
+@lru_cache(maxsize=8192)
+def _signature_from_fields(action_type: ActionType, application: Optional[str],
+                           target_element: Optional[str], input_data: Optional[str]) -> str:
+    """
+    Build the pattern matching signature of an action from its fields.
+    
+    Cached because applications and target elements repeat heavily
+    across captures.
+    """
+    # Create a signature that captures the essence of the action
+    # but is flexible enough to match similar actions
+    
+    signature_parts = [action_type.value]
+    
+    # Add application context
+    if application and application != "Unknown":
+        signature_parts.append(f"app:{application}")
+    
+    # Add target element if specific enough
+    if target_element and target_element != "Unknown":
+        # Generalize specific elements (e.g., "Button_123" -> "Button")
+        element = _generalize_element_name(target_element)
+        signature_parts.append(f"target:{element}")
+    
+    # Add input data pattern for type actions
+    if action_type == ActionType.TYPE and input_data:
+        input_pattern = _generalize_input_data(input_data)
+        if input_pattern:
+            signature_parts.append(f"input:{input_pattern}")
+    
+    return "|".join(signature_parts)
+
+
+def _parse_signature(signature: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """
+    Split an action signature into its fields.
+    
+    Args:
+        signature: Action signature
+        
+    Returns:
+        Action type, application, target element and input pattern, None
+        for fields missing from the signature
+    """
+    action_type, *parts = signature.split('|')
+    
+    app = None
+    target = None
+    input_type = None
+    
+    for part in parts:
+        if part.startswith('app:'):
+            app = part[4:]
+        elif part.startswith('target:'):
+            target = part[7:]
+        elif part.startswith('input:'):
+            input_type = part[6:]
+    
+    return action_type, app, target, input_type
+
+
+def _automation_feasibility(frequencies: np.ndarray, lengths: np.ndarray,
+                            automatable_counts: np.ndarray) -> np.ndarray:
+    """
+    Score how feasible it is to automate patterns.
+    
+    Args:
+        frequencies: Occurrence count of each pattern
+        lengths: Number of actions in each pattern
+        automatable_counts: Number of automatable actions in each pattern
+        
+    Returns:
+        Feasibility score between 0 and 1 of each pattern
+    """
+    # Base score from frequency, maxed at 10 occurrences
+    feasibility = np.minimum(1.0, frequencies / 10.0) * 0.4
+    
+    # Score from action types
+    automation_ratio = np.divide(automatable_counts, lengths,
+                                 out=np.zeros_like(lengths), where=lengths > 0)
+    feasibility += automation_ratio * 0.4
+    
+    # Score from pattern complexity (simpler = more feasible), penalizing
+    # very long patterns
+    feasibility += (1.0 - np.minimum(1.0, lengths / 10.0)) * 0.2
+    
+    return np.minimum(1.0, feasibility)
+
+
+def _jaccard(actions1: frozenset, actions2: frozenset) -> float:
+    """Calculate the Jaccard similarity of two action sets."""
+    if not actions1 or not actions2:
+        return 0.0
+    
+    intersection = len(actions1 & actions2)
+    union = len(actions1 | actions2)
+    
+    return intersection / union if union > 0 else 0.0
+
+
 class PatternDetector:
     """
     Pattern detection engine that identifies repetitive workflow sequences.
@@ -37,6 +273,14 @@ class PatternDetector:
         self.max_pattern_length = 10  # Maximum 10 actions for a pattern
         self.min_frequency = 2  # Pattern must occur at least 2 times
         self.similarity_threshold = 0.8  # 80% similarity for pattern matching
+        self.dense_similarity_limit = 2000  # Max patterns compared as a dense matrix
+        
+        # Action signatures interned as integer ids, so sequences can be
+        # compared as integer arrays; each signature is described once when
+        # interned
+        self._sig_to_id: Dict[str, int] = {}
+        self._id_to_sig: List[str] = []
+        self._id_to_description: List[str] = []
         
         # Storage
         self.storage_manager: Optional[StorageManager] = None
@@ -59,18 +303,27 @@ class PatternDetector:
             self.storage_manager = StorageManager()
             await self.storage_manager.initialize()
             
+            # Compile the window counting kernel now rather than on the
+            # first detection
+            if NUMBA_AVAILABLE:
+                warmup = np.zeros(self.min_pattern_length * 2, dtype=np.int32)
+                _count_windows(self._extract_sequences(warmup, self.min_pattern_length), 1, self.min_frequency)
+            
             self.logger.info("Pattern detector initialized successfully")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize pattern detector: {e}")
             raise
     
-    async def detect_patterns_in_actions(self, actions: List[Action]) -> List[Pattern]:
+    async def detect_patterns_in_actions(self, actions: List[Action],
+                                         top_k: Optional[int] = None) -> List[Pattern]:
         """
         Detect patterns in a sequence of actions using sliding window algorithm.
         
         Args:
             actions: List of actions to analyze
+            top_k: Only return this many of the most frequent and feasible
+                patterns, all when None
             
         Returns:
             List of detected patterns
@@ -84,27 +337,48 @@ class PatternDetector:
             # Use sliding window to find patterns
             patterns = []
             
+            # Compute each action's signature once; every sequence length
+            # reuses the encoded ids
+            ids = np.fromiter(
+                (self._intern_signature(self._action_to_signature(action)) for action in actions),
+                dtype=np.int32,
+                count=len(actions)
+            )
+            
+            # Renumber this run's signatures 0..k-1, so window keys depend
+            # on the run's own vocabulary rather than every signature seen
+            vocab, local_ids = np.unique(ids, return_inverse=True)
+            local_ids = local_ids.astype(np.int32)
+            
             # Extract action sequences of different lengths
             for pattern_length in range(self.min_pattern_length, min(self.max_pattern_length + 1, len(actions) // 2)):
-                sequences = self._extract_sequences(actions, pattern_length)
-                detected_patterns = self._find_repetitive_sequences(sequences, pattern_length)
+                sequences = self._extract_sequences(local_ids, pattern_length)
+                detected_patterns = self._find_repetitive_sequences(sequences, pattern_length, vocab)
+                
+                # A longer sequence occurs at most as often as its prefix,
+                # so nothing longer can repeat either
+                if not detected_patterns:
+                    break
                 patterns.extend(detected_patterns)
             
             # Remove duplicate and overlapping patterns
             patterns = self._deduplicate_patterns(patterns)
             
             # Calculate automation feasibility
-            for pattern in patterns:
-                pattern.automation_feasibility = self._calculate_automation_feasibility(pattern)
+            for pattern, feasibility in zip(patterns, self._calculate_automation_feasibilities(patterns)):
+                pattern.automation_feasibility = feasibility
             
             # Sort by frequency and feasibility
-            patterns.sort(key=lambda p: (p.frequency, p.automation_feasibility), reverse=True)
+            if top_k is not None:
+                patterns = heapq.nlargest(top_k, patterns, key=_PATTERN_RANK)
+            else:
+                patterns.sort(key=_PATTERN_RANK, reverse=True)
             
             self._patterns_detected += len(patterns)
             
-            # Publish pattern detection events
-            for pattern in patterns:
-                await self._publish_pattern_event(pattern)
+            # Publish pattern detection event
+            if patterns:
+                await self._publish_patterns_event(patterns)
             
             self.logger.info(f"Detected {len(patterns)} patterns from {len(actions)} actions")
             return patterns
@@ -139,8 +413,7 @@ class PatternDetector:
             patterns = await self.detect_patterns_in_actions(actions)
             
             # Save patterns to database
-            for pattern in patterns:
-                await self.storage_manager.save_pattern(pattern)
+            await self.storage_manager.save_patterns(patterns)
             
             return patterns
             
@@ -148,97 +421,66 @@ class PatternDetector:
             self.logger.error(f"Error detecting patterns from timerange: {e}")
             return []
     
-    def _extract_sequences(self, actions: List[Action], length: int) -> List[Tuple[str, ...]]:
-        """Extract sequences of specified length from actions."""
-        sequences = []
-        
-        for i in range(len(actions) - length + 1):
-            sequence = tuple(
-                self._action_to_signature(actions[i + j]) 
-                for j in range(length)
-            )
-            sequences.append(sequence)
+    def _extract_sequences(self, ids: np.ndarray, length: int) -> np.ndarray:
+        """
+        Extract sequences of specified length from encoded actions.
         
-        return sequences
+        Args:
+            ids: Signature ids of the actions
+            length: Sequence length
+            
+        Returns:
+            View with one row per sequence
+        """
+        return np.lib.stride_tricks.sliding_window_view(ids, length)
+    
+    def _intern_signature(self, signature: str) -> int:
+        """Get the integer id of an action signature."""
+        sig_id = self._sig_to_id.get(signature)
+        if sig_id is None:
+            sig_id = self._sig_to_id[signature] = len(self._id_to_sig)
+            self._id_to_sig.append(signature)
+            self._id_to_description.append(self._describe_signature(signature))
+        return sig_id
     
     def _action_to_signature(self, action: Action) -> str:
         """Convert action to a signature for pattern matching."""
-        # Create a signature that captures the essence of the action
-        # but is flexible enough to match similar actions
-        
-        signature_parts = [action.type.value]
-        
-        # Add application context
-        if action.application and action.application != "Unknown":
-            signature_parts.append(f"app:{action.application}")
-        
-        # Add target element if specific enough
-        if action.target_element and action.target_element != "Unknown":
-            # Generalize specific elements (e.g., "Button_123" -> "Button")
-            element = self._generalize_element(action.target_element)
-            signature_parts.append(f"target:{element}")
-        
-        # Add input data pattern for type actions
-        if action.type == ActionType.TYPE and action.input_data:
-            input_pattern = self._generalize_input(action.input_data)
-            if input_pattern:
-                signature_parts.append(f"input:{input_pattern}")
-        
-        return "|".join(signature_parts)
+        return _signature_from_fields(
+            action.type, action.application, action.target_element, action.input_data
+        )
     
     def _generalize_element(self, element: str) -> str:
         """Generalize UI element names for pattern matching."""
-        element = element.lower()
-        
-        # Common generalizations
-        generalizations = {
-            'button': ['btn', 'button'],
-            'textfield': ['text', 'input', 'field', 'textbox'],
-            'menu': ['menu', 'dropdown'],
-            'link': ['link', 'hyperlink'],
-            'icon': ['icon', 'image'],
-        }
-        
-        for general, specifics in generalizations.items():
-            if any(specific in element for specific in specifics):
-                return general
-        
-        return element
+        return _generalize_element_name(element)
     
     def _generalize_input(self, input_data: str) -> Optional[str]:
         """Generalize input data for pattern matching."""
-        if not input_data or len(input_data) > 50:
-            return None
-        
-        input_lower = input_data.lower().strip()
-        
-        # Detect common input patterns
-        if input_lower.isdigit():
-            return "number"
-        elif '@' in input_lower and '.' in input_lower:
-            return "email"
-        elif any(word in input_lower for word in ['http', 'www', '.com']):
-            return "url"
-        elif len(input_lower) < 20 and input_lower.isalpha():
-            return "text"
-        
-        return None
+        return _generalize_input_data(input_data)
     
-    def _find_repetitive_sequences(self, sequences: List[Tuple[str, ...]], 
-                                 pattern_length: int) -> List[Pattern]:
-        """Find sequences that repeat frequently."""
-        # Count sequence occurrences
-        sequence_counts = Counter(sequences)
+    def _find_repetitive_sequences(self, sequences: np.ndarray, 
+                                 pattern_length: int, vocab: np.ndarray) -> List[Pattern]:
+        """
+        Find sequences that repeat frequently.
         
+        Args:
+            sequences: Sliding window view over run-local signature ids
+            pattern_length: Sequence length
+            vocab: Interned signature id of each run-local id
+            
+        Returns:
+            Patterns for the repeated sequences
+        """
         patterns = []
         
-        for sequence, count in sequence_counts.items():
+        for local_ids, count in self._count_sequences(sequences, pattern_length, len(vocab)):
             if count >= self.min_frequency:
+                sequence_ids = vocab[local_ids].tolist()
+                
                 # Create pattern
                 pattern = Pattern(
                     pattern_type="repetitive_sequence",
-                    description=self._create_pattern_description(sequence),
-                    actions_involved=list(sequence),
+                    description=self._create_pattern_description(sequence_ids),
+                    actions_involved=[self._id_to_sig[sig_id] for sig_id in sequence_ids],
                     frequency=count,
                     confidence=min(1.0, count / len(sequences) * 2),  # Higher frequency = higher confidence
                     automation_potential="medium",  # Will be calculated later
@@ -250,63 +492,69 @@ class PatternDetector:
         
         return patterns
     
-    def _create_pattern_description(self, sequence: Tuple[str, ...]) -> str:
-        """Create human-readable description for a pattern."""
-        descriptions = []
+    def _count_sequences(self, sequences: np.ndarray, pattern_length: int,
+                         vocab_size: int) -> List[Tuple[List[int], int]]:
+        """
+        Count occurrences of each sequence.
         
-        for action_sig in sequence:
-            parts = action_sig.split('|')
-            action_type = parts[0]
-            
-            # Extract context
-            app = None
-            target = None
-            input_type = None
-            
-            for part in parts[1:]:
-                if part.startswith('app:'):
-                    app = part[4:]
-                elif part.startswith('target:'):
-                    target = part[7:]
-                elif part.startswith('input:'):
-                    input_type = part[6:]
-            
-            # Create description
-            desc = self._action_type_to_description(action_type)
-            
-            if target:
-                desc += f" {target}"
-            
-            if input_type:
-                desc += f" ({input_type})"
-            
-            if app:
-                desc += f" in {app}"
+        Args:
+            sequences: Sliding window view with one row per sequence
+            pattern_length: Sequence length
+            vocab_size: Number of distinct ids the rows may contain, all
+                below it
             
-            descriptions.append(desc)
+        Returns:
+            (ids, count) per sequence occurring at least min_frequency
+            times, in order of first occurrence
+        """
+        base = max(vocab_size, 1)
+        if NUMBA_AVAILABLE and base ** pattern_length < 2 ** 63:
+            starts, counts = _count_windows(sequences, base, self.min_frequency)
+            return [
+                (sequences[start].tolist(), count)
+                for start, count in zip(starts.tolist(), counts.tolist())
+            ]
+        
+        # View each row as one opaque value so whole rows are compared
+        rows = np.ascontiguousarray(sequences)
+        keys = rows.view(np.dtype((np.void, pattern_length * rows.itemsize))).ravel()
+        _, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        
+        repeated = counts >= self.min_frequency
+        starts = starts[repeated]
+        counts = counts[repeated]
+        order = np.argsort(starts)
+        return [
+            (rows[start].tolist(), count)
+            for start, count in zip(starts[order].tolist(), counts[order].tolist())
+        ]
+    
+    def _create_pattern_description(self, sequence_ids: List[int]) -> str:
+        """Create human-readable description for a pattern."""
+        return " → ".join(self._id_to_description[sig_id] for sig_id in sequence_ids)
+    
+    def _describe_signature(self, signature: str) -> str:
+        """Create human-readable description for an action signature."""
+        action_type, app, target, input_type = _parse_signature(signature)
+        desc = self._action_type_to_description(action_type)
+        
+        if target:
+            desc += f" {target}"
+        
+        if input_type:
+            desc += f" ({input_type})"
         
-        return " → ".join(descriptions)
+        if app:
+            desc += f" in {app}"
+        
+        return desc
     
     def _action_type_to_description(self, action_type: str) -> str:
         """Convert action type to human-readable description."""
-        descriptions = {
-            'click': 'Click',
-            'double_click': 'Double-click',
-            'right_click': 'Right-click',
-            'type': 'Type',
-            'hotkey': 'Press hotkey',
-            'navigate': 'Navigate',
-            'scroll': 'Scroll',
-            'drag_drop': 'Drag and drop',
-            'copy': 'Copy',
-            'paste': 'Paste',
-            'save_file': 'Save file',
-            'open_file': 'Open file',
-            'open_app': 'Open application',
-            'close_app': 'Close application'
-        }
-        
-        return descriptions.get(action_type, action_type.replace('_', ' ').title())
+        description = _ACTION_TYPE_DESCRIPTIONS.get(action_type)
+        if description is None:
+            description = action_type.replace('_', ' ').title()
+        return description
     
     def _deduplicate_patterns(self, patterns: List[Pattern]) -> List[Pattern]:
         """Remove duplicate and overlapping patterns."""
@@ -316,93 +564,170 @@ class PatternDetector:
         # Sort by frequency (highest first)
         patterns.sort(key=lambda p: p.frequency, reverse=True)
         
-        unique_patterns = []
+        if len(patterns) <= self.dense_similarity_limit:
+            return self._deduplicate_dense(patterns)
+        return self._deduplicate_indexed(patterns)
+    
+    def _deduplicate_dense(self, patterns: List[Pattern]) -> List[Pattern]:
+        """
+        Remove duplicates using a similarity matrix of all pattern pairs.
+        
+        Args:
+            patterns: Patterns sorted by frequency, highest first
+            
+        Returns:
+            Patterns not too similar to a more frequent kept pattern
+        """
+        # Action membership matrix over the signatures these patterns use,
+        # renumbered so its width does not grow with every signature seen.
+        # float32 keeps the BLAS product while holding the small integer
+        # counts exactly.
+        rows = []
+        cols = []
+        for row, pattern in enumerate(patterns):
+            for sig_id in {self._intern_signature(action) for action in pattern.actions_involved}:
+                rows.append(row)
+                cols.append(sig_id)
+        signatures, cols = np.unique(cols, return_inverse=True)
+        membership = np.zeros((len(patterns), len(signatures)), dtype=np.float32)
+        membership[rows, cols] = 1.0
+        
+        # Pairwise Jaccard similarity
+        intersection = (membership @ membership.T).astype(np.float64)
+        sizes = intersection.diagonal()
+        union = sizes[:, None] + sizes[None, :] - intersection
+        similarity = np.divide(
+            intersection, union, out=np.zeros_like(intersection), where=union > 0
+        )
+        similar = similarity > self.similarity_threshold
+        
+        # Keep each pattern unless it is too similar to a kept one; kept
+        # patterns come first and are at least as frequent, so they are
+        # never replaced
+        keep = np.zeros(len(patterns), dtype=bool)
+        for i in range(len(patterns)):
+            keep[i] = not np.any(similar[i, :i] & keep[:i])
+        
+        return [pattern for pattern, kept in zip(patterns, keep.tolist()) if kept]
+    
+    def _deduplicate_indexed(self, patterns: List[Pattern]) -> List[Pattern]:
+        """
+        Remove duplicates, comparing only patterns that can be similar.
         
-        for pattern in patterns:
+        Only kept patterns sharing an action with the new pattern's
+        similarity prefix are compared, which finds exactly the same
+        duplicates as comparing against every kept pattern, without a
+        matrix quadratic in the number of patterns.
+        
+        Args:
+            patterns: Patterns sorted by frequency, highest first
+            
+        Returns:
+            Patterns not too similar to a more frequent kept pattern
+        """
+        # Kept patterns by position; a replacement moves to the end.
+        # Replaced patterns are deleted, leaving stale index entries that
+        # are skipped.
+        unique_patterns: Dict[int, Pattern] = {}
+        action_sets: Dict[int, frozenset] = {}
+        prefix_index: Dict[str, List[int]] = defaultdict(list)
+        
+        for position, pattern in enumerate(patterns):
+            actions = frozenset(pattern.actions_involved)
+            prefix = self._similarity_prefix(actions)
+            
             # Check if this pattern is too similar to existing ones
-            is_duplicate = False
-            
-            for existing in unique_patterns:
-                similarity = self._calculate_pattern_similarity(pattern, existing)
-                if similarity > self.similarity_threshold:
-                    is_duplicate = True
-                    # Keep the one with higher frequency
-                    if pattern.frequency > existing.frequency:
-                        unique_patterns.remove(existing)
-                        unique_patterns.append(pattern)
-                    break
+            candidates = sorted({
+                existing for action in prefix for existing in prefix_index[action]
+                if existing in unique_patterns
+            })
+            duplicate_of = next((
+                existing for existing in candidates
+                if _jaccard(actions, action_sets[existing]) > self.similarity_threshold
+            ), None)
             
-            if not is_duplicate:
-                unique_patterns.append(pattern)
+            if duplicate_of is not None:
+                # Keep the one with higher frequency
+                if pattern.frequency <= unique_patterns[duplicate_of].frequency:
+                    continue
+                del unique_patterns[duplicate_of]
+            
+            unique_patterns[position] = pattern
+            action_sets[position] = actions
+            for action in prefix:
+                prefix_index[action].append(position)
         
-        return unique_patterns
+        return list(unique_patterns.values())
+    
+    def _similarity_prefix(self, actions: frozenset) -> List[str]:
+        """
+        Get the prefix of a pattern's sorted actions used to find similar patterns.
+        
+        Two action sets with a Jaccard similarity above the threshold share
+        more than threshold * size actions with each of them, so their
+        prefixes of size - minimum overlap + 1 actions must intersect.
+        """
+        # Tolerance keeps float rounding from shortening the prefix
+        min_overlap = math.floor(self.similarity_threshold * len(actions) - 1e-9) + 1
+        return sorted(actions)[:max(len(actions) - min_overlap + 1, 0)]
     
     def _calculate_pattern_similarity(self, pattern1: Pattern, pattern2: Pattern) -> float:
         """Calculate similarity between two patterns."""
-        actions1 = set(pattern1.actions_involved)
-        actions2 = set(pattern2.actions_involved)
-        
-        if not actions1 or not actions2:
-            return 0.0
-        
-        intersection = len(actions1.intersection(actions2))
-        union = len(actions1.union(actions2))
-        
-        return intersection / union if union > 0 else 0.0
+        return _jaccard(set(pattern1.actions_involved), set(pattern2.actions_involved))
     
     def _calculate_automation_feasibility(self, pattern: Pattern) -> float:
         """Calculate how feasible it is to automate this pattern."""
-        feasibility_score = 0.0
-        
-        # Base score from frequency
-        frequency_score = min(1.0, pattern.frequency / 10.0)  # Max at 10 occurrences
-        feasibility_score += frequency_score * 0.4
-        
-        # Score from action types
-        automatable_actions = {
-            'click', 'double_click', 'type', 'hotkey', 
-            'copy', 'paste', 'save_file', 'open_file'
-        }
-        
-        total_actions = len(pattern.actions_involved)
-        automatable_count = 0
-        
-        for action_sig in pattern.actions_involved:
-            action_type = action_sig.split('|')[0]
-            if action_type in automatable_actions:
-                automatable_count += 1
-        
-        automation_ratio = automatable_count / total_actions if total_actions > 0 else 0
-        feasibility_score += automation_ratio * 0.4
-        
-        # Score from pattern complexity (simpler = more feasible)
-        complexity_score = 1.0 - min(1.0, total_actions / 10.0)  # Penalize very long patterns
-        feasibility_score += complexity_score * 0.2
+        return self._calculate_automation_feasibilities([pattern])[0]
+    
+    def _calculate_automation_feasibilities(self, patterns: List[Pattern]) -> List[float]:
+        """
+        Calculate how feasible it is to automate each of the patterns.
         
-        return min(1.0, feasibility_score)
+        Args:
+            patterns: Patterns to score
+            
+        Returns:
+            Feasibility score of each pattern, in order
+        """
+        frequencies = np.fromiter((pattern.frequency for pattern in patterns),
+                                  dtype=np.float64, count=len(patterns))
+        lengths = np.fromiter((len(pattern.actions_involved) for pattern in patterns),
+                              dtype=np.float64, count=len(patterns))
+        automatable_counts = np.fromiter(
+            (sum(map(_is_automatable_signature, pattern.actions_involved)) for pattern in patterns),
+            dtype=np.float64,
+            count=len(patterns)
+        )
+        return _automation_feasibility(frequencies, lengths, automatable_counts).tolist()
     
-    async def _publish_pattern_event(self, pattern: Pattern) -> None:
-        """Publish pattern detection event."""
+    async def _publish_patterns_event(self, patterns: List[Pattern]) -> None:
+        """Publish one event for all patterns detected in a run."""
         try:
             event = Event(
-                type=EventType.PATTERN_DETECTED,
+                type=EventType.PATTERNS_DETECTED,
                 timestamp=datetime.now(),
                 source="pattern_detector",
                 data={
-                    "pattern_id": pattern.id,
-                    "pattern_type": pattern.pattern_type,
-                    "description": pattern.description,
-                    "frequency": pattern.frequency,
-                    "confidence": pattern.confidence,
-                    "automation_feasibility": pattern.automation_feasibility,
-                    "actions_count": len(pattern.actions_involved)
+                    "patterns_count": len(patterns),
+                    "patterns": [
+                        {
+                            "pattern_id": pattern.id,
+                            "pattern_type": pattern.pattern_type,
+                            "description": pattern.description,
+                            "frequency": pattern.frequency,
+                            "confidence": pattern.confidence,
+                            "automation_feasibility": pattern.automation_feasibility,
+                            "actions_count": len(pattern.actions_involved)
+                        }
+                        for pattern in patterns
+                    ]
                 }
             )
             
             await self.event_bus.publish(event)
             
         except Exception as e:
-            self.logger.error(f"Error publishing pattern event: {e}")
+            self.logger.error(f"Error publishing patterns event: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get pattern detector statistics."""
@@ -7,17 +7,18 @@ Monitors and optimizes application performance:
 - Trigger optimizations
 """
 
+import asyncio
+import numpy as np
 import psutil
 import time
-from collections import deque
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 from src.config import get_config
 from src.logger import get_app_logger
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
     """Performance metrics snapshot."""
     cpu_percent: float
@@ -32,12 +33,18 @@ class PerformanceMonitor:
         self.config = get_config()
         self.logger = get_app_logger()
         
-        self.metrics: Dict[str, deque] = {
-            'cpu': deque(maxlen=100),
-            'memory': deque(maxlen=100),
-            'capture_time': deque(maxlen=100),
-            'analysis_time': deque(maxlen=100),
+        # Last 100 values of each metric, as ring buffers; _positions holds
+        # the next slot to write and _counts the number of filled slots
+        self.window_size = 100
+        self.metrics: Dict[str, np.ndarray] = {
+            name: np.zeros(self.window_size)
+            for name in ('cpu', 'memory', 'capture_time', 'analysis_time')
         }
+        self._positions: Dict[str, int] = dict.fromkeys(self.metrics, 0)
+        self._counts: Dict[str, int] = dict.fromkeys(self.metrics, 0)
+        
+        # Running sum of each metric's window, so averages are O(1)
+        self._sums: Dict[str, float] = dict.fromkeys(self.metrics, 0.0)
         
         self.thresholds = {
             'cpu_percent': 50.0,
@@ -47,30 +54,108 @@ class PerformanceMonitor:
         }
         
         self.process = psutil.Process()
+        
+        # CPU and memory are sampled in the background once initialized,
+        # so reading metrics makes no system calls
+        self.sample_interval = 1.0
+        self._sample_task: Optional[asyncio.Task] = None
+        
         self.logger.info("Performance monitor initialized")
     
     async def initialize(self) -> None:
         """Initialize performance monitoring."""
+        if self._sample_task is None:
+            self._sample()
+            self._sample_task = asyncio.create_task(self._sample_loop())
         self.logger.info("Performance monitor ready")
     
+    async def stop(self) -> None:
+        """Stop background sampling."""
+        if self._sample_task:
+            self._sample_task.cancel()
+            try:
+                await self._sample_task
+            except asyncio.CancelledError:
+                pass
+            self._sample_task = None
+    
+    def _sample(self) -> None:
+        """Record the process CPU and memory usage."""
+        self.record_metric('cpu', self.process.cpu_percent())
+        self.record_metric('memory', self.process.memory_info().rss / 1024 / 1024)
+    
+    async def _sample_loop(self) -> None:
+        """Sample CPU and memory usage every sample_interval seconds."""
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            try:
+                self._sample()
+            except psutil.Error as e:
+                self.logger.error(f"Error sampling performance metrics: {e}")
+    
     def record_metric(self, name: str, value: float) -> None:
         """Record a performance metric."""
-        if name in self.metrics:
-            self.metrics[name].append(value)
+        values = self.metrics.get(name)
+        if values is None:
+            return
+        
+        # The oldest value drops out of a full window
+        position = self._positions[name]
+        if self._counts[name] == self.window_size:
+            self._sums[name] -= float(values[position])
+        else:
+            self._counts[name] += 1
+        
+        self._sums[name] += value
+        values[position] = value
+        self._positions[name] = (position + 1) % self.window_size
+    
+    def get_average(self, name: str) -> float:
+        """Get the average of a metric over its window."""
+        count = self._counts.get(name)
+        return self._sums[name] / count if count else 0
+    
+    def get_metric_stats(self, name: str) -> Dict[str, float]:
+        """
+        Get statistics of a metric over its window.
+        
+        Args:
+            name: Metric name
+            
+        Returns:
+            Average, standard deviation, 95th percentile and maximum, all 0
+            when nothing was recorded
+        """
+        count = self._counts.get(name)
+        if not count:
+            return {'avg': 0, 'std': 0, 'p95': 0, 'max': 0}
+        
+        # Slot order does not matter for these statistics
+        values = self.metrics[name][:count]
+        return {
+            'avg': self._sums[name] / count,
+            'std': float(values.std()),
+            'p95': float(np.percentile(values, 95)),
+            'max': float(values.max()),
+        }
+    
+    def get_latest(self, name: str) -> float:
+        """Get the most recently recorded value of a metric."""
+        if not self._counts.get(name):
+            return 0
+        return float(self.metrics[name][self._positions[name] - 1])
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics."""
-        cpu_percent = self.process.cpu_percent()
-        memory_mb = self.process.memory_info().rss / 1024 / 1024
-        
-        self.record_metric('cpu', cpu_percent)
-        self.record_metric('memory', memory_mb)
+        # Without the background sampler, sample on demand
+        if self._sample_task is None:
+            self._sample()
         
         return {
-            'cpu_percent': cpu_percent,
-            'memory_mb': memory_mb,
-            'cpu_avg': sum(self.metrics['cpu']) / len(self.metrics['cpu']) if self.metrics['cpu'] else 0,
-            'memory_avg': sum(self.metrics['memory']) / len(self.metrics['memory']) if self.metrics['memory'] else 0,
+            'cpu_percent': self.get_latest('cpu'),
+            'memory_mb': self.get_latest('memory'),
+            'cpu_avg': self.get_average('cpu'),
+            'memory_avg': self.get_average('memory'),
         }
     
     def check_thresholds(self) -> List[str]:
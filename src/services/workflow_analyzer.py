@@ -123,6 +123,9 @@ class WorkflowAnalyzer:
             except asyncio.CancelledError:
                 pass
         
+        if self.llm_service:
+            await self.llm_service.aclose()
+        
         # Publish service stopped event
         event = Event(
             type=EventType.SERVICE_STOPPED,
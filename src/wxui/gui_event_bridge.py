@@ -166,6 +166,8 @@ class GuiEventBridge:
                 self._handle_action_detected(event)
             elif event.type == EventType.PATTERN_DETECTED:
                 self._handle_pattern_detected(event)
+            elif event.type == EventType.PATTERNS_DETECTED:
+                self._handle_patterns_detected(event)
             elif event.type == EventType.SERVICE_ERROR:
                 self._handle_service_error(event)
             elif event.type == EventType.SERVICE_STARTED:
@@ -207,6 +209,11 @@ class GuiEventBridge:
         """Handle pattern detected event."""
         self._main_frame.add_pattern_to_dashboard(event.data)
     
+    def _handle_patterns_detected(self, event: Event) -> None:
+        """Handle a batch of detected patterns."""
+        for pattern_data in event.data.get('patterns', []):
+            self._main_frame.add_pattern_to_dashboard(pattern_data)
+    
     def _handle_service_error(self, event: Event) -> None:
         """Handle service error event."""
         service_name = event.data.get('service_name', 'Unknown')
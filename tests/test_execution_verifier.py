@@ -409,6 +409,72 @@ async def test_integration_with_executor(verifier, sample_action):
     assert verifier.verification_results[0].action_id == sample_action['id']
 
 
+@pytest.mark.asyncio
+async def test_get_stats_tracks_new_results(verifier):
+    """Test statistics stay in sync as results are added and cleared."""
+    for i in range(100):
+        verifier.verification_results.append(
+            VerificationResult(action_id=str(i), action_type="click", success=i % 4 != 0, confidence=0.5)
+        )
+    
+    assert verifier.get_stats()['successful'] == 75
+    
+    verifier.verification_results.append(
+        VerificationResult(action_id="extra", action_type="type", success=False, confidence=1.0)
+    )
+    stats = verifier.get_stats()
+    
+    assert stats['total_verifications'] == 101
+    assert stats['failed'] == 26
+    assert stats['average_confidence'] == pytest.approx(51.0 / 101, rel=0.01)
+    
+    verifier.clear_results()
+    assert verifier.get_success_rate() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_stats_after_list_refilled(verifier):
+    """Test statistics follow results replaced directly in the list."""
+    verifier._store_result(
+        VerificationResult(action_id="a", action_type="click", success=True, confidence=0.9)
+    )
+    assert verifier._result_count == 1
+    assert verifier.get_success_rate() == 1.0
+    
+    # Cleared and refilled to the same length without clear_results
+    verifier.verification_results.clear()
+    verifier.verification_results.append(
+        VerificationResult(action_id="b", action_type="click", success=False, confidence=0.2)
+    )
+    stats = verifier.get_stats()
+    
+    assert stats['total_verifications'] == 1
+    assert stats['successful'] == 0
+    assert stats['average_confidence'] == 0.2
+
+
+@pytest.mark.asyncio
+async def test_get_verification_batch(verifier):
+    """Test verification results are exported as parallel arrays."""
+    verifier.verification_results.append(
+        VerificationResult(action_id="a", action_type="click", success=True, confidence=0.9)
+    )
+    verifier.verification_results.append(
+        VerificationResult(
+            action_id="b", action_type="type", success=False, confidence=0.2,
+            error_message="timeout"
+        )
+    )
+    
+    batch = verifier.get_verification_batch()
+    
+    assert len(batch) == 2
+    assert batch.success.tolist() == [True, False]
+    assert batch.confidence.tolist() == pytest.approx([0.9, 0.2])
+    assert batch.action_type == ["click", "type"]
+    assert batch.error_message == [None, "timeout"]
+
+
 @pytest.mark.asyncio
 async def test_compare_images_advanced(verifier, create_test_image):
     """Test advanced image comparison with detailed metrics."""
@@ -501,6 +567,19 @@ async def test_find_difference_regions_small_regions(verifier):
     assert len(regions) == 0
 
 
+@pytest.mark.asyncio
+async def test_find_difference_regions_largest_first(verifier):
+    """Test that regions are ordered by area, largest first."""
+    mask = np.zeros((600, 800), dtype=bool)
+    mask[10:21, 10:21] = True      # 121 px, first in raster order
+    mask[100:200, 100:200] = True  # 10000 px
+    mask[400:420, 500:560] = True  # 1200 px
+    
+    regions = verifier._find_difference_regions(mask, min_region_size=100)
+    
+    assert [r['area'] for r in regions] == [10000, 1200, 121]
+
+
 @pytest.mark.asyncio
 async def test_calculate_structural_similarity(verifier, create_test_image):
     """Test structural similarity calculation."""
@@ -2,7 +2,8 @@
 
 import pytest
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+import numpy as np
 from unittest.mock import Mock, MagicMock
 
 from src.services.feedback_loop_manager import (
@@ -10,7 +11,7 @@ from src.services.feedback_loop_manager import (
     FeedbackAnalysis,
     Adjustment
 )
-from src.services.execution_verifier import VerificationResult
+from src.services.execution_verifier import VerificationResult, VerificationBatch
 
 
 @pytest.fixture
@@ -111,6 +112,51 @@ async def test_analyze_execution_with_failures(
     assert len(analysis.suggested_adjustments) > 0
 
 
+@pytest.mark.asyncio
+async def test_analyze_execution_with_batch(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test that a VerificationBatch is analyzed the same as a list."""
+    verification_results = [
+        successful_verification,
+        failed_verification,
+        successful_verification
+    ]
+    
+    from_list = await feedback_manager.analyze_execution(
+        mock_execution,
+        verification_results
+    )
+    from_batch = await FeedbackLoopManager().analyze_execution(
+        mock_execution,
+        VerificationBatch.from_list(verification_results)
+    )
+    
+    assert from_batch.overall_success == from_list.overall_success
+    assert from_batch.confidence == pytest.approx(from_list.confidence)
+    assert from_batch.issues_detected == from_list.issues_detected
+    assert from_batch.metadata['verification_count'] == 3
+
+
+@pytest.mark.asyncio
+async def test_analysis_confidence_keeps_full_precision(
+    feedback_manager,
+    mock_execution,
+    successful_verification
+):
+    """Test the average confidence is not rounded through float32."""
+    analysis = await feedback_manager.analyze_execution(
+        mock_execution,
+        [successful_verification, successful_verification]
+    )
+    
+    assert analysis.confidence == 0.9
+    assert feedback_manager.execution_history[mock_execution.workflow_id][-1]['confidence'] == 0.9
+
+
 @pytest.mark.asyncio
 async def test_analyze_execution_no_verifications(
     feedback_manager,
@@ -469,6 +515,30 @@ async def test_get_workflow_stats_with_history(
     assert stats['confidence'] > 0.0
 
 
+@pytest.mark.asyncio
+async def test_get_all_stats(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test all-workflow stats match the per-workflow stats."""
+    assert feedback_manager.get_all_stats() == {}
+    
+    for i in range(3):
+        mock_execution.workflow_id = f"workflow_{i}"
+        for _ in range(i + 1):
+            await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+        await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    await feedback_manager.update_confidence("workflow_1", True)
+    
+    all_stats = feedback_manager.get_all_stats()
+    
+    assert set(all_stats) == {"workflow_0", "workflow_1", "workflow_2"}
+    for workflow_id, stats in all_stats.items():
+        assert stats == feedback_manager.get_workflow_stats(workflow_id)
+
+
 @pytest.mark.asyncio
 async def test_clear_history_specific_workflow(
     feedback_manager,
@@ -526,6 +596,164 @@ async def test_clear_history_all_workflows(
     assert len(feedback_manager.workflow_confidence) == 0
 
 
+@pytest.mark.asyncio
+async def test_evict_inactive(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test workflows without recent analyses are evicted."""
+    mock_execution.workflow_id = "workflow_old"
+    await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    feedback_manager._last_seen["workflow_old"] -= timedelta(days=31)
+    
+    mock_execution.workflow_id = "workflow_new"
+    await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    
+    assert feedback_manager.evict_inactive() == ["workflow_old"]
+    assert "workflow_old" not in feedback_manager.execution_history
+    assert feedback_manager.get_failure_patterns("workflow_old") == {}
+    assert "workflow_new" in feedback_manager.execution_history
+
+
+@pytest.mark.asyncio
+async def test_clear_history_evicts_inactive(
+    feedback_manager,
+    mock_execution,
+    successful_verification
+):
+    """Test clearing a workflow also evicts inactive workflows."""
+    for workflow_id in ("workflow_old", "workflow_new", "workflow_done"):
+        mock_execution.workflow_id = workflow_id
+        await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    feedback_manager._last_seen["workflow_old"] -= timedelta(days=31)
+    
+    feedback_manager.clear_history("workflow_done")
+    
+    assert set(feedback_manager.execution_history) == {"workflow_new"}
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_state(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification,
+    tmp_path
+):
+    """Test learned state survives a save/load round trip."""
+    state_path = tmp_path / 'feedback_state.json'
+    
+    await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    await feedback_manager.update_confidence(mock_execution.workflow_id, True)
+    feedback_manager.save_state(state_path)
+    
+    restored = FeedbackLoopManager(state_path=state_path)
+    workflow_id = mock_execution.workflow_id
+    
+    assert restored.get_confidence(workflow_id) == feedback_manager.get_confidence(workflow_id)
+    assert restored.get_failure_patterns(workflow_id) == (
+        feedback_manager.get_failure_patterns(workflow_id)
+    )
+    assert restored.get_workflow_stats(workflow_id) == (
+        feedback_manager.get_workflow_stats(workflow_id)
+    )
+    assert list(restored.execution_history[workflow_id]) == (
+        list(feedback_manager.execution_history[workflow_id])
+    )
+
+
+@pytest.mark.asyncio
+async def test_clear_history_saves_state(
+    mock_execution,
+    successful_verification,
+    tmp_path
+):
+    """Test clearing history persists to the manager's state path."""
+    state_path = tmp_path / 'feedback_state.json'
+    manager = FeedbackLoopManager(state_path=state_path)
+    
+    await manager.analyze_execution(mock_execution, [successful_verification])
+    manager.save_state()
+    manager.clear_history(mock_execution.workflow_id)
+    
+    restored = FeedbackLoopManager(state_path=state_path)
+    assert mock_execution.workflow_id not in restored.execution_history
+
+
+@pytest.mark.asyncio
+async def test_execution_history_log(
+    mock_execution,
+    successful_verification,
+    failed_verification,
+    tmp_path
+):
+    """Test analyzed executions are logged and replayed without a save."""
+    state_path = tmp_path / 'feedback_state.json'
+    manager = FeedbackLoopManager(state_path=state_path)
+    
+    await manager.analyze_execution(mock_execution, [successful_verification])
+    await manager.analyze_execution(mock_execution, [failed_verification])
+    
+    log_path = tmp_path / 'feedback_state_history.jsonl'
+    assert not state_path.exists()
+    assert len(log_path.read_bytes().splitlines()) == 2
+    
+    # A record cut short by a crash is skipped
+    with open(log_path, 'ab') as f:
+        f.write(b'{"workflow_id": "workflow_')
+    
+    restored = FeedbackLoopManager(state_path=state_path)
+    stats = restored.get_workflow_stats(mock_execution.workflow_id)
+    assert stats['execution_count'] == 2
+    assert stats['success_count'] == 1
+    assert len(log_path.read_bytes().splitlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_state_counts_failures_logged_after_save(
+    mock_execution,
+    successful_verification,
+    failed_verification,
+    tmp_path
+):
+    """Test failure counters include executions logged after the last save."""
+    state_path = tmp_path / 'feedback_state.json'
+    manager = FeedbackLoopManager(state_path=state_path)
+    workflow_id = mock_execution.workflow_id
+    
+    await manager.analyze_execution(mock_execution, [failed_verification])
+    manager.save_state()
+    
+    # Not saved, as after a crash
+    await manager.analyze_execution(mock_execution, [failed_verification])
+    await manager.analyze_execution(mock_execution, [failed_verification])
+    
+    restored = FeedbackLoopManager(state_path=state_path)
+    assert sum(restored.get_failure_patterns(workflow_id).values()) == 3
+    assert restored.get_failure_patterns(workflow_id) == manager.get_failure_patterns(workflow_id)
+    assert restored.get_workflow_stats(workflow_id)['consecutive_failures'] == 3
+    
+    await manager.analyze_execution(mock_execution, [successful_verification])
+    await manager.analyze_execution(mock_execution, [failed_verification])
+    
+    restored = FeedbackLoopManager(state_path=state_path)
+    assert restored.get_failure_patterns(workflow_id) == manager.get_failure_patterns(workflow_id)
+    assert restored.get_workflow_stats(workflow_id)['consecutive_failures'] == 1
+
+
+@pytest.mark.asyncio
+async def test_load_state_invalid_file(feedback_manager, tmp_path):
+    """Test loading a corrupt state file leaves the manager empty."""
+    state_path = tmp_path / 'feedback_state.json'
+    state_path.write_text('not json')
+    
+    assert not feedback_manager.load_state(state_path)
+    assert len(feedback_manager.execution_history) == 0
+
+
 @pytest.mark.asyncio
 async def test_failure_pattern_tracking(
     feedback_manager,
@@ -573,9 +801,10 @@ async def test_failure_pattern_tracking(
     )
     
     # Verify patterns were tracked
-    patterns = feedback_manager.failure_patterns[workflow_id]
+    patterns = feedback_manager.get_failure_patterns(workflow_id)
     assert patterns['timing'] == 2
     assert patterns['coordinate'] == 1
+    assert feedback_manager.failure_patterns[(workflow_id, 'timing')] == 2
 
 
 @pytest.mark.asyncio
@@ -1062,3 +1291,404 @@ async def test_adjust_workflow_coordinate_in_target(feedback_manager):
     # Verify coordinate adjustment in target field
     assert result['actions'][0]['target']['coordinates']['x'] == 110
     assert result['actions'][0]['target']['coordinates']['y'] == 210
+
+
+@pytest.mark.asyncio
+async def test_classify_failures_matches_classify_failure(feedback_manager):
+    """Test batch failure classification agrees with per-result classification."""
+    results = [
+        VerificationResult(
+            action_id=f"action_{i}",
+            action_type="click",
+            success=False,
+            confidence=confidence,
+            error_message=message
+        )
+        for i, (message, confidence) in enumerate([
+            ("Operation timeout", 0.9),
+            ("Click position out of bounds", 0.2),
+            ("Element not found", 0.4),
+            (None, 0.3),
+            ("Something else", 0.8),
+        ])
+    ]
+    batch = VerificationBatch.from_list(results)
+    
+    failure_types = feedback_manager._classify_failures(batch, np.arange(len(results)))
+    
+    assert failure_types == ['timing', 'coordinate', 'selector', 'validation', 'unknown']
+    assert failure_types == [
+        feedback_manager._classify_failure(r.error_message, float(c))
+        for r, c in zip(results, batch.confidence)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_adjust_workflow_does_not_modify_original(feedback_manager):
+    """Test adjustments leave the original workflow and untouched actions alone."""
+    workflow_id = "workflow_001"
+    
+    workflow_data = {
+        'id': workflow_id,
+        'actions': [
+            {'action': 'click', 'coordinates': {'x': 100, 'y': 200}, 'step': 1},
+            {'action': 'type', 'text': 'hello', 'step': 2},
+            {'action': 'click', 'coordinates': {'x': 10, 'y': 20}, 'step': 3},
+        ],
+        'metadata': {'created_by': 'test'}
+    }
+    
+    analysis = FeedbackAnalysis(
+        execution_id="exec_001",
+        workflow_id=workflow_id,
+        overall_success=False,
+        confidence=0.5,
+        suggested_adjustments=[
+            Adjustment(
+                action_index=0,
+                adjustment_type='coordinate',
+                old_value='(100, 200)',
+                new_value='(110, 210)',
+                reason='Adjust click position'
+            ),
+            Adjustment(
+                action_index=1,
+                adjustment_type='validation',
+                old_value='none',
+                new_value='add_wait_and_verify',
+                reason='Add verification'
+            )
+        ]
+    )
+    
+    result = await feedback_manager.adjust_workflow(workflow_id, workflow_data, analysis)
+    
+    assert result['actions'][0]['coordinates'] == {'x': 110, 'y': 210}
+    assert [a.get('step') for a in result['actions']] == [1, 2, None, None, 5]
+    assert result['metadata']['adjustments_count'] == 2
+    
+    assert workflow_data['actions'][0]['coordinates'] == {'x': 100, 'y': 200}
+    assert [a['step'] for a in workflow_data['actions']] == [1, 2, 3]
+    assert len(workflow_data['actions']) == 3
+    assert 'adjustment_notes' not in workflow_data['actions'][0]
+    assert workflow_data['metadata'] == {'created_by': 'test'}
+
+
+@pytest.mark.asyncio
+async def test_execution_history_is_bounded(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test execution history keeps only the most recent 100 entries."""
+    for i in range(120):
+        mock_execution.id = f"exec_{i}"
+        verification = successful_verification if i % 3 else failed_verification
+        await feedback_manager.analyze_execution(mock_execution, [verification])
+    
+    history = feedback_manager.execution_history[mock_execution.workflow_id]
+    
+    assert len(history) == 100
+    assert history[0]['execution_id'] == "exec_20"
+    assert history[-1]['execution_id'] == "exec_119"
+    
+    stats = feedback_manager.get_workflow_stats(mock_execution.workflow_id)
+    assert stats['execution_count'] == 100
+    assert stats['success_count'] == sum(1 for h in history if h['success'])
+
+
+@pytest.mark.asyncio
+async def test_consecutive_failures_reset_on_success(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test consecutive failure count resets after a successful execution."""
+    workflow_id = mock_execution.workflow_id
+    
+    for _ in range(2):
+        await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    assert feedback_manager.get_workflow_stats(workflow_id)['consecutive_failures'] == 2
+    
+    await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    assert feedback_manager.get_workflow_stats(workflow_id)['consecutive_failures'] == 1
+    
+    feedback_manager.clear_history(workflow_id)
+    assert feedback_manager._get_failure_count(workflow_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_matches_analyze_execution(
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test batch analysis gives the same results as analyzing one at a time."""
+    result_sets = [
+        [successful_verification] * 4,
+        [successful_verification, failed_verification],
+        [],
+        [failed_verification] * 3,
+    ]
+    executions = []
+    for i in range(len(result_sets)):
+        execution = Mock()
+        execution.id = f"exec_{i}"
+        execution.workflow_id = mock_execution.workflow_id
+        execution.state = mock_execution.state
+        executions.append(execution)
+    
+    single_manager = FeedbackLoopManager()
+    expected = [
+        await single_manager.analyze_execution(execution, results)
+        for execution, results in zip(executions, result_sets)
+    ]
+    
+    batch_manager = FeedbackLoopManager()
+    analyses = await batch_manager.analyze_batch(executions, result_sets)
+    
+    assert len(analyses) == len(expected)
+    for analysis, single in zip(analyses, expected):
+        assert analysis.execution_id == single.execution_id
+        assert analysis.overall_success == single.overall_success
+        assert analysis.confidence == pytest.approx(single.confidence)
+        assert analysis.issues_detected == single.issues_detected
+        assert analysis.should_retry == single.should_retry
+        assert analysis.metadata['failure_count'] == single.metadata['failure_count']
+    
+    assert batch_manager.get_workflow_stats(mock_execution.workflow_id) == \
+        single_manager.get_workflow_stats(mock_execution.workflow_id)
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_length_mismatch(feedback_manager, mock_execution):
+    """Test batch analysis rejects mismatched inputs."""
+    with pytest.raises(ValueError):
+        await feedback_manager.analyze_batch([mock_execution], [])
+
+
+@pytest.mark.asyncio
+async def test_suggested_adjustments_use_native_values(feedback_manager, mock_execution):
+    """Test suggested coordinate/timing adjustments hold native values."""
+    results = [
+        VerificationResult(
+            action_id="action_001",
+            action_type="click",
+            success=False,
+            confidence=0.4,
+            error_message="Click position out of bounds",
+            metadata={'click_location': {'x': 100, 'y': 200}}
+        ),
+        VerificationResult(
+            action_id="action_002",
+            action_type="click",
+            success=False,
+            confidence=0.4,
+            error_message="Operation timeout"
+        ),
+    ]
+    
+    analysis = await feedback_manager.analyze_execution(mock_execution, results)
+    coordinate, timing = analysis.suggested_adjustments
+    
+    assert coordinate.new_value == (105, 205)
+    assert coordinate.to_dict()['new_value'] == '(105, 205)'
+    assert timing.new_value == 2.0
+    assert timing.to_dict()['new_value'] == '2.0s'
+    
+    workflow_data = {'actions': [{'action': 'click'}, {'action': 'click'}]}
+    result = await feedback_manager.adjust_workflow(
+        mock_execution.workflow_id, workflow_data, analysis
+    )
+    
+    assert result['actions'][0]['coordinates'] == {'x': 105, 'y': 205}
+    assert result['actions'][1]['delay_after'] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_feedback_analysis_json_round_trip():
+    """Test FeedbackAnalysis survives a JSON round trip."""
+    analysis = FeedbackAnalysis(
+        execution_id="exec_001",
+        workflow_id="workflow_001",
+        overall_success=False,
+        confidence=0.6,
+        issues_detected=["Action 1 (click): timeout"],
+        suggested_adjustments=[
+            Adjustment(
+                action_index=0,
+                adjustment_type='timing',
+                old_value=0.5,
+                new_value=2.0,
+                reason='Increase delay'
+            )
+        ],
+        should_retry=True,
+        retry_delay=5,
+        metadata={'success_rate': 0.5}
+    )
+    
+    restored = FeedbackAnalysis.from_json(analysis.to_json())
+    
+    assert restored.to_dict() == analysis.to_dict()
+    assert restored.timestamp == analysis.timestamp
+    assert restored.suggested_adjustments[0].new_value == '2.0s'
+
+
+def test_sync_api_without_event_loop(mock_execution, failed_verification):
+    """Test analysis and confidence updates can run without an event loop."""
+    manager = FeedbackLoopManager()
+    
+    analysis = manager.analyze_execution_sync(mock_execution, [failed_verification])
+    confidence = manager.update_confidence_sync(mock_execution.workflow_id, False)
+    adjusted = manager.adjust_workflow_sync(
+        mock_execution.workflow_id,
+        {'actions': [{'action': 'type'}]},
+        analysis
+    )
+    
+    assert analysis.overall_success == False
+    assert confidence == pytest.approx(0.3)
+    assert adjusted['metadata']['adjustments_count'] == len(analysis.suggested_adjustments)
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_with_workers(
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test batch analysis in worker processes matches in-process analysis."""
+    result_sets = [
+        [successful_verification, failed_verification],
+        [successful_verification] * 2,
+        [failed_verification] * 3,
+    ]
+    executions = []
+    for i in range(len(result_sets)):
+        execution = Mock()
+        execution.id = f"exec_{i}"
+        execution.workflow_id = mock_execution.workflow_id
+        execution.state = mock_execution.state
+        executions.append(execution)
+    
+    expected = await FeedbackLoopManager().analyze_batch(executions, result_sets)
+    
+    manager = FeedbackLoopManager()
+    analyses = await manager.analyze_batch(executions, result_sets, workers=2)
+    
+    for analysis, single in zip(analyses, expected):
+        assert analysis.issues_detected == single.issues_detected
+        assert [a.to_dict() for a in analysis.suggested_adjustments] == \
+            [a.to_dict() for a in single.suggested_adjustments]
+    assert manager.get_failure_patterns(mock_execution.workflow_id) == {'selector': 4}
+
+
+@pytest.mark.asyncio
+async def test_update_confidence_batch_matches_sequential_updates():
+    """Test batched confidence updates match applying them one by one."""
+    updates = [
+        ("workflow_a", True),
+        ("workflow_b", False),
+        ("workflow_a", True),
+        ("workflow_a", True),
+        ("workflow_a", True),
+        ("workflow_a", True),
+        ("workflow_a", False),
+        ("workflow_b", False),
+        ("workflow_b", False),
+        ("workflow_c", True),
+    ]
+    
+    sequential = FeedbackLoopManager()
+    for workflow_id, success in updates:
+        await sequential.update_confidence(workflow_id, success)
+    
+    batched = FeedbackLoopManager()
+    result = batched.update_confidence_batch(updates)
+    
+    assert result == pytest.approx(sequential.workflow_confidence)
+    assert result['workflow_a'] == pytest.approx(0.8)
+    assert result['workflow_b'] == pytest.approx(0.0)
+    
+    batched.clear_history("workflow_a")
+    assert batched.get_confidence("workflow_a") == 0.5
+    assert batched.get_confidence("workflow_b") == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+async def test_confidence_slots_reused_after_clear():
+    """Test cleared workflows free their confidence slot for new workflows."""
+    manager = FeedbackLoopManager()
+    for i in range(100):
+        await manager.update_confidence(f"workflow_{i}", True)
+        manager.clear_history(f"workflow_{i}")
+    
+    assert manager._confidence_count == 1
+    assert manager.get_confidence("workflow_0") == 0.5
+    
+    await manager.update_confidence("workflow_new", False)
+    assert manager.get_confidence("workflow_new") == pytest.approx(0.3)
+
+
+@pytest.mark.asyncio
+async def test_workflow_confidence_writes_through():
+    """Test assigning to workflow_confidence updates the stored confidence."""
+    manager = FeedbackLoopManager()
+    await manager.update_confidence("workflow_a", True)
+    
+    manager.workflow_confidence["workflow_a"] = 0.9
+    manager.workflow_confidence["workflow_b"] = 0.2
+    
+    assert manager.get_confidence("workflow_a") == 0.9
+    assert manager.get_confidence("workflow_b") == 0.2
+    assert dict(manager.workflow_confidence) == {"workflow_a": 0.9, "workflow_b": 0.2}
+    
+    del manager.workflow_confidence["workflow_a"]
+    assert manager.get_confidence("workflow_a") == 0.5
+    assert list(manager.workflow_confidence) == ["workflow_b"]
+
+
+@pytest.mark.asyncio
+async def test_suggest_improvements_cache_invalidated_on_update(
+    feedback_manager,
+    mock_execution,
+    successful_verification
+):
+    """Test cached suggestions are refreshed when workflow state changes."""
+    workflow_id = mock_execution.workflow_id
+    await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    
+    first = await feedback_manager.suggest_improvements(workflow_id)
+    assert first == await feedback_manager.suggest_improvements(workflow_id)
+    assert not any("confidence" in s.lower() for s in first)
+    
+    for _ in range(3):
+        await feedback_manager.update_confidence(workflow_id, False)
+    
+    suggestions = await feedback_manager.suggest_improvements(workflow_id)
+    assert any("low confidence" in s.lower() for s in suggestions)
+
+
+@pytest.mark.asyncio
+async def test_suggest_improvements_uses_recent_success_rate(
+    feedback_manager,
+    mock_execution,
+    successful_verification,
+    failed_verification
+):
+    """Test the low success rate suggestion only considers recent executions."""
+    workflow_id = mock_execution.workflow_id
+    
+    for _ in range(10):
+        await feedback_manager.analyze_execution(mock_execution, [failed_verification])
+    suggestions = await feedback_manager.suggest_improvements(workflow_id)
+    assert any("low success rate" in s.lower() for s in suggestions)
+    
+    for _ in range(6):
+        await feedback_manager.analyze_execution(mock_execution, [successful_verification])
+    suggestions = await feedback_manager.suggest_improvements(workflow_id)
+    assert not any("low success rate" in s.lower() for s in suggestions)
@@ -0,0 +1,49 @@
+"""Tests for hotkey string conversion in the hotkey manager."""
+
+import pytest
+
+from src.services.hotkey_manager import _to_pynput_hotkey, _to_win32_hotkey
+
+
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+
+@pytest.mark.parametrize("hotkey, expected", [
+    ("ctrl+shift+p", "<ctrl>+<shift>+p"),
+    ("Control + Alt + F9", "<ctrl>+<alt>+f9"),
+    ("win+space", "<cmd>+space"),
+    ("super+1", "<cmd>+1"),
+])
+def test_to_pynput_hotkey(hotkey, expected):
+    """Test config hotkeys are converted to pynput format."""
+    assert _to_pynput_hotkey(hotkey) == expected
+
+
+@pytest.mark.parametrize("hotkey, expected", [
+    ("<ctrl>+<shift>+p", (MOD_NOREPEAT | MOD_CONTROL | MOD_SHIFT, ord('P'))),
+    ("<alt>+<f4>", (MOD_NOREPEAT | MOD_ALT, 0x73)),
+    ("<cmd>+<f12>", (MOD_NOREPEAT | MOD_WIN, 0x7B)),
+    ("<ctrl>+7", (MOD_NOREPEAT | MOD_CONTROL, ord('7'))),
+    ("<ctrl>+<esc>", (MOD_NOREPEAT | MOD_CONTROL, 0x1B)),
+    ("<shift>+space", (MOD_NOREPEAT | MOD_SHIFT, 0x20)),
+    ("<f1>", (MOD_NOREPEAT, 0x70)),
+])
+def test_to_win32_hotkey(hotkey, expected):
+    """Test pynput hotkeys are converted to RegisterHotKey arguments."""
+    assert _to_win32_hotkey(hotkey) == expected
+
+
+@pytest.mark.parametrize("hotkey", [
+    "<ctrl>+a+b",  # More than one key
+    "<ctrl>+<shift>",  # No key
+    "<ctrl>+<home>",  # Unsupported named key
+    "<ctrl>+é",  # Non-ASCII key
+    "<ctrl>+;",  # Punctuation has no fixed virtual-key code
+])
+def test_to_win32_hotkey_unsupported(hotkey):
+    """Test hotkeys RegisterHotKey cannot express are rejected."""
+    assert _to_win32_hotkey(hotkey) is None
@@ -67,7 +67,8 @@ class TestBasicIntegration:
     
     def test_hotkey_manager_basic(self):
         """Test hotkey manager basic functionality."""
-        with patch('src.services.hotkey_manager.keyboard.GlobalHotKeys') as mock_hotkeys:
+        with patch('src.services.hotkey_manager.keyboard.GlobalHotKeys') as mock_hotkeys, \
+                patch('src.services.hotkey_manager.WIN32_HOTKEYS_AVAILABLE', False):
             mock_listener = MagicMock()
             mock_hotkeys.return_value = mock_listener
             
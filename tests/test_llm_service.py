@@ -0,0 +1,423 @@
+"""Tests for LLMService."""
+
+import pytest
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.event_system import EventType
+from src.services.llm_service import LLMService, _now_iso
+
+
+ACTION_RESPONSE = '{"action_type": "click", "description": "Clicked save", "confidence": 0.9}'
+
+
+def chat_response(content):
+    """Build an Ollama chat response with the given message content."""
+    return {'message': {'role': 'assistant', 'content': content}}
+
+
+@pytest.fixture
+def llm_service():
+    """Create LLM service with a mocked Ollama client."""
+    service = LLMService()
+    service._aclient = MagicMock()
+    service._aclient.chat = AsyncMock(return_value=chat_response(ACTION_RESPONSE))
+    service.event_bus = MagicMock()
+    service.event_bus.publish = AsyncMock()
+    service._model_available = True
+    service._semantic_cache_enabled = False
+    return service
+
+
+@pytest.fixture
+def action_context():
+    """Create action context with a fixed timestamp."""
+    return {'window_title': 'Editor', 'timestamp': '2024-01-01T00:00:00'}
+
+
+@pytest.mark.asyncio
+async def test_analyze_action(llm_service, action_context):
+    """Test action analysis parses the LLM response."""
+    result = await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    
+    assert result['action_type'] == 'click'
+    assert result['confidence'] == 0.9
+    
+    # Fixed instructions go in the system message, details in the user message
+    kwargs = llm_service._aclient.chat.call_args.kwargs
+    assert kwargs['messages'][0] == {
+        'role': 'system', 'content': llm_service.system_prompts['action_analysis']
+    }
+    assert 'shot.png' in kwargs['messages'][1]['content']
+    assert kwargs['format'] == 'json'
+
+
+@pytest.mark.asyncio
+async def test_initialize_lists_models_once(llm_service, monkeypatch):
+    """Test initialization queries the installed models only once."""
+    monkeypatch.setattr(llm_service.config.llm, 'enabled', True)
+    llm_service._model_available = False
+    llm_service._aclient.list = AsyncMock(return_value={
+        'models': [{'model': llm_service.model_name}, {'model': 'other:latest'}]
+    })
+    llm_service._aclient.pull = AsyncMock()
+    llm_service._aclient.generate = AsyncMock(return_value={'response': 'OK'})
+    
+    await llm_service.initialize()
+    
+    assert llm_service.is_available()
+    assert llm_service._aclient.list.call_count == 1
+    llm_service._aclient.pull.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_query_model_tiers(llm_service, action_context):
+    """Test action analysis and suggestions can use different models."""
+    llm_service.query_models.update(action_analysis='phi3:mini', suggestion_generation='llama3:8b')
+    llm_service._aclient.list = AsyncMock(return_value={'models': [{'model': 'phi3:mini'}]})
+    llm_service._aclient.pull = AsyncMock()
+    llm_service._aclient.generate = AsyncMock(return_value={'response': 'OK'})
+    
+    await llm_service._ensure_model_available(await llm_service._check_ollama_status())
+    
+    # Each distinct model is pulled if missing and loaded once
+    pulled = {c.args[0] for c in llm_service._aclient.pull.call_args_list}
+    assert pulled == {'llama3:8b', llm_service.model_name}
+    assert llm_service._aclient.generate.call_count == 3
+    
+    await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    assert llm_service._aclient.chat.call_args.kwargs['model'] == 'phi3:mini'
+    
+    llm_service._aclient.chat.return_value = chat_response('[]')
+    await llm_service.generate_automation_suggestions([{'pattern_type': 'data_entry'}])
+    assert llm_service._aclient.chat.call_args.kwargs['model'] == 'llama3:8b'
+
+
+@pytest.mark.asyncio
+async def test_analyze_action_model_unavailable(llm_service, action_context):
+    """Test action analysis is skipped without a model."""
+    llm_service._model_available = False
+    
+    assert await llm_service.analyze_action('shot.png', '', action_context) is None
+    llm_service._aclient.chat.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_idle_frame_skips_query(llm_service, tmp_path):
+    """Test idle frames with an unchanged screen reuse the last analysis."""
+    for i, content in enumerate((b'screen', b'screen', b'changed')):
+        (tmp_path / f"shot_{i}.png").write_bytes(content)
+    
+    for i in range(3):
+        context = {'window_title': 'Editor', 'timestamp': f"2024-01-01T00:00:0{i}"}
+        result = await llm_service.analyze_action(str(tmp_path / f"shot_{i}.png"), '', context)
+        assert result['action_type'] == 'click'
+    
+    assert llm_service._aclient.chat.call_count == 2
+    assert llm_service.get_model_info()['idle_frames_skipped'] == 1
+    
+    # Speech is always analyzed
+    await llm_service.analyze_action(str(tmp_path / "shot_2.png"), 'save it', context)
+    assert llm_service._aclient.chat.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_prompt_timestamp_default(llm_service):
+    """Test prompts without a timestamp use the current second."""
+    prompt = llm_service._create_action_analysis_prompt('shot.png', '', {})
+    
+    timestamp = prompt.split('Timestamp: ')[1].strip()
+    assert abs((datetime.fromisoformat(timestamp) - datetime.now()).total_seconds()) < 2
+    assert _now_iso() == _now_iso()
+
+
+@pytest.mark.asyncio
+async def test_results_published_as_events(llm_service, action_context):
+    """Test analysis results are published on the event bus."""
+    await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    
+    llm_service._aclient.chat.return_value = chat_response('[{"suggestion_id": "s1"}]')
+    await llm_service.generate_automation_suggestions([{'pattern_type': 'data_entry'}])
+    
+    events = [call.args[0] for call in llm_service.event_bus.publish.call_args_list]
+    assert [event.type for event in events] == [
+        EventType.LLM_ACTION_ANALYZED, EventType.LLM_SUGGESTIONS_GENERATED
+    ]
+    assert events[0].data['action_type'] == 'click'
+    assert events[1].data == {'suggestions': [{'suggestion_id': 's1'}]}
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompt_uses_cache(llm_service, action_context):
+    """Test identical prompts are answered from the response cache."""
+    first = await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    second = await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    
+    assert first == second
+    assert llm_service._aclient.chat.call_count == 1
+    
+    llm_service.cache_clear()
+    await llm_service.analyze_action('shot.png', 'save the file', action_context)
+    
+    assert llm_service._aclient.chat.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_is_bounded(llm_service, action_context):
+    """Test the least recently used response is evicted."""
+    llm_service._response_cache_size = 2
+    
+    for transcription in ('one', 'two', 'three'):
+        await llm_service.analyze_action('shot.png', transcription, action_context)
+    await llm_service.analyze_action('shot.png', 'one', action_context)
+    
+    assert len(llm_service._response_cache) == 2
+    assert llm_service._aclient.chat.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_similar_prompt_uses_semantic_cache(llm_service):
+    """Test prompts with near-identical embeddings share a response."""
+    llm_service._semantic_cache_enabled = True
+    llm_service._aclient.chat.return_value = chat_response('[{"suggestion_id": "s1"}]')
+    llm_service._aclient.embeddings = AsyncMock(side_effect=[
+        {'embedding': [1.0, 0.0, 0.0]},
+        {'embedding': [1.0, 0.01, 0.0]},
+        {'embedding': [0.0, 1.0, 0.0]},
+    ])
+    
+    await llm_service.generate_automation_suggestions([{'description': 'Fill form', 'frequency': 3}])
+    await llm_service.generate_automation_suggestions([{'description': 'Fill form', 'frequency': 4}])
+    assert llm_service._aclient.chat.call_count == 1
+    
+    await llm_service.generate_automation_suggestions([{'description': 'Send mail', 'frequency': 3}])
+    assert llm_service._aclient.chat.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_action_analysis_skips_semantic_cache(llm_service, action_context):
+    """Test action analysis is never answered from a similar prompt."""
+    llm_service._semantic_cache_enabled = True
+    llm_service._aclient.embeddings = AsyncMock(return_value={'embedding': [1.0, 0.0, 0.0]})
+    
+    await llm_service.analyze_action('shot_1.png', 'save the file', action_context)
+    await llm_service.analyze_action('shot_2.png', 'save the file', action_context)
+    
+    assert llm_service._aclient.chat.call_count == 2
+    llm_service._aclient.embeddings.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_skipped_on_embedding_error(llm_service):
+    """Test a failing embedding request falls back to querying the LLM."""
+    llm_service._semantic_cache_enabled = True
+    llm_service._aclient.chat.return_value = chat_response('[{"suggestion_id": "s1"}]')
+    llm_service._aclient.embeddings = AsyncMock(side_effect=RuntimeError("connection reset"))
+    
+    result = await llm_service.generate_automation_suggestions([{'description': 'Fill form'}])
+    
+    assert result == [{'suggestion_id': 's1'}]
+    assert llm_service._semantic_cache_enabled
+
+
+@pytest.mark.asyncio
+async def test_patterns_cached_by_prompt_fields(llm_service):
+    """Test action lists differing only in fields the prompt omits share patterns."""
+    llm_service._aclient.chat.return_value = chat_response(
+        '[{"pattern_id": "p1", "pattern_type": "data_entry", "description": "Entry"}]'
+    )
+    actions = [
+        {'action_type': 'click', 'description': 'Clicked field', 'application': 'Excel'},
+        {'action_type': 'type', 'description': 'Typed value', 'application': 'Excel'},
+        {'action_type': 'save', 'description': 'Saved file', 'application': 'Excel'},
+    ]
+    timestamped = [dict(action, timestamp='2024-01-01T10:00:00') for action in actions]
+    
+    first = await llm_service.detect_workflow_patterns(actions)
+    second = await llm_service.detect_workflow_patterns(timestamped)
+    
+    assert first == second
+    assert llm_service._aclient.chat.call_count == 1
+    
+    # Different descriptions need their own patterns
+    renamed = [dict(action, description=f"{action['description']} again") for action in actions]
+    await llm_service.detect_workflow_patterns(renamed)
+    assert llm_service._aclient.chat.call_count == 2
+    
+    await llm_service.detect_workflow_patterns(actions[::-1])
+    assert llm_service._aclient.chat.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_analyze_actions_batch(llm_service, action_context):
+    """Test a batch of actions is analyzed with one query."""
+    llm_service._aclient.chat.return_value = chat_response("""[
+        {"index": 2, "action_type": "type", "description": "Typed name", "confidence": 0.8},
+        {"index": 1, "action_type": "click", "description": "Clicked save", "confidence": 0.9},
+        {"index": 7, "action_type": "click", "description": "Out of range", "confidence": 0.9}
+    ]""")
+    items = [
+        ('shot_1.png', 'save it', action_context),
+        ('shot_2.png', 'type the name', action_context),
+        ('shot_3.png', '', action_context),
+    ]
+    
+    results = await llm_service.analyze_actions_batch(items)
+    
+    assert [r and r['action_type'] for r in results] == ['click', 'type', None]
+    assert llm_service._aclient.chat.call_count == 1
+    options = llm_service._aclient.chat.call_args.kwargs['options']
+    assert options['num_predict'] == llm_service.max_tokens * 3
+    schema = llm_service._aclient.chat.call_args.kwargs['format']
+    assert schema['type'] == 'array'
+    assert 'index' in schema['items']['required']
+
+
+@pytest.mark.asyncio
+async def test_process_tick_pipelines_stages(llm_service, action_context):
+    """Test ticks overlap action analysis with suggestions for detected patterns."""
+    responses = {
+        'action_analysis': ACTION_RESPONSE,
+        'pattern_detection': '[{"pattern_id": "p1", "pattern_type": "data_entry"}]',
+        'suggestion_generation': '[{"suggestion_id": "s1"}]',
+    }
+    in_flight = []
+    
+    async def chat(**kwargs):
+        query_type = next(
+            name for name, prompt in llm_service.system_prompts.items()
+            if kwargs['messages'][0]['content'] == prompt
+        )
+        in_flight.append(llm_service._queries_in_flight)
+        await asyncio.sleep(0.01)
+        return chat_response(responses[query_type])
+    
+    llm_service._aclient.chat = AsyncMock(side_effect=chat)
+    
+    results = []
+    for i in range(3):
+        results.append(await llm_service.process_tick('shot.png', f"action {i}", action_context))
+    
+    # Ticks only analyze actions until patterns are detected
+    assert llm_service._aclient.chat.call_count == 3
+    assert all(result['action']['action_type'] == 'click' for result in results)
+    assert not any(result['suggestions'] for result in results)
+    
+    patterns = await llm_service.detect_tick_patterns()
+    assert patterns == [{"pattern_id": "p1", "pattern_type": "data_entry"}]
+    
+    # The next tick generates suggestions for them alongside its analysis,
+    # and the tick after that has nothing left to suggest for
+    in_flight.clear()
+    result = await llm_service.process_tick('shot.png', "action 3", action_context)
+    assert result['suggestions'] == [{"suggestion_id": "s1"}]
+    assert max(in_flight) == 2
+    
+    result = await llm_service.process_tick('shot.png', "action 4", action_context)
+    assert result['suggestions'] == []
+    assert llm_service._aclient.chat.call_count == 7
+
+
+@pytest.mark.asyncio
+async def test_query_concurrency_is_bounded(llm_service, action_context):
+    """Test no more than max_concurrency queries reach Ollama at once."""
+    llm_service.max_concurrency = 2
+    llm_service._query_semaphore = asyncio.Semaphore(2)
+    in_flight = []
+    
+    async def generate(**kwargs):
+        in_flight.append(llm_service._queries_in_flight)
+        await asyncio.sleep(0.01)
+        return chat_response(ACTION_RESPONSE)
+    
+    llm_service._aclient.chat = AsyncMock(side_effect=generate)
+    
+    await asyncio.gather(*(
+        llm_service.analyze_action('shot.png', f"action {i}", action_context)
+        for i in range(6)
+    ))
+    
+    assert llm_service._aclient.chat.call_count == 6
+    assert max(in_flight) == 2
+    assert llm_service.get_model_info()['queries_in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_query_rate_limit(llm_service, action_context):
+    """Test queries beyond the burst wait for the token bucket."""
+    llm_service.requests_per_second = 50.0
+    llm_service._rate_tokens = 1.0
+    
+    for i in range(3):
+        await llm_service.analyze_action('shot.png', f"action {i}", action_context)
+    
+    assert llm_service.get_model_info()['rate_limited_queries'] == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_json_responses(llm_service):
+    """Test structured JSON responses are parsed and validated."""
+    assert llm_service._parse_pattern_response('[{"pattern_id": "p1"}]') == [
+        {'pattern_id': 'p1'}
+    ]
+    assert llm_service._parse_suggestion_response(
+        '\n[{"suggestion_id": "s1"}]\n'
+    ) == [{'suggestion_id': 's1'}]
+    assert llm_service._parse_action_response(ACTION_RESPONSE)['action_type'] == 'click'
+    
+    assert llm_service._parse_pattern_response('not json') == []
+    assert llm_service._parse_pattern_response('{"pattern_id": "p1"}') == []
+    assert llm_service._parse_action_response('{"action_type": "click"}') is None
+
+
+def chat_stream(*contents):
+    """Build an Ollama chat response stream yielding the given chunks."""
+    async def stream():
+        for content in contents:
+            yield chat_response(content)
+    return stream()
+
+
+@pytest.mark.asyncio
+async def test_suggestions_streamed_incrementally(llm_service):
+    """Test suggestions are yielded as soon as each object is complete."""
+    received = []
+    
+    async def stream():
+        for content in ('\n[{"suggestion_id": "s1", ', '"title": "A"}, {"sugg',
+                        'estion_id": "s2"}', ']\n', '\n'):
+            received.append(content)
+            yield chat_response(content)
+    
+    llm_service._aclient.chat = AsyncMock(return_value=stream())
+    patterns = [{'pattern_type': 'data_entry', 'actions_involved': ['click', 'type']}]
+    
+    suggestions = []
+    async for suggestion in llm_service.generate_automation_suggestions_stream(patterns):
+        suggestions.append((suggestion['suggestion_id'], len(received)))
+    
+    assert suggestions == [('s1', 2), ('s2', 3)]
+    assert llm_service._aclient.chat.call_args.kwargs['stream'] is True
+    # Generation stops once the array is complete
+    assert len(received) == 4
+    
+    # The complete response is cached for later queries
+    cached = await llm_service.generate_automation_suggestions(patterns)
+    assert [s['suggestion_id'] for s in cached] == ['s1', 's2']
+    assert llm_service._aclient.chat.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_on_malformed_response(llm_service):
+    """Test streaming stops early when the response is not a JSON array."""
+    llm_service._aclient.chat = AsyncMock(return_value=chat_stream(
+        'Sure, here', ' are the patterns', ' [{"pattern_id": "p1"}]'
+    ))
+    actions = [{'action_type': 'click', 'application': 'Excel'}] * 3
+    
+    patterns = [p async for p in llm_service.detect_workflow_patterns_stream(actions)]
+    
+    assert patterns == []
+    assert not llm_service._response_cache
+    assert llm_service.get_model_info()['queries_in_flight'] == 0
@@ -0,0 +1,122 @@
+"""Tests for PatternDetector counting and deduplication."""
+
+import random
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.models.pattern import Pattern
+from src.services import pattern_detector
+from src.services.pattern_detector import PatternDetector, NUMBA_AVAILABLE
+
+
+def make_pattern(actions, frequency):
+    """Create a repetitive sequence pattern over the given action signatures."""
+    return Pattern(
+        pattern_type="repetitive_sequence",
+        description=" → ".join(actions),
+        actions_involved=list(actions),
+        frequency=frequency,
+        confidence=0.5,
+        automation_potential="medium",
+        first_occurrence=datetime.now(),
+        last_occurrence=datetime.now()
+    )
+
+
+def python_window_counts(ids, length, min_frequency):
+    """Count repeated windows with plain Python, in order of first occurrence."""
+    windows = [tuple(ids[i:i + length]) for i in range(len(ids) - length + 1)]
+    counts = Counter(windows)
+    return [
+        (list(window), counts[window])
+        for window in dict.fromkeys(windows)
+        if counts[window] >= min_frequency
+    ]
+
+
+@pytest.fixture
+def detector():
+    """Create PatternDetector instance."""
+    return PatternDetector()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+async def test_count_windows_matches_python_count(detector):
+    """Test the numba window kernel counts exactly like a Counter."""
+    rng = random.Random(7)
+    for _ in range(200):
+        vocab_size = rng.randint(1, 6)
+        length = rng.randint(2, 5)
+        ids = np.array(
+            [rng.randrange(vocab_size) for _ in range(rng.randint(length, 80))],
+            dtype=np.int32
+        )
+        sequences = detector._extract_sequences(ids, length)
+        
+        starts, counts = pattern_detector._count_windows(sequences, vocab_size, detector.min_frequency)
+        result = [
+            (sequences[start].tolist(), count)
+            for start, count in zip(starts.tolist(), counts.tolist())
+        ]
+        
+        assert result == python_window_counts(ids.tolist(), length, detector.min_frequency)
+
+
+@pytest.mark.asyncio
+async def test_count_sequences_fallback_matches_python_count(detector, monkeypatch):
+    """Test the numpy counting path counts exactly like a Counter."""
+    monkeypatch.setattr(pattern_detector, 'NUMBA_AVAILABLE', False)
+    rng = random.Random(11)
+    for _ in range(200):
+        vocab_size = rng.randint(1, 6)
+        length = rng.randint(2, 5)
+        ids = np.array(
+            [rng.randrange(vocab_size) for _ in range(rng.randint(length, 80))],
+            dtype=np.int32
+        )
+        sequences = detector._extract_sequences(ids, length)
+        
+        result = detector._count_sequences(sequences, length, vocab_size)
+        
+        assert result == python_window_counts(ids.tolist(), length, detector.min_frequency)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 2 / 3, 0.8, 0.9])
+async def test_deduplicate_indexed_matches_dense(detector, threshold):
+    """Test both deduplication strategies keep the same patterns."""
+    detector.similarity_threshold = threshold
+    rng = random.Random(3)
+    for _ in range(100):
+        vocab = [f"click|app:App{i}" for i in range(rng.randint(1, 12))]
+        patterns = [
+            make_pattern(
+                [rng.choice(vocab) for _ in range(rng.randint(1, 8))],
+                rng.randint(1, 5)
+            )
+            for _ in range(rng.randint(1, 60))
+        ]
+        patterns.sort(key=lambda p: p.frequency, reverse=True)
+        
+        dense = detector._deduplicate_dense(list(patterns))
+        indexed = detector._deduplicate_indexed(list(patterns))
+        
+        assert [id(p) for p in indexed] == [id(p) for p in dense]
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_keeps_most_frequent(detector):
+    """Test a near-duplicate of a more frequent pattern is dropped."""
+    frequent = make_pattern(["click|app:Excel", "type|app:Excel"], 5)
+    duplicate = make_pattern(["type|app:Excel", "click|app:Excel"], 2)
+    distinct = make_pattern(["scroll|app:Chrome", "click|app:Chrome"], 3)
+    
+    unique = detector._deduplicate_patterns([duplicate, distinct, frequent])
+    
+    assert len(unique) == 2
+    assert unique[0] is frequent
+    assert unique[1] is distinct
@@ -0,0 +1,80 @@
+"""Tests for PerformanceMonitor service."""
+
+import pytest
+import numpy as np
+
+from src.services.performance_monitor import PerformanceMonitor, PerformanceMetrics
+
+
+@pytest.fixture
+def monitor():
+    """Create PerformanceMonitor instance."""
+    return PerformanceMonitor()
+
+
+@pytest.mark.asyncio
+async def test_empty_metric(monitor):
+    """Test metrics report 0 before anything is recorded."""
+    assert monitor.get_average('capture_time') == 0
+    assert monitor.get_latest('capture_time') == 0
+    assert monitor.get_metric_stats('capture_time') == {'avg': 0, 'std': 0, 'p95': 0, 'max': 0}
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_average_and_latest(monitor):
+    """Test averages cover only the last window_size values."""
+    values = [float(i) for i in range(250)]
+    for value in values:
+        monitor.record_metric('capture_time', value)
+    
+    window = values[-monitor.window_size:]
+    assert monitor.get_latest('capture_time') == 249.0
+    assert monitor.get_average('capture_time') == pytest.approx(np.mean(window))
+    
+    stats = monitor.get_metric_stats('capture_time')
+    assert stats['avg'] == pytest.approx(np.mean(window))
+    assert stats['std'] == pytest.approx(np.std(window))
+    assert stats['p95'] == pytest.approx(np.percentile(window, 95))
+    assert stats['max'] == 249.0
+
+
+@pytest.mark.asyncio
+async def test_partial_window(monitor):
+    """Test a window that has not filled up averages the recorded values."""
+    for value in (1.0, 2.0, 6.0):
+        monitor.record_metric('analysis_time', value)
+    
+    assert monitor.get_average('analysis_time') == pytest.approx(3.0)
+    assert monitor.get_latest('analysis_time') == 6.0
+    assert monitor.get_metric_stats('analysis_time')['max'] == 6.0
+
+
+@pytest.mark.asyncio
+async def test_unknown_metric_ignored(monitor):
+    """Test recording an unknown metric does nothing."""
+    monitor.record_metric('unknown', 1.0)
+    
+    assert 'unknown' not in monitor.metrics
+    assert monitor.get_average('unknown') == 0
+
+
+@pytest.mark.asyncio
+async def test_background_sampling(monitor):
+    """Test CPU and memory are sampled once started and stop cleanly."""
+    await monitor.initialize()
+    try:
+        assert monitor.get_latest('memory') > 0
+        assert set(monitor.get_metrics()) == {'cpu_percent', 'memory_mb', 'cpu_avg', 'memory_avg'}
+    finally:
+        await monitor.stop()
+    
+    assert monitor._sample_task is None
+
+
+def test_performance_metrics_is_slotted():
+    """Test metric snapshots are immutable and carry no instance dict."""
+    metrics = PerformanceMetrics(cpu_percent=1.0, memory_mb=2.0, timestamp=3.0)
+    
+    assert not hasattr(metrics, '__dict__')
+    with pytest.raises(AttributeError):
+        metrics.cpu_percent = 5.0